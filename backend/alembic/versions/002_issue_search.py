@@ -0,0 +1,60 @@
+"""Full-text search index for issues
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        # External-content FTS5 table kept in sync with issues by triggers
+        op.execute(
+            "CREATE VIRTUAL TABLE issues_fts USING fts5("
+            "title, description, content='issues', content_rowid='id')"
+        )
+        op.execute(
+            "CREATE TRIGGER issues_fts_ai AFTER INSERT ON issues BEGIN "
+            "INSERT INTO issues_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER issues_fts_ad AFTER DELETE ON issues BEGIN "
+            "INSERT INTO issues_fts(issues_fts, rowid, title, description) "
+            "VALUES ('delete', old.id, old.title, old.description); "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER issues_fts_au AFTER UPDATE OF title, description ON issues BEGIN "
+            "INSERT INTO issues_fts(issues_fts, rowid, title, description) "
+            "VALUES ('delete', old.id, old.title, old.description); "
+            "INSERT INTO issues_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+            "END"
+        )
+        op.execute("INSERT INTO issues_fts(issues_fts) VALUES ('rebuild')")
+    elif bind.dialect.name == 'postgresql':
+        op.execute(
+            "CREATE INDEX ix_issues_search ON issues USING gin "
+            "((to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))))"
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS issues_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS issues_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS issues_fts_ai")
+        op.execute("DROP TABLE IF EXISTS issues_fts")
+    elif bind.dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_issues_search")
@@ -0,0 +1,49 @@
+"""Composite indexes for issue, membership and comment lookups
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # list_issues: filter on project_id, then one of the sort/filter columns,
+    # with id last for keyset pagination tie-breaks
+    op.create_index('ix_issues_project_created', 'issues', ['project_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_issues_project_updated', 'issues', ['project_id', 'updated_at', 'id'], unique=False)
+    op.create_index('ix_issues_project_priority', 'issues', ['project_id', 'priority', 'id'], unique=False)
+    op.create_index('ix_issues_project_status', 'issues', ['project_id', 'status', 'id'], unique=False)
+    op.create_index('ix_issues_project_assignee', 'issues', ['project_id', 'assignee_id', 'id'], unique=False)
+
+    # check_project_access looks up (project_id, user_id) on every request.
+    # Drop any duplicate memberships first so the unique index can be built.
+    op.execute(
+        "DELETE FROM project_members WHERE id NOT IN "
+        "(SELECT MIN(id) FROM project_members GROUP BY project_id, user_id)"
+    )
+    op.create_index('uq_project_members_project_user', 'project_members', ['project_id', 'user_id'], unique=True)
+    # list_projects looks memberships up by user
+    op.create_index('ix_project_members_user_id', 'project_members', ['user_id'], unique=False)
+
+    # list_comments: comments of one issue in creation order
+    op.create_index('ix_comments_issue_created', 'comments', ['issue_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_issue_created', table_name='comments')
+    op.drop_index('ix_project_members_user_id', table_name='project_members')
+    op.drop_index('uq_project_members_project_user', table_name='project_members')
+    op.drop_index('ix_issues_project_assignee', table_name='issues')
+    op.drop_index('ix_issues_project_status', table_name='issues')
+    op.drop_index('ix_issues_project_priority', table_name='issues')
+    op.drop_index('ix_issues_project_updated', table_name='issues')
+    op.drop_index('ix_issues_project_created', table_name='issues')
@@ -0,0 +1,46 @@
+"""Per-project issue counters
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+STATUSES = ['open', 'in_progress', 'resolved', 'closed']
+PRIORITIES = ['low', 'medium', 'high', 'critical']
+
+
+def upgrade() -> None:
+    counters = ['total'] + [f'status_{s}' for s in STATUSES] + [f'priority_{p}' for p in PRIORITIES]
+    op.create_table(
+        'project_issue_stats',
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        *[sa.Column(name, sa.Integer(), nullable=False, server_default='0') for name in counters],
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('project_id')
+    )
+
+    # Backfill from the existing issues. Enum columns store the member names.
+    sums = ', '.join(
+        [f"SUM(CASE WHEN issues.status = '{s.upper()}' THEN 1 ELSE 0 END)" for s in STATUSES]
+        + [f"SUM(CASE WHEN issues.priority = '{p.upper()}' THEN 1 ELSE 0 END)" for p in PRIORITIES]
+    )
+    op.execute(
+        f"INSERT INTO project_issue_stats (project_id, {', '.join(counters)}) "
+        f"SELECT projects.id, COUNT(issues.id), {sums} "
+        "FROM projects LEFT JOIN issues ON issues.project_id = projects.id "
+        "GROUP BY projects.id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('project_issue_stats')
@@ -0,0 +1,111 @@
+"""Password hashing on a dedicated, bounded thread pool.
+
+Hashing is deliberately slow. Run inline, a burst of logins would occupy the
+threadpool that also serves ordinary requests. Instead `signup` and `login`
+await `async_hash_password` / `async_verify_password`, which run the work on
+a small pool of its own. Both pbkdf2_sha256 (hashlib) and bcrypt release the
+GIL while hashing, so threads give real parallelism without process overhead.
+
+At most `settings.password_hash_max_pending` hashes may be running or queued.
+Beyond that the request fails fast with 503 and a Retry-After header rather
+than queueing behind work it would time out on anyway.
+
+Run `python -m app.auth.hashing` to report hashes/sec per scheme on this host.
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from fastapi import HTTPException, status
+
+from ..config import settings
+from .security import get_password_hash, get_pwd_context, verify_password
+
+
+class HashingPool:
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+    async def run(self, fn: Callable, *args):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many sign-in requests in progress, please retry shortly",
+                    headers={"Retry-After": str(settings.password_hash_retry_after_seconds)},
+                )
+            self.pending += 1
+            executor = self._get_executor()
+        try:
+            return await asyncio.wrap_future(executor.submit(fn, *args))
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+
+hashing_pool = HashingPool(
+    workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
+
+
+async def async_hash_password(password: str) -> str:
+    return await hashing_pool.run(get_password_hash, password)
+
+
+async def async_verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
+
+
+def calibrate(seconds: float = 1.0) -> dict:
+    """Measure single-thread hashes/sec for each configured scheme"""
+    pwd_context = get_pwd_context()
+    results = {}
+    for scheme in pwd_context.schemes():
+        count = 0
+        started = time.perf_counter()
+        try:
+            while time.perf_counter() - started < seconds:
+                pwd_context.hash("calibration-password", scheme=scheme)
+                count += 1
+        except Exception as exc:
+            results[scheme] = {"error": str(exc)}
+            continue
+        elapsed = time.perf_counter() - started
+        results[scheme] = {
+            "hashes_per_sec": round(count / elapsed, 2),
+            "ms_per_hash": round(elapsed / count * 1000, 2),
+        }
+    return {
+        "default_scheme": pwd_context.default_scheme(),
+        "pool_workers": settings.password_hash_workers,
+        "schemes": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report password hashing throughput per scheme")
+    parser.add_argument("--seconds", type=float, default=1.0, help="time to spend on each scheme")
+    args = parser.parse_args()
+    print(json.dumps(calibrate(args.seconds), indent=2))
+
+
+if __name__ == "__main__":
+    main()
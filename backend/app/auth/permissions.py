@@ -1,22 +1,75 @@
+from dataclasses import dataclass
+from typing import Optional
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from ..cache import TTLCache
+from ..config import settings
 from ..models.project_member import ProjectMember, MemberRole
 
-def check_project_access(db: Session, user_id: int, project_id: int) -> ProjectMember:
+# (user_id, project_id) -> MemberRole. Only memberships that exist are cached,
+# so a newly added member is never refused because of a stale entry. The cache
+# is per process: in a multi-worker deployment a removed member or changed role
+# can take up to the TTL to be noticed by the other workers.
+membership_cache = TTLCache(
+    maxsize=settings.membership_cache_size,
+    ttl=settings.membership_cache_ttl_seconds
+)
+
+@dataclass(frozen=True)
+class Membership:
+    user_id: int
+    project_id: int
+    role: MemberRole
+
+def get_project_role(db: Session, user_id: int, project_id: int) -> Optional[MemberRole]:
+    """Return the user's role in the project, or None if they aren't a member"""
+    role = membership_cache.get((user_id, project_id))
+    if role is None:
+        row = db.query(ProjectMember.role).filter(
+            ProjectMember.project_id == project_id,
+            ProjectMember.user_id == user_id
+        ).first()
+        if row is None:
+            return None
+        role = row.role
+        membership_cache.set((user_id, project_id), role)
+    return role
+
+def invalidate_membership(user_id: int, project_id: int) -> None:
+    membership_cache.delete((user_id, project_id))
+
+@event.listens_for(ProjectMember, "after_insert")
+@event.listens_for(ProjectMember, "after_update")
+@event.listens_for(ProjectMember, "after_delete")
+def _membership_changed(mapper, connection, target):
+    # Any ORM write to a membership (added, role changed, removed) drops its
+    # entry now, for reads in the same transaction, and again once the
+    # transaction ends: until the commit, other requests still read the old
+    # role and may cache it again
+    invalidate_membership(target.user_id, target.project_id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_memberships", set()).add((target.user_id, target.project_id))
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _transaction_ended(session):
+    for user_id, project_id in session.info.pop("changed_memberships", ()):
+        invalidate_membership(user_id, project_id)
+
+def check_project_access(db: Session, user_id: int, project_id: int) -> Membership:
     """Check if user has access to project, return membership"""
-    membership = db.query(ProjectMember).filter(
-        ProjectMember.project_id == project_id,
-        ProjectMember.user_id == user_id
-    ).first()
+    role = get_project_role(db, user_id, project_id)
     
-    if not membership:
+    if role is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have access to this project"
         )
-    return membership
+    return Membership(user_id=user_id, project_id=project_id, role=role)
 
-def check_maintainer_access(db: Session, user_id: int, project_id: int) -> ProjectMember:
+def check_maintainer_access(db: Session, user_id: int, project_id: int) -> Membership:
     """Check if user is a maintainer of the project"""
     membership = check_project_access(db, user_id, project_id)
     
@@ -1,60 +1,73 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
+import functools
 import logging
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from ..cache import TTLCache
 from ..config import settings
-from ..database import get_db
+from ..database import get_db, get_async_db
 from ..models.user import User
 
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
 # Use passlib CryptContext with multiple schemes:
 # - prefer bcrypt for new hashes (stronger and standard for production)
 # - keep pbkdf2_sha256 as a fallback so existing hashes still verify during migration
 # Note: bcrypt may require a binary dependency on some systems; CI/dev may fallback to
 # pbkdf2_sha256 if bcrypt isn't available. Passlib will verify and re-hash on next login
 # if you implement re-hash logic.
-# Detect whether a working bcrypt backend is available at runtime. Some environments
-# (CI or Windows with a problematic `bcrypt` wheel) may have an installed but
-# non-functional bcrypt module which causes runtime errors; in that case we fall
-# back to using pbkdf2_sha256 only to keep the app/test-suite working.
-try:
-    import bcrypt as _bcrypt_mod  # type: ignore
+def _bcrypt_works() -> bool:
+    """Whether a working bcrypt backend is installed.
+
+    Some environments (CI or Windows with a problematic `bcrypt` wheel) have an
+    installed but non-functional bcrypt module which fails at runtime. The
+    smoke test hashes at the lowest cost bcrypt allows, about a millisecond,
+    rather than the default cost's few hundred.
+    """
     try:
-        # quick smoke test to ensure bcrypt can hash
-        _bcrypt_mod.hashpw(b"test", _bcrypt_mod.gensalt())
-        _bcrypt_available = True
+        import bcrypt as _bcrypt_mod  # type: ignore
+        _bcrypt_mod.hashpw(b"test", _bcrypt_mod.gensalt(4))
+        return True
     except Exception:
-        _bcrypt_available = False
-except Exception:
-    _bcrypt_available = False
-
-if _bcrypt_available:
-    # choose default based on settings; fall back to pbkdf2 if preferred isn't available
-    preferred = getattr(settings, "preferred_password_scheme", "pbkdf2_sha256")
-    if preferred == "bcrypt":
-        default_scheme = "bcrypt"
-    else:
-        default_scheme = "pbkdf2_sha256"
-    pwd_context = CryptContext(schemes=["bcrypt", "pbkdf2_sha256"], default=default_scheme, deprecated="auto")
-else:
+        return False
+
+@functools.lru_cache(maxsize=None)
+def get_pwd_context() -> "CryptContext":
+    """The password hashing context, built on first use rather than at import
+    so that starting a worker doesn't pay for probing the bcrypt backend."""
+    from passlib.context import CryptContext
+    if _bcrypt_works():
+        # choose default based on settings; fall back to pbkdf2 if preferred isn't available
+        preferred = getattr(settings, "preferred_password_scheme", "pbkdf2_sha256")
+        if preferred == "bcrypt":
+            default_scheme = "bcrypt"
+        else:
+            default_scheme = "pbkdf2_sha256"
+        return CryptContext(schemes=["bcrypt", "pbkdf2_sha256"], default=default_scheme, deprecated="auto")
     logging.warning("bcrypt backend unavailable or broken; falling back to pbkdf2_sha256 for password hashing")
-    pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+    return CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+# for routes that also take a token some other way
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     try:
-        return pwd_context.verify(plain_password, hashed_password)
+        return get_pwd_context().verify(plain_password, hashed_password)
     except Exception:
         return False
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -66,33 +79,137 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    credentials_exception = HTTPException(
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user as route handlers see it.
+
+    Carries only the display fields routes need. Use `get_current_user_record`
+    in the rare route that needs the full `User` row.
+    """
+    id: int
+    name: str
+    email: str
+
+# user id -> Principal, consulted only when `settings.auth_token_claims` is on
+user_cache = TTLCache(maxsize=settings.user_cache_size, ttl=settings.user_cache_ttl_seconds)
+
+def invalidate_user(user_id: int) -> None:
+    user_cache.delete(user_id)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target):
+    invalidate_user(target.id)
+
+def user_token_claims(user: User) -> dict:
+    """JWT claims identifying `user`; includes the display fields when
+    `settings.auth_token_claims` is enabled so requests can skip the user lookup."""
+    claims = {"sub": str(user.id)}
+    if settings.auth_token_claims:
+        claims.update({"name": user.name, "email": user.email})
+    return claims
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def events_scope(project_id: int) -> str:
+    return f"events:{project_id}"
+
+def create_events_token(user_id: int, project_id: int) -> str:
+    """A short-lived token that opens `project_id`'s event stream and nothing
+    else. EventSource can't set an Authorization header, so browsers pass it
+    in the query string; the short life limits what a logged URL is worth."""
+    return create_access_token(
+        {"sub": str(user_id), "scope": events_scope(project_id)},
+        timedelta(seconds=settings.events_token_expire_seconds),
+    )
+
+def _decode_token(token: str, scope: Optional[str] = None) -> dict:
+    """Decode and validate the JWT, returning its claims with `sub` as an int.
+
+    Tokens carrying a `scope` are only accepted where that scope is asked for,
+    so an event stream token can't be used as an access token."""
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         user_id = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
+        if user_id is None or payload.get("scope") != scope:
+            raise _credentials_exception()
         # the token 'sub' may be a string; ensure it's an int for DB lookup
         try:
-            user_id = int(user_id)
+            payload["sub"] = int(user_id)
         except (TypeError, ValueError):
-            raise credentials_exception
+            raise _credentials_exception()
     except JWTError:
-        raise credentials_exception
+        raise _credentials_exception()
+    return payload
+
+def _resolve_principal(db: Session, token: str, scope: Optional[str] = None) -> Principal:
+    payload = _decode_token(token, scope)
+    user_id = payload["sub"]
+
+    if settings.auth_token_claims:
+        # Trust the signed claims, falling back to the cache for tokens issued
+        # before the claims were enabled
+        if "name" in payload and "email" in payload:
+            return Principal(id=user_id, name=payload["name"], email=payload["email"])
+        principal = user_cache.get(user_id)
+        if principal is not None:
+            return principal
+
+    user = db.query(User.id, User.name, User.email).filter(User.id == user_id).first()
+    if user is None:
+        raise _credentials_exception()
+    principal = Principal(id=user.id, name=user.name, email=user.email)
+    if settings.auth_token_claims:
+        user_cache.set(user_id, principal)
+    return principal
 
-    user = db.query(User).filter(User.id == user_id).first()
+def _load_user_record(db: Session, token: str) -> User:
+    user = db.query(User).filter(User.id == _decode_token(token)["sub"]).first()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     return user
 
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> Principal:
+    return _resolve_principal(db, token)
+
+def get_current_user_record(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> User:
+    """Like `get_current_user`, but loads the full `User` row"""
+    return _load_user_record(db, token)
+
+def resolve_stream_user(db: Session, project_id: int, token: Optional[str], bearer: Optional[str]) -> Principal:
+    """The user opening `project_id`'s event stream: from an events token in
+    the query string, else from the usual Authorization header"""
+    if token:
+        return _resolve_principal(db, token, events_scope(project_id))
+    if bearer:
+        return _resolve_principal(db, bearer)
+    raise _credentials_exception()
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """`get_current_user` for the async stack"""
+    return await db.run_sync(_resolve_principal, token)
+
+async def get_current_user_record_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """`get_current_user_record` for the async stack"""
+    return await db.run_sync(_load_user_record, token)
+
 
 def needs_rehash(hashed_password: str) -> bool:
     """Return True if the given hash should be updated to the current preferred scheme.
@@ -101,7 +218,7 @@ def needs_rehash(hashed_password: str) -> bool:
     decide to re-hash and persist a stronger hash transparently on next successful login.
     """
     try:
-        return pwd_context.needs_update(hashed_password)
+        return get_pwd_context().needs_update(hashed_password)
     except Exception:
         # If anything goes wrong, don't force a rehash (avoid locking users out)
         return False
@@ -0,0 +1,4 @@
+"""Load-test and benchmark harness for the API.
+
+Run ``python -m app.bench --help`` from ``backend/``.
+"""
@@ -0,0 +1,57 @@
+"""Synthetic dataset for benchmark runs, built with app.datagen."""
+from typing import Dict, List
+
+from sqlalchemy import select, text
+
+from ..database import Base
+from ..datagen import WORDS, DatasetSpec, generate
+from ..models import comment, project_issue_stats, project_member  # noqa: F401  (register tables for create_all)
+from ..models.issue import Issue
+from ..models.project import Project
+from ..models.user import User
+from ..search import install_search_index
+
+BENCH_PASSWORD = "bench-password"
+
+
+def build_dataset(engine, users: int, projects: int, issues: int, comments_per_issue: int, seed: int = 0) -> None:
+    """Create the schema and fill it. Every user is a member of every project."""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        install_search_index(connection)
+    generate(engine, DatasetSpec(
+        users=users,
+        projects=projects,
+        issues=issues,
+        members_per_project=users,
+        comments_mean=comments_per_issue,
+        prefix="bench",
+        password=BENCH_PASSWORD,
+        seed=seed,
+    ), quiet=True)
+
+
+def load_targets(engine, sample_size: int = 5000) -> Dict[str, object]:
+    """Return what the scenarios pick from: bench users, projects, and a
+    sample of issue ids per project."""
+    with engine.connect() as connection:
+        users = connection.execute(
+            select(User.id, User.email).where(User.email.like("bench-user-%")).order_by(User.id)
+        ).all()
+        project_ids = connection.execute(
+            select(Project.id).where(Project.key.like("BENCH%")).order_by(Project.id)
+        ).scalars().all()
+        total = connection.execute(text("SELECT count(*) FROM issues")).scalar()
+        step = max(1, total // sample_size)
+        sampled = connection.execute(
+            select(Issue.id, Issue.project_id).where(Issue.id % step == 0)
+        ).all()
+    issues_by_project: Dict[int, List[int]] = {project_id: [] for project_id in project_ids}
+    for issue_id, project_id in sampled:
+        if project_id in issues_by_project:
+            issues_by_project[project_id].append(issue_id)
+    return {
+        "users": [{"id": user_id, "email": email} for user_id, email in users],
+        "project_ids": list(project_ids),
+        "issues_by_project": issues_by_project,
+    }
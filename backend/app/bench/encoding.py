@@ -0,0 +1,124 @@
+"""Time encoding a page of issues on each response path.
+
+    python -m app.bench.encoding --issues 10000
+
+The issues are built in memory as ``(Issue, reporter_name, assignee_name)``
+rows, as ``issue_rows`` returns them, and turned into a response body in
+several ways:
+
+* ``response_model``: the handler returns dicts and FastAPI validates them
+  through ``IssuePage``, dumps the models and encodes with the stdlib
+  ``json`` (the path before ``FastJSONResponse``);
+* ``model_dump_json``: dicts validated into ``IssuePage`` and dumped by
+  pydantic (how cached ``list_issues`` pages were built);
+* ``fast``: the dicts go straight to ``app.responses.dumps``.
+
+Each path produces the same JSON; the report has the best time of
+``--repeat`` runs per path, as JSON.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from ..models import comment, project, project_member  # noqa: F401  (register the related mappers)
+from ..models.issue import Issue, IssuePriority, IssueStatus
+from ..responses import dumps
+from ..schemas.issue import IssuePage
+from ..serializers.issue import serialize_issue
+from .dataset import WORDS
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m app.bench.encoding", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--issues", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def make_rows(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    started = datetime(2024, 1, 1)
+    rows = []
+    for n in range(1, count + 1):
+        created = started + timedelta(seconds=rng.randrange(10 ** 7), microseconds=rng.randrange(10 ** 6))
+        issue = Issue(
+            id=n,
+            project_id=1,
+            title=" ".join(rng.sample(WORDS, 5)),
+            description=" ".join(rng.choices(WORDS, k=rng.randrange(10, 80))),
+            status=rng.choice(list(IssueStatus)),
+            priority=rng.choice(list(IssuePriority)),
+            reporter_id=rng.randrange(1, 100),
+            assignee_id=rng.choice([None, rng.randrange(1, 100)]),
+            created_at=created,
+            updated_at=created + timedelta(hours=rng.randrange(1000)),
+        )
+        rows.append((issue, f"user {issue.reporter_id}", issue.assignee_id and f"user {issue.assignee_id}"))
+    return rows
+
+
+def _page(rows) -> dict:
+    return {"items": [serialize_issue(*row) for row in rows], "next_cursor": None}
+
+
+def encoders(rows) -> dict:
+    field = create_response_field("Response_list_issues", IssuePage)
+
+    def response_model() -> bytes:
+        content = asyncio.run(serialize_response(field=field, response_content=_page(rows)))
+        return JSONResponse(content).body
+
+    def model_dump_json() -> bytes:
+        return IssuePage(**_page(rows)).model_dump_json().encode()
+
+    def fast() -> bytes:
+        return dumps(_page(rows))
+
+    return {"response_model": response_model, "model_dump_json": model_dump_json, "fast": fast}
+
+
+def best_time(encode: Callable[[], bytes], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        encode()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main(argv: Optional[List[str]] = None) -> dict:
+    args = parse_args(argv)
+    rows = make_rows(args.issues, args.seed)
+    paths = encoders(rows)
+
+    expected = json.loads(paths["response_model"]())
+    for name, encode in paths.items():
+        if json.loads(encode()) != expected:
+            raise SystemExit(f"{name} produced different JSON")
+
+    timings = {name: best_time(encode, args.repeat) for name, encode in paths.items()}
+    baseline = timings["response_model"]
+    report = {
+        "issues": args.issues,
+        "bytes": len(paths["fast"]()),
+        "results": {
+            name: {"ms": round(seconds * 1000, 2), "speedup": round(baseline / seconds, 2)}
+            for name, seconds in timings.items()
+        },
+    }
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""The API wrapped so every response reports how many SQL statements it ran.
+
+The count is returned in the ``X-Bench-SQL-Statements`` header, which lets the
+benchmark read it both in-process and through a real uvicorn server.
+"""
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ..main import app as api
+
+SQL_STATEMENTS_HEADER = "x-bench-sql-statements"
+
+_statements: ContextVar[Optional[list]] = ContextVar("bench_sql_statements", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = _statements.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+async def app(scope, receive, send):
+    if scope["type"] != "http":
+        await api(scope, receive, send)
+        return
+
+    # a mutable cell, so copies of the context (threadpool workers) share it
+    counter = [0]
+    token = _statements.set(counter)
+
+    async def send_with_count(message):
+        if message["type"] == "http.response.start":
+            headers = list(message.get("headers", []))
+            headers.append((SQL_STATEMENTS_HEADER.encode(), str(counter[0]).encode()))
+            message = {**message, "headers": headers}
+        await send(message)
+
+    try:
+        await api(scope, receive, send_with_count)
+    finally:
+        _statements.reset(token)
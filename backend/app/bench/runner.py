@@ -0,0 +1,344 @@
+"""Drive weighted request scenarios against the API and report latency.
+
+The app is exercised either in-process (httpx over ASGI, no network) or
+through a real uvicorn server started in a subprocess. Results are printed as
+JSON so runs can be saved and compared between commits.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+SCENARIO_WEIGHTS = {
+    "list_issues": 25,
+    "filter_issues": 15,
+    "search_issues": 10,
+    "get_issue_with_comments": 25,
+    "create_comment": 15,
+    "login": 10,
+}
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m app.bench", description=__doc__)
+    parser.add_argument("--database-url", help="database to benchmark (default: a fresh temporary SQLite file)")
+    parser.add_argument("--skip-setup", action="store_true", help="reuse a database filled by an earlier run")
+    parser.add_argument("--server", choices=["inprocess", "uvicorn"], default="inprocess")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--async-stack", action="store_true", help="serve from the AsyncSession stack")
+    parser.add_argument("--requests", type=int, default=2000, help="scenario executions to run")
+    parser.add_argument("--duration", type=float, help="run for this many seconds instead of --requests")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--projects", type=int, default=5)
+    parser.add_argument("--issues", type=int, default=5000)
+    parser.add_argument("--comments-per-issue", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIO_WEIGHTS),
+                        help="only run these scenarios (repeatable)")
+    parser.add_argument("--output", help="write the JSON report here as well as to stdout")
+    return parser.parse_args(argv)
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {name: [] for name in SCENARIO_WEIGHTS}
+        self.errors: Dict[str, int] = {name: 0 for name in SCENARIO_WEIGHTS}
+        self.requests: Dict[str, int] = {name: 0 for name in SCENARIO_WEIGHTS}
+        self.sql: Dict[str, int] = {name: 0 for name in SCENARIO_WEIGHTS}
+
+    def response(self, scenario: str, response) -> None:
+        from .instrumented import SQL_STATEMENTS_HEADER
+        self.requests[scenario] += 1
+        self.sql[scenario] += int(response.headers.get(SQL_STATEMENTS_HEADER, 0))
+        if response.status_code >= 400:
+            self.errors[scenario] += 1
+
+    def report(self, elapsed: float) -> dict:
+        scenarios = {}
+        for name, latencies in self.latencies.items():
+            if not latencies:
+                continue
+            ordered = sorted(latencies)
+            scenarios[name] = {
+                "count": len(ordered),
+                "errors": self.errors[name],
+                "requests": self.requests[name],
+                "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+                "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+                "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+                "scenarios_per_sec": round(len(ordered) / elapsed, 2),
+                "sql_per_request": round(self.sql[name] / max(1, self.requests[name]), 2),
+            }
+        everything = sorted(l for latencies in self.latencies.values() for l in latencies)
+        total_requests = sum(self.requests.values())
+        return {
+            "elapsed_sec": round(elapsed, 3),
+            "requests": total_requests,
+            "requests_per_sec": round(total_requests / elapsed, 2),
+            "errors": sum(self.errors.values()),
+            "p50_ms": round(percentile(everything, 50) * 1000, 3) if everything else None,
+            "p95_ms": round(percentile(everything, 95) * 1000, 3) if everything else None,
+            "p99_ms": round(percentile(everything, 99) * 1000, 3) if everything else None,
+            "sql_per_request": round(sum(self.sql.values()) / max(1, total_requests), 2),
+            "scenarios": scenarios,
+        }
+
+
+class Scenarios:
+    """The requests a board user makes, against the bench dataset."""
+
+    def __init__(self, client, targets: dict, tokens: Dict[int, str], recorder: Recorder):
+        self.client = client
+        self.targets = targets
+        self.tokens = tokens
+        self.recorder = recorder
+
+    def _user(self, rng):
+        user = rng.choice(self.targets["users"])
+        return user, {"Authorization": f"Bearer {self.tokens[user['id']]}"}
+
+    def _issue(self, rng):
+        project_id = rng.choice(self.targets["project_ids"])
+        issue_ids = self.targets["issues_by_project"][project_id] or [0]
+        return project_id, rng.choice(issue_ids)
+
+    async def _get(self, scenario, url, headers):
+        response = await self.client.get(url, headers=headers)
+        self.recorder.response(scenario, response)
+        return response
+
+    async def list_issues(self, rng):
+        _, headers = self._user(rng)
+        project_id = rng.choice(self.targets["project_ids"])
+        sort = rng.choice(["created_at", "updated_at", "priority", "status"])
+        page = await self._get("list_issues", f"/api/projects/{project_id}/issues?sort={sort}", headers)
+        cursor = page.json().get("next_cursor") if page.status_code == 200 else None
+        if cursor and rng.random() < 0.3:
+            await self._get("list_issues", f"/api/projects/{project_id}/issues?sort={sort}&cursor={cursor}", headers)
+
+    async def filter_issues(self, rng):
+        user, headers = self._user(rng)
+        project_id = rng.choice(self.targets["project_ids"])
+        params = rng.choice([
+            "status=open",
+            "status=open&priority=high",
+            "priority=critical",
+            f"assignee={user['id']}",
+        ])
+        await self._get("filter_issues", f"/api/projects/{project_id}/issues?{params}", headers)
+
+    async def search_issues(self, rng):
+        from .dataset import WORDS
+        _, headers = self._user(rng)
+        project_id = rng.choice(self.targets["project_ids"])
+        q = " ".join(rng.sample(WORDS, rng.choice([1, 2])))
+        await self._get("search_issues", f"/api/projects/{project_id}/issues?q={q}", headers)
+
+    async def get_issue_with_comments(self, rng):
+        _, headers = self._user(rng)
+        _, issue_id = self._issue(rng)
+        await self._get("get_issue_with_comments", f"/api/issues/{issue_id}", headers)
+        await self._get("get_issue_with_comments", f"/api/issues/{issue_id}/comments", headers)
+
+    async def create_comment(self, rng):
+        _, headers = self._user(rng)
+        _, issue_id = self._issue(rng)
+        response = await self.client.post(
+            f"/api/issues/{issue_id}/comments", json={"body": "benchmark comment"}, headers=headers
+        )
+        self.recorder.response("create_comment", response)
+
+    async def login(self, rng):
+        from .dataset import BENCH_PASSWORD
+        user = rng.choice(self.targets["users"])
+        response = await self.client.post(
+            "/api/auth/login", json={"email": user["email"], "password": BENCH_PASSWORD}
+        )
+        self.recorder.response("login", response)
+
+
+async def _login_all(client, users: List[dict]) -> Dict[int, str]:
+    from .dataset import BENCH_PASSWORD
+    tokens = {}
+    for user in users:
+        response = await client.post("/api/auth/login", json={"email": user["email"], "password": BENCH_PASSWORD})
+        response.raise_for_status()
+        tokens[user["id"]] = response.json()["access_token"]
+    return tokens
+
+
+async def run_load(client, targets: dict, args: argparse.Namespace) -> dict:
+    recorder = Recorder()
+    scenarios = Scenarios(client, targets, await _login_all(client, targets["users"]), recorder)
+    names = args.scenario or list(SCENARIO_WEIGHTS)
+    weights = [SCENARIO_WEIGHTS[name] for name in names]
+    remaining = [args.requests]
+    deadline = time.perf_counter() + args.duration if args.duration else None
+
+    async def worker(worker_id: int):
+        rng = random.Random(args.seed * 1000 + worker_id)
+        while True:
+            if deadline is not None:
+                if time.perf_counter() >= deadline:
+                    return
+            else:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            name = rng.choices(names, weights)[0]
+            started = time.perf_counter()
+            await getattr(scenarios, name)(rng)
+            recorder.latencies[name].append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(args.concurrency)))
+    return recorder.report(time.perf_counter() - started)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_until_up(client, process, timeout: float = 30.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except Exception:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("uvicorn did not start in time")
+
+
+def cache_stats() -> dict:
+    from ..auth.permissions import membership_cache
+    from ..auth.security import user_cache
+    from ..response_cache import issue_list_cache
+    return {
+        "membership": membership_cache.stats(),
+        "user": user_cache.stats(),
+        "issue_list": issue_list_cache.stats(),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    import httpx
+    from .. import database
+    from .dataset import build_dataset, load_targets
+
+    if not args.skip_setup:
+        build_dataset(database.engine, args.users, args.projects, args.issues, args.comments_per_issue, args.seed)
+    targets = load_targets(database.engine)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    if args.server == "inprocess":
+        from .instrumented import app
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits) as client:
+            results = await run_load(client, targets, args)
+        # the caches live in this process, so their counters are available
+        results["caches"] = cache_stats()
+        return results
+
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.bench.instrumented:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(args.workers), "--log-level", "warning"],
+        env=os.environ.copy(),
+    )
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30) as client:
+            await _wait_until_up(client, process)
+            return await run_load(client, targets, args)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+async def dispose_engines() -> None:
+    """Close the app's pooled connections, before a temporary database is
+    deleted under them. Runs on the benchmark's loop, which the async
+    engine's connections belong to."""
+    from .. import database
+    # let request sessions that are still waiting to be finalized close first
+    gc.collect()
+    database.engine.dispose()
+    if database.async_engine is not None:
+        await database.async_engine.dispose()
+
+
+async def run_and_dispose(args: argparse.Namespace) -> dict:
+    try:
+        return await run(args)
+    finally:
+        await dispose_engines()
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> dict:
+    args = parse_args(argv)
+    workdir = None
+    if not args.database_url:
+        workdir = tempfile.TemporaryDirectory(prefix="issuehub-bench-")
+        args.database_url = f"sqlite:///{workdir.name}/bench.db"
+    # Settings are read when app modules are first imported, so configure the
+    # environment before importing anything from the app.
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["ASYNC_DATABASE"] = "true" if args.async_stack else "false"
+
+    try:
+        results = asyncio.run(run_and_dispose(args))
+    finally:
+        if workdir is not None:
+            workdir.cleanup()
+
+    report = {
+        "commit": _git_commit(),
+        "config": {
+            "server": args.server,
+            "workers": args.workers if args.server == "uvicorn" else None,
+            "async_stack": args.async_stack,
+            "database": args.database_url.split("://")[0],
+            "concurrency": args.concurrency,
+            "dataset": {
+                "users": args.users, "projects": args.projects,
+                "issues": args.issues, "comments_per_issue": args.comments_per_issue,
+            },
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    return report
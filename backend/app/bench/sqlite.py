@@ -0,0 +1,194 @@
+"""Compare SQLite read and write throughput with and without the engine profile.
+
+    python -m app.bench.sqlite --threads 16 --seconds 10 --write-ratio 0.2
+
+One dataset is built, then copied so each run starts from the same file in
+the default rollback-journal mode. The baseline engine is configured the way
+``database.py`` configures it without ``SQLITE_PROFILE``; the profiled one
+uses ``sqlite_profile``. Worker threads each use their own session, like
+threadpool request handlers, and mix reads with writes:
+
+* a read is an issue fetched by id plus its comments, or a page of a
+  project's issues;
+* a write adds a comment and touches its issue, in one transaction.
+
+The report has operations per second, latency percentiles, and the count of
+"database is locked" failures for each engine, as JSON.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine, insert, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from .. import sqlite_profile
+from ..models.comment import Comment
+from ..models.issue import Issue
+from .dataset import build_dataset, load_targets
+from .runner import percentile
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m app.bench.sqlite", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10.0, help="run time per engine")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="share of operations that write")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--projects", type=int, default=5)
+    parser.add_argument("--issues", type=int, default=20000)
+    parser.add_argument("--comments-per-issue", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here as well as to stdout")
+    return parser.parse_args(argv)
+
+
+def make_engine(path: str, profiled: bool):
+    url = f"sqlite:///{path}"
+    if not profiled:
+        return create_engine(url, pool_pre_ping=True, pool_size=10, max_overflow=20)
+    engine = create_engine(url, **sqlite_profile.pool_options())
+    sqlite_profile.install(engine)
+    return engine
+
+
+def _read(session, rng, targets) -> None:
+    if rng.random() < 0.5:
+        project_id = rng.choice(targets["project_ids"])
+        session.execute(
+            select(Issue).where(Issue.project_id == project_id)
+            .order_by(Issue.created_at.desc(), Issue.id.desc()).limit(50)
+        ).scalars().all()
+    else:
+        issue_id = rng.choice(targets["issue_ids"])
+        session.get(Issue, issue_id)
+        session.execute(
+            select(Comment).where(Comment.issue_id == issue_id)
+            .order_by(Comment.created_at, Comment.id).limit(50)
+        ).scalars().all()
+
+
+def _write(session, rng, targets) -> None:
+    issue_id = rng.choice(targets["issue_ids"])
+    now = datetime.now(timezone.utc)
+    session.execute(insert(Comment).values(
+        issue_id=issue_id, author_id=rng.choice(targets["user_ids"]), body="bench", created_at=now,
+    ))
+    session.execute(update(Issue).where(Issue.id == issue_id).values(updated_at=now))
+    session.commit()
+
+
+def run_workload(engine, targets: dict, args: argparse.Namespace) -> dict:
+    Session = sessionmaker(bind=engine, autoflush=False)
+    latencies: Dict[str, List[float]] = {"read": [], "write": []}
+    errors: Dict[str, int] = {"locked": 0, "other": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+
+    def worker(worker_id: int) -> None:
+        rng = random.Random(args.seed * 1000 + worker_id)
+        mine: Dict[str, List[float]] = {"read": [], "write": []}
+        locked = other = 0
+        while time.perf_counter() < deadline:
+            kind = "write" if rng.random() < args.write_ratio else "read"
+            started = time.perf_counter()
+            session = Session()
+            try:
+                (_write if kind == "write" else _read)(session, rng, targets)
+            except OperationalError as exc:
+                session.rollback()
+                if "locked" in str(exc):
+                    locked += 1
+                else:
+                    other += 1
+                continue
+            finally:
+                session.close()
+            mine[kind].append(time.perf_counter() - started)
+        with lock:
+            for name, values in mine.items():
+                latencies[name].extend(values)
+            errors["locked"] += locked
+            errors["other"] += other
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    report = {"elapsed_sec": round(elapsed, 3), "errors": errors}
+    for name, values in latencies.items():
+        ordered = sorted(values)
+        report[name] = {
+            "count": len(ordered),
+            "per_sec": round(len(ordered) / elapsed, 2),
+            "p50_ms": round(percentile(ordered, 50) * 1000, 3) if ordered else None,
+            "p95_ms": round(percentile(ordered, 95) * 1000, 3) if ordered else None,
+            "p99_ms": round(percentile(ordered, 99) * 1000, 3) if ordered else None,
+        }
+    return report
+
+
+def _targets(engine) -> dict:
+    targets = load_targets(engine)
+    with engine.connect() as connection:
+        journal_mode = connection.exec_driver_sql("PRAGMA journal_mode").scalar()
+    return {
+        "user_ids": [user["id"] for user in targets["users"]],
+        "project_ids": targets["project_ids"],
+        "issue_ids": [i for ids in targets["issues_by_project"].values() for i in ids],
+        "journal_mode": journal_mode,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> dict:
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory(prefix="issuehub-sqlite-bench-") as workdir:
+        template = os.path.join(workdir, "template.db")
+        engine = create_engine(f"sqlite:///{template}")
+        build_dataset(engine, args.users, args.projects, args.issues, args.comments_per_issue, args.seed)
+        engine.dispose()
+
+        results = {}
+        for name, profiled in (("baseline", False), ("profile", True)):
+            path = os.path.join(workdir, f"{name}.db")
+            shutil.copyfile(template, path)
+            engine = make_engine(path, profiled)
+            targets = _targets(engine)
+            results[name] = run_workload(engine, targets, args)
+            results[name]["journal_mode"] = targets["journal_mode"]
+            engine.dispose()
+
+    report = {
+        "config": {
+            "threads": args.threads, "seconds": args.seconds, "write_ratio": args.write_ratio,
+            "dataset": {
+                "users": args.users, "projects": args.projects,
+                "issues": args.issues, "comments_per_issue": args.comments_per_issue,
+            },
+            "pragmas": sqlite_profile.pragmas(),
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    return report
+
+
+if __name__ == "__main__":
+    main()
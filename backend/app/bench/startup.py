@@ -0,0 +1,128 @@
+"""Report where a worker's cold start goes, and check it against a budget.
+
+    python -m app.bench.startup --top 25
+
+A fresh interpreter imports ``app.main`` under ``-X importtime`` and runs the
+app's startup handlers. The report, as JSON, has:
+
+* the time to import ``app.main`` and run startup, against
+  ``COLD_START_BUDGET_MS``;
+* the time spent in the app's own module bodies (routes, schemas, engines,
+  caches), against ``APP_IMPORT_BUDGET_MS``; the rest is FastAPI, pydantic
+  and SQLAlchemy;
+* per-module import and initialization time, as self and cumulative ms,
+  for the slowest modules and for every ``app.*`` module;
+* the work deferred to first use, such as building the password context, with
+  a check that startup didn't do it.
+
+The exit status is 1 when startup is over budget. The budgets leave room for
+slower CI machines; a regression like the old default-cost bcrypt probe at
+import still breaks the app budget.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+# Import of app.main plus startup handlers, in a fresh interpreter
+COLD_START_BUDGET_MS = 3000
+# Of which in the app's own modules
+APP_IMPORT_BUDGET_MS = 600
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+_CHILD = """
+import asyncio, json, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+asyncio.run(app.main.app.router.startup())
+ready = time.perf_counter()
+
+from app.auth import security
+built_at_startup = security.get_pwd_context.cache_info().currsize > 0
+probe_started = time.perf_counter()
+security.get_pwd_context()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (ready - imported) * 1000,
+    "password_context_ms": (time.perf_counter() - probe_started) * 1000,
+    "password_context_built_at_startup": built_at_startup,
+}))
+"""
+
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_importtime(stderr: str) -> List[dict]:
+    modules = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append({
+                "module": name,
+                "self_ms": round(int(self_us) / 1000, 2),
+                "cumulative_ms": round(int(cumulative_us) / 1000, 2),
+                "depth": len(indent) // 2,
+            })
+    return modules
+
+
+def measure(top: int = 25) -> dict:
+    started = time.perf_counter()
+    child = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD],
+        cwd=BACKEND_DIR, env=os.environ.copy(), capture_output=True, text=True,
+    )
+    process_ms = (time.perf_counter() - started) * 1000
+    if child.returncode != 0:
+        raise RuntimeError(f"startup failed:\n{child.stderr[-2000:]}")
+    phases = json.loads(child.stdout.strip().splitlines()[-1])
+    modules = parse_importtime(child.stderr)
+    app_modules = [m for m in modules if m["module"] == "app" or m["module"].startswith("app.")]
+
+    cold_start_ms = phases["import_ms"] + phases["startup_ms"]
+    app_import_ms = sum(m["self_ms"] for m in app_modules)
+    return {
+        "process_ms": round(process_ms, 1),
+        "cold_start_ms": round(cold_start_ms, 1),
+        "import_ms": round(phases["import_ms"], 1),
+        "startup_ms": round(phases["startup_ms"], 1),
+        "app_import_ms": round(app_import_ms, 1),
+        "budget": {"cold_start_ms": COLD_START_BUDGET_MS, "app_import_ms": APP_IMPORT_BUDGET_MS},
+        "within_budget": cold_start_ms <= COLD_START_BUDGET_MS and app_import_ms <= APP_IMPORT_BUDGET_MS,
+        "deferred": {
+            "password_context_ms": round(phases["password_context_ms"], 1),
+            "password_context_built_at_startup": phases["password_context_built_at_startup"],
+        },
+        "slowest_modules": sorted(modules, key=lambda m: m["self_ms"], reverse=True)[:top],
+        "app_modules": sorted(app_modules, key=lambda m: m["self_ms"], reverse=True),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(prog="python -m app.bench.startup", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=25, help="slowest modules to list")
+    parser.add_argument("--output", help="write the JSON report here as well as to stdout")
+    args = parser.parse_args(argv)
+
+    report = measure(args.top)
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    if not report["within_budget"]:
+        sys.exit(1)
+    return report
+
+
+if __name__ == "__main__":
+    main()
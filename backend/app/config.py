@@ -13,5 +13,60 @@ class Settings(BaseSettings):
     # production if your environment supports the bcrypt backend. Keep
     # "pbkdf2_sha256" for CI/dev portability.
     preferred_password_scheme: str = "pbkdf2_sha256"
+    # Dedicated pool for password hashing (see auth/hashing.py). Requests beyond
+    # max_pending get 503 with Retry-After instead of queueing.
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 32
+    password_hash_retry_after_seconds: int = 1
+    # Process-local cache of project roles used by check_project_access.
+    # A TTL of 0 turns the cache off.
+    membership_cache_size: int = 10000
+    membership_cache_ttl_seconds: float = 60.0
+    # Opt-in: put the user's name and email in the access token so requests
+    # don't look the user up. Claims stay as issued until the token expires,
+    # and tokens without them are resolved through a short-lived user cache.
+    auth_token_claims: bool = False
+    user_cache_size: int = 10000
+    user_cache_ttl_seconds: float = 30.0
+    # Serve requests from the asyncio stack (AsyncSession over aiosqlite or
+    # asyncpg) instead of sync handlers on the threadpool.
+    async_database: bool = False
+    # Cache of serialized list_issues pages, keyed on the project's issue
+    # version (see response_cache.py): "memory", "off", or "module:Class".
+    response_cache_backend: str = "memory"
+    response_cache_max_bytes: int = 64 * 1024 * 1024
+    # Rows per transaction for issue imports (see importer.py)
+    import_batch_size: int = 1000
+    # Live event streams (see events.py): events buffered per subscriber
+    # before it is evicted as too slow, streams per worker, and seconds of
+    # silence before a keep-alive comment. EventSource can't send headers,
+    # so browsers open the stream with a short-lived token in the URL.
+    events_queue_size: int = 256
+    events_max_subscribers: int = 10000
+    events_heartbeat_seconds: float = 15.0
+    events_token_expire_seconds: int = 60
+    # Request, SQL, pool and cache metrics served at /metrics (see metrics.py)
+    metrics_enabled: bool = True
+    # Log statements slower than this as JSON, with their plan (see
+    # slow_queries.py); 0 turns the log off. Each distinct statement is
+    # logged at most once per interval.
+    slow_query_threshold_ms: float = 500.0
+    slow_query_log_interval_seconds: float = 60.0
+    slow_query_redact_parameters: bool = True
+    slow_query_explain: bool = True
+    # Engine profile for a SQLite file database (see sqlite_profile.py): WAL,
+    # synchronous=NORMAL, a busy timeout, a larger page cache and mmap, and a
+    # fixed-size pool. Other backends are unaffected.
+    sqlite_profile: bool = False
+    sqlite_pool_size: int = 20
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 16 * 1024
+    sqlite_mmap_size_mib: int = 256
+    # Comma-separated replica URLs that serve GET/HEAD requests (see
+    # replicas.py), picked "round_robin" or "least_busy". A client that wrote
+    # reads from the primary for the sticky window afterwards.
+    read_replica_urls: str = ""
+    read_replica_strategy: str = "round_robin"
+    read_replica_sticky_seconds: float = 5.0
 
 settings = Settings()
@@ -1,22 +1,166 @@
+from typing import Optional
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from .config import settings
+from .metrics import TimedAsyncQueuePool, TimedQueuePool
+from . import sqlite_profile
+from .replicas import Replica, ReplicaSet, credential, parse_urls
 
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
-)
+def make_engine(url: str):
+    profiled = sqlite_profile.applies_to(url)
+    engine = create_engine(
+        url,
+        poolclass=TimedQueuePool if settings.metrics_enabled else QueuePool,
+        **(sqlite_profile.pool_options() if profiled
+           else {"pool_pre_ping": True, "pool_size": 10, "max_overflow": 20})
+    )
+    if profiled:
+        sqlite_profile.install(engine)
+    return engine
+
+engine = make_engine(settings.database_url)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
+def _replica_set(factories) -> ReplicaSet:
+    return ReplicaSet(
+        [Replica(url, factory) for url, factory in factories],
+        settings.read_replica_strategy,
+        settings.read_replica_sticky_seconds,
+    )
+
+# Read-only requests are served from these when configured (see replicas.py)
+read_replicas = _replica_set(
+    (url, sessionmaker(autocommit=False, autoflush=False, bind=make_engine(url)))
+    for url in parse_urls(settings.read_replica_urls)
+)
+
+def open_session(method: str, client: Optional[str]):
+    """A session for a request with this method and credential: from a read
+    replica when one applies, else the primary. Close it with close_session."""
+    replica = read_replicas.choose(method, client)
+    if replica is None:
+        return SessionLocal()
+    db = replica.session_factory()
+    db.info["replica"] = (read_replicas, replica)
+    return db
+
+def _release_replica(db) -> None:
+    # once only: release_db and the dependency's teardown both get here
+    held = db.info.pop("replica", None)
+    if held:
+        replica_set, replica = held
+        replica_set.release(replica)
+
+def close_session(db) -> None:
+    db.close()
+    _release_replica(db)
+
+def get_db(request: Request):
+    db = open_session(request.method, credential(request))
     try:
         yield db
     finally:
-        db.close()
+        close_session(db)
+        read_replicas.finished(request.method, credential(request))
+
+
+# Async stack, used when `settings.async_database` is on. The engine is created
+# on first use so the async drivers (aiosqlite / asyncpg) are only needed by
+# deployments that enable it.
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+async_engine = None
+AsyncSessionLocal = None
+async_read_replicas = None
+
+def async_database_url(url: str) -> str:
+    """Map a sync database URL onto the matching asyncio driver"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r} databases")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+def make_async_engine(url: str):
+    from sqlalchemy.ext.asyncio import create_async_engine
+    url = async_database_url(url)
+    # aiosqlite uses NullPool/StaticPool, which take no sizing arguments,
+    # unless the SQLite profile gives it a pool of its own
+    profiled = sqlite_profile.applies_to(url)
+    if profiled:
+        pool_args = sqlite_profile.pool_options()
+    elif url.startswith("sqlite"):
+        pool_args = {"pool_pre_ping": True}
+    else:
+        pool_args = {"pool_pre_ping": True, "pool_size": 10, "max_overflow": 20}
+    if "pool_size" in pool_args:
+        pool_args["poolclass"] = TimedAsyncQueuePool if settings.metrics_enabled else AsyncAdaptedQueuePool
+    engine = create_async_engine(url, **pool_args)
+    if profiled:
+        sqlite_profile.install(engine)
+    return engine
+
+def _async_sessionmaker(engine):
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    # Objects are returned to FastAPI for serialization after the session
+    # work is done, where lazy refreshes can't run; keep them loaded.
+    return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+def get_async_sessionmaker():
+    global async_engine, AsyncSessionLocal, async_read_replicas
+    if AsyncSessionLocal is None:
+        async_engine = make_async_engine(settings.database_url)
+        AsyncSessionLocal = _async_sessionmaker(async_engine)
+        async_read_replicas = _replica_set(
+            (url, _async_sessionmaker(make_async_engine(url)))
+            for url in parse_urls(settings.read_replica_urls)
+        )
+    return AsyncSessionLocal
+
+async def get_async_db(request: Request):
+    primary = get_async_sessionmaker()
+    replica = async_read_replicas.choose(request.method, credential(request))
+    db = (replica.session_factory if replica else primary)()
+    if replica:
+        db.info["replica"] = (async_read_replicas, replica)
+    try:
+        yield db
+    finally:
+        await db.close()
+        _release_replica(db)
+        async_read_replicas.finished(request.method, credential(request))
+
+async def run_db(db, fn, *args):
+    """Run `fn(session, *args)` from an `async def` endpoint on either stack.
+
+    With an `AsyncSession` the work runs through the async driver; with a sync
+    `Session` it is moved to the threadpool so it doesn't block the event loop.
+    """
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from starlette.concurrency import run_in_threadpool
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args)
+    return await run_in_threadpool(fn, db, *args)
+
+
+async def release_db(db) -> None:
+    """Close `db` from an `async def` endpoint, returning its connection to
+    the pool, and its read replica slot, before a long-lived response rather
+    than after it."""
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from starlette.concurrency import run_in_threadpool
+    if isinstance(db, AsyncSession):
+        await db.close()
+        _release_replica(db)
+    else:
+        await run_in_threadpool(close_session, db)
@@ -0,0 +1,286 @@
+"""Generate a large synthetic dataset with bulk inserts.
+
+    python -m app.datagen --users 5000 --projects 200 --issues 1000000
+
+Rows are produced lazily and written with Core ``executemany`` inserts in
+chunks, each chunk in its own transaction, so memory stays flat whatever the
+size. Ids are assigned here rather than read back from the database, which
+lets comments be generated alongside their issues. The password is hashed once
+and shared by every generated user.
+
+Distributions:
+
+* project sizes follow a Zipf-like curve (``--project-skew``; 0 = uniform),
+* description lengths are log-normal around ``--description-words``,
+* comments per issue are exponential around ``--comments-mean``, and a small
+  share of "incident" issues (``--hot-issue-rate``) get ``--hot-issue-comments``.
+
+Emails and project keys embed the new row ids, so repeated runs append to the
+database rather than colliding with earlier ones.
+
+The full-text search index is dropped during the load and rebuilt at the end.
+"""
+import argparse
+import itertools
+import json
+import math
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, List
+
+from sqlalchemy import func, insert, inspect, select, text
+
+WORDS = (
+    "login crash timeout export import report dashboard search filter cache "
+    "database latency memory upload download profile settings email session "
+    "token password button layout mobile sync offline notification error page "
+    "slow broken missing wrong invalid duplicate regression flaky build deploy "
+    "release api request response header cookie redirect permission role user "
+    "project issue comment status priority assignee migration index query"
+).split()
+
+
+@dataclass
+class DatasetSpec:
+    users: int = 1000
+    projects: int = 50
+    issues: int = 100000
+    members_per_project: int = 20
+    project_skew: float = 1.1
+    description_words: int = 60
+    comments_mean: float = 2.0
+    hot_issue_rate: float = 0.001
+    hot_issue_comments: int = 500
+    prefix: str = "gen"
+    password: str = "password123"
+    seed: int = 0
+    chunk_size: int = 10000
+
+
+def _chunks(rows: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class _Progress:
+    def __init__(self, quiet: bool):
+        self.quiet = quiet
+        self.counts = {}
+        self.started = time.perf_counter()
+
+    def add(self, table: str, rows: int) -> None:
+        self.counts[table] = self.counts.get(table, 0) + rows
+        if not self.quiet:
+            elapsed = time.perf_counter() - self.started
+            print(f"\r{table}: {self.counts[table]:>10,} rows  ({elapsed:6.1f}s)", end="", file=sys.stderr)
+
+    def done(self, table: str) -> None:
+        if not self.quiet and table in self.counts:
+            print(file=sys.stderr)
+
+
+def _next_id(connection, table) -> int:
+    return (connection.execute(select(func.coalesce(func.max(table.c.id), 0))).scalar() or 0) + 1
+
+
+def _write(engine, table, rows: Iterable[dict], spec: DatasetSpec, progress: _Progress, name: str) -> None:
+    for chunk in _chunks(rows, spec.chunk_size):
+        with engine.begin() as connection:
+            connection.execute(insert(table), chunk)
+        progress.add(name, len(chunk))
+    progress.done(name)
+
+
+def _text_source(rng: random.Random, size: int = 200000) -> List[str]:
+    return [rng.choice(WORDS) for _ in range(size)]
+
+
+def generate(engine, spec: DatasetSpec, quiet: bool = False) -> dict:
+    """Fill the database behind ``engine`` according to ``spec``.
+
+    The schema must already exist. Returns row counts and elapsed time.
+    """
+    from .auth.security import get_password_hash
+    from .models.comment import Comment
+    from .models.issue import Issue, IssuePriority, IssueStatus
+    from .models.project import Project
+    from .issue_stats import COUNTER_COLUMNS, IssueStatsDelta
+    from .models.project_issue_stats import ProjectIssueStats
+    from .models.project_member import MemberRole, ProjectMember
+    from .models.user import User
+    from .search import drop_search_index, install_search_index, search_backend_for
+
+    rng = random.Random(spec.seed)
+    progress = _Progress(quiet)
+    started = time.perf_counter()
+    users, projects, issues, comments = (
+        User.__table__, Project.__table__, Issue.__table__, Comment.__table__
+    )
+
+    with engine.begin() as connection:
+        first_user = _next_id(connection, users)
+        first_project = _next_id(connection, projects)
+        first_issue = _next_id(connection, issues)
+        had_search_index = search_backend_for(connection) is not None
+        if had_search_index:
+            drop_search_index(connection)
+
+    user_ids = range(first_user, first_user + spec.users)
+    project_ids = list(range(first_project, first_project + spec.projects))
+    password_hash = get_password_hash(spec.password)
+    now = datetime.now(timezone.utc)
+
+    _write(engine, users, (
+        {"id": user_id, "name": f"User {user_id}", "email": f"{spec.prefix}-user-{user_id}@example.com",
+         "password_hash": password_hash}
+        for user_id in user_ids
+    ), spec, progress, "users")
+
+    _write(engine, projects, (
+        {"id": project_id, "name": f"Project {project_id}", "key": f"{spec.prefix.upper()}{project_id}",
+         "description": f"Generated project {project_id}"}
+        for project_id in project_ids
+    ), spec, progress, "projects")
+
+    members = {}
+    for project_id in project_ids:
+        members[project_id] = rng.sample(user_ids, min(spec.members_per_project, spec.users))
+    _write(engine, ProjectMember.__table__, (
+        {"project_id": project_id, "user_id": user_id,
+         "role": MemberRole.MAINTAINER if index == 0 else MemberRole.MEMBER}
+        for project_id in project_ids
+        for index, user_id in enumerate(members[project_id])
+    ), spec, progress, "project_members")
+
+    # Zipf-like project weights: the first projects get most of the issues
+    weights = [1 / (rank + 1) ** spec.project_skew for rank in range(spec.projects)]
+    cum_weights = list(itertools.accumulate(weights))
+    statuses, priorities = list(IssueStatus), list(IssuePriority)
+    source = _text_source(rng)
+    mu = math.log(max(1, spec.description_words))
+
+    def description() -> str:
+        words = min(len(source) // 2, max(1, int(rng.lognormvariate(mu, 0.8))))
+        start = rng.randrange(len(source) - words)
+        return " ".join(source[start:start + words])
+
+    def comment_body() -> str:
+        start = rng.randrange(len(source) - 30)
+        return " ".join(source[start:start + rng.randint(5, 30)])
+
+    def comment_count() -> int:
+        if rng.random() < spec.hot_issue_rate:
+            return spec.hot_issue_comments
+        return int(rng.expovariate(1 / spec.comments_mean)) if spec.comments_mean > 0 else 0
+
+    stats = {project_id: IssueStatsDelta() for project_id in project_ids}
+    issue_batch: List[dict] = []
+    comment_batch: List[dict] = []
+
+    def flush() -> None:
+        with engine.begin() as connection:
+            if issue_batch:
+                connection.execute(insert(issues), issue_batch)
+            if comment_batch:
+                connection.execute(insert(comments), comment_batch)
+        progress.add("issues", len(issue_batch))
+        issue_batch.clear()
+        comment_batch.clear()
+
+    for issue_id in range(first_issue, first_issue + spec.issues):
+        project_id = rng.choices(project_ids, cum_weights=cum_weights)[0]
+        team = members[project_id]
+        created_at = now - timedelta(seconds=rng.randrange(365 * 24 * 3600))
+        updated_at = created_at + timedelta(seconds=rng.randrange(30 * 24 * 3600))
+        status, priority = rng.choice(statuses), rng.choice(priorities)
+        stats[project_id].add(status, priority)
+        issue_batch.append({
+            "id": issue_id,
+            "project_id": project_id,
+            "title": " ".join(rng.choices(WORDS, k=rng.randint(3, 8))),
+            "description": description(),
+            "status": status,
+            "priority": priority,
+            "reporter_id": rng.choice(team),
+            "assignee_id": rng.choice(team) if rng.random() < 0.7 else None,
+            "created_at": created_at,
+            "updated_at": min(updated_at, now),
+        })
+        for n in range(comment_count()):
+            comment_batch.append({
+                "issue_id": issue_id,
+                "author_id": rng.choice(team),
+                "body": comment_body(),
+                "created_at": created_at + timedelta(minutes=n + 1),
+            })
+        if len(issue_batch) + len(comment_batch) >= spec.chunk_size:
+            flush()
+    flush()
+    progress.done("issues")
+
+    _write(engine, ProjectIssueStats.__table__, (
+        {"project_id": project_id, **{name: stats[project_id].counts[name] for name in COUNTER_COLUMNS}}
+        for project_id in project_ids
+    ), spec, progress, "project_issue_stats")
+
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            # ids were assigned here, so move the sequences past them
+            for table in (users, projects, issues):
+                connection.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                    f"(SELECT max(id) FROM {table.name}))"
+                ))
+        if had_search_index:
+            install_search_index(connection)
+
+    with engine.connect() as connection:
+        comment_total = connection.execute(
+            select(func.count()).select_from(comments).where(comments.c.issue_id >= first_issue)
+        ).scalar()
+    return {
+        "users": spec.users,
+        "projects": spec.projects,
+        "project_members": sum(len(team) for team in members.values()),
+        "issues": spec.issues,
+        "comments": comment_total,
+        "elapsed_sec": round(time.perf_counter() - started, 2),
+    }
+
+
+def main() -> None:
+    defaults = DatasetSpec()
+    parser = argparse.ArgumentParser(prog="python -m app.datagen", description="Generate a synthetic IssueHub dataset")
+    parser.add_argument("--database-url", help="target database (default: DATABASE_URL from settings)")
+    parser.add_argument("--create-schema", action="store_true", help="create tables and the search index first")
+    for field, value in asdict(defaults).items():
+        parser.add_argument("--" + field.replace("_", "-"), type=type(value), default=value)
+    args = parser.parse_args()
+
+    from sqlalchemy import create_engine
+    from .config import settings
+    engine = create_engine(args.database_url or settings.database_url)
+
+    if args.create_schema:
+        from .models import comment, issue, project, project_issue_stats, project_member, user  # noqa: F401
+        from .database import Base
+        from .search import install_search_index
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as connection:
+            install_search_index(connection)
+    elif not inspect(engine).has_table("issues"):
+        parser.error("the database has no schema; run `alembic upgrade head` or pass --create-schema")
+
+    spec = DatasetSpec(**{field: getattr(args, field) for field in asdict(defaults)})
+    print(json.dumps(generate(engine, spec), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Strong ETags and ``If-None-Match`` handling for read endpoints.
+
+Tags are computed from cheap version data (the project's issue change counter,
+or a count/max aggregate), so a revalidation that matches is answered with
+``304 Not Modified`` before anything is loaded or serialized. Responses are
+sent with ``Cache-Control: private, no-cache`` so that browsers keep them but
+revalidate each time, which is what makes repeat navigations cheap.
+"""
+import hashlib
+
+from fastapi import Request, Response
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:24]
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match covers ``etag``"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so a W/ prefix is ignored
+    return etag in {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def tagged_json(body: bytes, etag: str) -> Response:
+    """A JSON response for an already-serialized body"""
+    return Response(
+        content=body, media_type="application/json", headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
@@ -0,0 +1,206 @@
+"""In-process pub/sub for live project updates.
+
+Routes publish an event after their write commits; ``GET
+/api/projects/{id}/events`` streams them to subscribers as Server-Sent Events.
+A subscriber is a bounded ``asyncio.Queue`` on the event loop serving its
+connection, so an idle stream costs a suspended coroutine and no thread.
+
+Publishers may run on any thread (sync handlers run on the threadpool).
+Each event is encoded once, and handed to each event loop with a single
+``call_soon_threadsafe`` however many of its subscribers receive it.
+
+A subscriber whose queue is full is evicted rather than allowed to hold up
+everybody else or grow without bound: its backlog is dropped and its stream
+ends with an ``evicted`` event, after which the client should reconnect and
+re-read what it shows.
+
+The hub is per process. With several workers, each only sees the writes it
+served, much like the response cache.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from .config import settings
+from .responses import dumps
+
+# Queue markers that end a stream
+EVICTED = object()
+CLOSED = object()
+
+# Events sent to the client in one write when several are waiting
+MAX_EVENTS_PER_WRITE = 64
+
+
+class HubFull(Exception):
+    """Raised by :meth:`EventHub.subscribe` at ``max_subscribers``"""
+
+
+def encode_event(event_type: str, data: Any) -> str:
+    return f"event: {event_type}\ndata: {dumps(data).decode()}\n\n"
+
+
+class Subscription:
+    def __init__(self, hub: "EventHub", project_id: int, queue_size: int):
+        self.hub = hub
+        self.project_id = project_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.evicted = False
+
+    def _deliver(self, message) -> None:
+        # Runs on self.loop
+        if self.evicted:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.evicted = True
+            self.hub._evict(self)
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(EVICTED)
+
+    async def stream(self, heartbeat: float) -> AsyncIterator[str]:
+        """Yield SSE frames until the stream is evicted or closed, with a
+        comment line every ``heartbeat`` seconds of silence."""
+        try:
+            # tell EventSource how soon to reconnect, and flush the headers
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(self.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                frames = []
+                while isinstance(message, str):
+                    frames.append(message)
+                    if len(frames) == MAX_EVENTS_PER_WRITE or self.queue.empty():
+                        break
+                    message = self.queue.get_nowait()
+                if frames:
+                    yield "".join(frames)
+                if message is EVICTED:
+                    yield encode_event("evicted", {"reason": "subscriber fell behind"})
+                    return
+                if message is CLOSED:
+                    return
+        finally:
+            self.hub.unsubscribe(self)
+
+
+class EventHub:
+    def __init__(self, queue_size: int, max_subscribers: int):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.published = 0
+        self.delivered = 0
+        self.evictions = 0
+        self._subscribers: Dict[int, Set[Subscription]] = defaultdict(set)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def check_capacity(self) -> None:
+        """Raise :class:`HubFull` if a subscribe now would, so a route can
+        answer 503 before it starts a response"""
+        with self._lock:
+            if self._count >= self.max_subscribers:
+                raise HubFull()
+
+    def subscribe(self, project_id: int) -> Subscription:
+        """Register a subscriber; call from the event loop that will read it"""
+        subscription = Subscription(self, project_id, self.queue_size)
+        with self._lock:
+            if self._count >= self.max_subscribers:
+                raise HubFull()
+            self._subscribers[project_id].add(subscription)
+            self._count += 1
+        return subscription
+
+    async def stream(self, project_id: int, heartbeat: float) -> AsyncIterator[str]:
+        """Subscribe to ``project_id`` and yield its SSE frames.
+
+        The subscription is made on the first iteration, not when the
+        generator is created: a generator that is never started doesn't run
+        its ``finally`` when closed, so a response dropped before it is sent
+        (say, the client went away first) would otherwise hold a slot and
+        keep receiving events for good.
+        """
+        try:
+            subscription = self.subscribe(project_id)
+        except HubFull:
+            # the hub filled up between check_capacity and now
+            yield encode_event("evicted", {"reason": "too many open event streams"})
+            return
+        try:
+            async for frame in subscription.stream(heartbeat):
+                yield frame
+        finally:
+            self.unsubscribe(subscription)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.project_id)
+            if subscribers is None or subscription not in subscribers:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.project_id]
+            self._count -= 1
+
+    def _evict(self, subscription: Subscription) -> None:
+        self.unsubscribe(subscription)
+        with self._lock:
+            self.evictions += 1
+
+    def _send(self, subscribers: List[Subscription], message) -> None:
+        by_loop: Dict[asyncio.AbstractEventLoop, List[Subscription]] = defaultdict(list)
+        for subscription in subscribers:
+            by_loop[subscription.loop].append(subscription)
+        for loop, group in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(_deliver_all, group, message)
+            except RuntimeError:
+                # the loop has shut down; its connections are gone
+                for subscription in group:
+                    self.unsubscribe(subscription)
+
+    def publish(self, project_id: int, event_type: str, data: Any) -> int:
+        """Queue an event for the project's subscribers; returns how many"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(project_id, ()))
+            self.published += 1
+            self.delivered += len(subscribers)
+        if subscribers:
+            self._send(subscribers, encode_event(event_type, data))
+        return len(subscribers)
+
+    def close_all(self) -> None:
+        """End every open stream, e.g. at shutdown"""
+        with self._lock:
+            subscribers = [s for group in self._subscribers.values() for s in group]
+        self._send(subscribers, CLOSED)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "subscribers": self._count,
+                "projects": len(self._subscribers),
+                "published": self.published,
+                "delivered": self.delivered,
+                "evictions": self.evictions,
+            }
+
+
+def _deliver_all(subscribers: List[Subscription], message) -> None:
+    for subscription in subscribers:
+        subscription._deliver(message)
+
+
+hub = EventHub(settings.events_queue_size, settings.events_max_subscribers)
+
+
+def publish(project_id: int, event_type: str, data: Optional[Any] = None) -> None:
+    hub.publish(project_id, event_type, data)
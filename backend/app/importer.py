@@ -0,0 +1,302 @@
+"""Streaming import of issues and their comments.
+
+Input is NDJSON (one issue per line) or CSV with a header row, in the shape
+``IssueImport`` describes:
+
+    {"title": "Crash on save", "description": "...", "priority": "high",
+     "status": "open", "reporter_email": "ann@example.com",
+     "assignee_email": "bob@example.com", "created_at": "2024-03-01T09:30:00",
+     "comments": [{"body": "Seen it too", "author_email": "bob@example.com"}]}
+
+In CSV, ``comments`` is a JSON array in a single column, as the export
+writes it. Records are validated one at a time and written in batches,
+each batch in its own transaction with executemany inserts. A record that
+fails validation is reported with its line number and skipped; a batch the
+database rejects is reported line by line and the import moves on. Only one
+batch is held at a time, and users are resolved by email through a map of
+the project's members loaded once at the start, so memory stays bounded
+whatever the input size. Reporters, assignees and comment authors must be
+members of the project; the error doesn't say whether an email is registered.
+The export writes the same ``*_email`` fields, so its output imports as is.
+
+    python -m app.importer --project-id 3 issues.ndjson
+    python -m app.importer --project-id 3 --format csv --batch-size 5000 - < issues.csv
+
+The HTTP endpoint (``POST /api/projects/{id}/issues/import``) runs the same
+code on the uploaded body.
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+
+from . import database
+from .events import publish
+from .issue_stats import IssueStatsDelta
+from .models.comment import Comment
+from .models.issue import Issue, IssuePriority, IssueStatus
+from .models.project_member import ProjectMember
+from .models.user import User
+from .schemas.issue import IssueImport
+from .versions import bump_issues_version
+
+# Errors kept in the report; the count keeps going past it
+MAX_REPORTED_ERRORS = 100
+
+
+def ndjson_records(lines: Iterable[str]) -> Iterator[Tuple[int, object]]:
+    """Yield ``(line number, record)``; a line that isn't JSON yields the
+    exception instead of a record."""
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as exc:
+            yield line_number, exc
+
+
+def csv_records(lines: Iterable[str]) -> Iterator[Tuple[int, object]]:
+    reader = csv.DictReader(lines)
+    for row in reader:
+        # an empty cell is a missing value, as the export writes None
+        record = {key: value if value != "" else None for key, value in row.items() if key is not None}
+        try:
+            comments = record.get("comments")
+            record["comments"] = json.loads(comments) if comments else []
+        except ValueError as exc:
+            yield reader.line_num, exc
+            continue
+        yield reader.line_num, record
+
+
+READERS = {"ndjson": ndjson_records, "csv": csv_records}
+
+
+def _error_message(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+        )
+    return str(exc).splitlines()[0] if str(exc) else type(exc).__name__
+
+
+class Importer:
+    """Imports records into one project.
+
+    ``reporter_id`` is used for issues whose reporter isn't given, and for
+    comments without an author.
+    """
+
+    def __init__(self, project_id: int, reporter_id: int, batch_size: int = 1000,
+                 session_factory: Optional[Callable] = None,
+                 on_progress: Optional[Callable[[dict], None]] = None):
+        self.project_id = project_id
+        self.reporter_id = reporter_id
+        self.batch_size = batch_size
+        self.session_factory = session_factory or database.SessionLocal
+        self.on_progress = on_progress
+        self.users: Dict[str, int] = {}
+        self.user_ids = set()
+        self.started = time.perf_counter()
+        self.report = {"lines": 0, "issues": 0, "comments": 0, "failed": 0, "errors": []}
+
+    def _load_users(self) -> None:
+        db = self.session_factory()
+        try:
+            members = (
+                select(User.id, User.email)
+                .join(ProjectMember, ProjectMember.user_id == User.id)
+                .where(ProjectMember.project_id == self.project_id)
+            )
+            for user_id, email in db.execute(members):
+                self.users[email.lower()] = user_id
+                self.user_ids.add(user_id)
+        finally:
+            db.close()
+
+    def _fail(self, line_number: int, message: str) -> None:
+        self.report["failed"] += 1
+        if len(self.report["errors"]) < MAX_REPORTED_ERRORS:
+            self.report["errors"].append({"line": line_number, "error": message})
+
+    def _user(self, role: str, email: Optional[str], default: Optional[int]) -> Optional[int]:
+        if email is None:
+            return default
+        user_id = self.users.get(email.strip().lower())
+        if user_id is None:
+            raise ValueError(f"{role} is not a member of this project")
+        return user_id
+
+    def prepare(self, record: dict) -> Tuple[dict, List[dict]]:
+        """Validate one record; return its issue row and comment rows"""
+        item = IssueImport.model_validate(record)
+        try:
+            priority = IssuePriority(item.priority)
+        except ValueError:
+            raise ValueError(f"invalid priority {item.priority!r}")
+        try:
+            issue_status = IssueStatus(item.status)
+        except ValueError:
+            raise ValueError(f"invalid status {item.status!r}")
+        assignee_id = self._user("assignee", item.assignee_email, item.assignee_id)
+        if assignee_id is not None and assignee_id not in self.user_ids:
+            raise ValueError("assignee is not a member of this project")
+        # Every row of an executemany needs the same keys, so missing
+        # timestamps are filled in here rather than left to server defaults
+        created_at = item.created_at or datetime.now(timezone.utc)
+        issue = {
+            "project_id": self.project_id,
+            "title": item.title,
+            "description": item.description,
+            "status": issue_status,
+            "priority": priority,
+            "reporter_id": self._user("reporter", item.reporter_email, self.reporter_id),
+            "assignee_id": assignee_id,
+            "created_at": created_at,
+            "updated_at": item.updated_at or created_at,
+        }
+        comments = [
+            {
+                "author_id": self._user("comment author", comment.author_email, self.reporter_id),
+                "body": comment.body,
+                "created_at": comment.created_at or created_at,
+            }
+            for comment in item.comments
+        ]
+        return issue, comments
+
+    def _write(self, batch: List[Tuple[int, dict, List[dict]]]) -> None:
+        issues = Issue.__table__
+        stats = IssueStatsDelta()
+        for _, issue, _ in batch:
+            stats.add(issue["status"], issue["priority"])
+        rows = [issue for _, issue, _ in batch]
+        db = self.session_factory()
+        try:
+            comment_rows = []
+            if any(comments for _, _, comments in batch):
+                # comments need their issue's id, in input order
+                issue_ids = db.execute(
+                    insert(issues).returning(issues.c.id, sort_by_parameter_order=True), rows
+                ).scalars().all()
+                for issue_id, (_, _, comments) in zip(issue_ids, batch):
+                    comment_rows.extend({"issue_id": issue_id, **comment} for comment in comments)
+            else:
+                db.execute(insert(issues), rows)
+            if comment_rows:
+                db.execute(insert(Comment.__table__), comment_rows)
+            stats.apply(db, self.project_id)
+            bump_issues_version(db, self.project_id)
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            message = f"batch rejected by the database: {_error_message(exc)}"
+            for line_number, _, _ in batch:
+                self._fail(line_number, message)
+            return
+        finally:
+            db.close()
+        self.report["issues"] += len(batch)
+        self.report["comments"] += len(comment_rows)
+        # one event per batch; subscribers re-read rather than take every row
+        publish(self.project_id, "issues.imported", {"issues": len(batch), "comments": len(comment_rows)})
+
+    def run(self, records: Iterable[Tuple[int, object]]) -> dict:
+        self._load_users()
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, self.batch_size))
+            if not chunk:
+                break
+            batch = []
+            for line_number, record in chunk:
+                self.report["lines"] += 1
+                if isinstance(record, Exception):
+                    self._fail(line_number, _error_message(record))
+                    continue
+                try:
+                    issue, comments = self.prepare(record)
+                except (ValidationError, ValueError, TypeError) as exc:
+                    self._fail(line_number, _error_message(exc))
+                    continue
+                batch.append((line_number, issue, comments))
+            if batch:
+                self._write(batch)
+            if self.on_progress:
+                self.on_progress(self.progress())
+        return {**self.progress(), "errors": self.report["errors"]}
+
+    def progress(self) -> dict:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "lines": self.report["lines"],
+            "issues": self.report["issues"],
+            "comments": self.report["comments"],
+            "failed": self.report["failed"],
+            "elapsed_sec": round(elapsed, 2),
+            "issues_per_sec": round(self.report["issues"] / elapsed, 1) if elapsed else None,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.importer", description="Import issues into a project")
+    parser.add_argument("path", help="input file, or - for stdin")
+    parser.add_argument("--project-id", type=int, required=True)
+    parser.add_argument("--format", choices=sorted(READERS), default="ndjson")
+    parser.add_argument("--batch-size", type=int, help="rows per transaction (default: IMPORT_BATCH_SIZE)")
+    parser.add_argument("--reporter-email", help="reporter for issues that don't name one "
+                                                 "(default: the project's first maintainer)")
+    parser.add_argument("--database-url", help="target database (default: DATABASE_URL from settings)")
+    args = parser.parse_args()
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from .config import settings
+    from .models import comment, project, project_issue_stats, project_member  # noqa: F401  (configure the mappers)
+    from .models.project_member import MemberRole
+
+    engine = create_engine(args.database_url or settings.database_url)
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as db:
+        if args.reporter_email:
+            reporter_id = db.query(User.id).join(ProjectMember, ProjectMember.user_id == User.id).filter(
+                ProjectMember.project_id == args.project_id, User.email == args.reporter_email
+            ).scalar()
+        else:
+            reporter_id = db.query(ProjectMember.user_id).filter(
+                ProjectMember.project_id == args.project_id, ProjectMember.role == MemberRole.MAINTAINER
+            ).order_by(ProjectMember.id).limit(1).scalar()
+    if reporter_id is None:
+        parser.error("no default reporter: pass --reporter-email of a project member")
+
+    def show_progress(progress: dict) -> None:
+        print(
+            f"\r{progress['lines']:>10,} lines  {progress['issues']:>10,} issues  "
+            f"{progress['failed']:>6,} failed  ({progress['elapsed_sec']:.1f}s)",
+            end="", file=sys.stderr,
+        )
+
+    importer = Importer(
+        args.project_id, reporter_id, args.batch_size or settings.import_batch_size,
+        session_factory=session_factory, on_progress=show_progress,
+    )
+    source = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8", newline="")
+    try:
+        report = importer.run(READERS[args.format](source))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    print(file=sys.stderr)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Per-project issue counters.
+
+``project_issue_stats`` has one row per project with its issue total and the
+number of issues in each status and priority. Every issue write adjusts the
+row in the same transaction through an :class:`IssueStatsDelta`, so
+``GET /api/projects/{id}/stats`` is a primary-key read however many issues
+the project has. Writers lock the issues they change while reading them
+(``SELECT ... FOR UPDATE`` on PostgreSQL), so the old status and priority a
+delta is computed from can't change underneath it.
+
+Recount everything from the issues table, and repair any drift, with:
+
+    python -m app.issue_stats            # report and fix
+    python -m app.issue_stats --check    # report only; exit status 1 on drift
+"""
+import argparse
+import json
+import sys
+from collections import Counter
+from typing import Dict, Optional
+
+from sqlalchemy import func, insert, select, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .models.issue import Issue, IssuePriority, IssueStatus
+from .models.project import Project
+from .models.project_issue_stats import ProjectIssueStats
+
+STATUS_COLUMNS = {member: f"status_{member.value}" for member in IssueStatus}
+PRIORITY_COLUMNS = {member: f"priority_{member.value}" for member in IssuePriority}
+COUNTER_COLUMNS = ["total", *STATUS_COLUMNS.values(), *PRIORITY_COLUMNS.values()]
+
+
+class IssueStatsDelta:
+    """Accumulates counter changes for one project, then applies them with a
+    single UPDATE.
+
+    Projects created outside ``create_project`` (the seed scripts, say) have
+    no counters row. The first write to one creates it from a recount, which
+    also takes in the issues written before it.
+    """
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+
+    def add(self, status: IssueStatus, priority: IssuePriority, sign: int = 1) -> None:
+        self.counts["total"] += sign
+        self.counts[STATUS_COLUMNS[status]] += sign
+        self.counts[PRIORITY_COLUMNS[priority]] += sign
+
+    def remove(self, status: IssueStatus, priority: IssuePriority) -> None:
+        self.add(status, priority, -1)
+
+    def change(self, old_status: IssueStatus, old_priority: IssuePriority,
+               new_status: IssueStatus, new_priority: IssuePriority) -> None:
+        self.remove(old_status, old_priority)
+        self.add(new_status, new_priority)
+
+    def apply(self, db: Session, project_id: int) -> None:
+        table = ProjectIssueStats.__table__
+        values = {name: table.c[name] + delta for name, delta in self.counts.items() if delta}
+        if not values:
+            return
+        if db.execute(update(table).where(table.c.project_id == project_id).values(values)).rowcount:
+            return
+        # no row yet: count this transaction's issues in with the rest
+        db.flush()
+        counts = count_issues(db.connection(), project_id).get(project_id, Counter())
+        try:
+            with db.begin_nested():
+                db.execute(insert(table).values(project_id=project_id, **{name: counts[name] for name in COUNTER_COLUMNS}))
+        except IntegrityError:
+            # another writer created it first, from a count without our changes
+            db.execute(update(table).where(table.c.project_id == project_id).values(values))
+
+
+def create_stats_row(db: Session, project_id: int) -> None:
+    db.execute(insert(ProjectIssueStats.__table__).values(project_id=project_id))
+
+
+def read_stats(db: Session, project_id: int) -> dict:
+    row = db.query(ProjectIssueStats).filter(ProjectIssueStats.project_id == project_id).first()
+    counts = {name: getattr(row, name) if row else 0 for name in COUNTER_COLUMNS}
+    return {
+        "project_id": project_id,
+        "total": counts["total"],
+        "by_status": {member.value: counts[name] for member, name in STATUS_COLUMNS.items()},
+        "by_priority": {member.value: counts[name] for member, name in PRIORITY_COLUMNS.items()},
+    }
+
+
+def count_issues(connection, project_id: Optional[int] = None) -> Dict[int, Counter]:
+    """Count issues from scratch, per project"""
+    query = select(Issue.project_id, Issue.status, Issue.priority, func.count()).group_by(
+        Issue.project_id, Issue.status, Issue.priority
+    )
+    if project_id is not None:
+        query = query.where(Issue.project_id == project_id)
+    counts: Dict[int, Counter] = {}
+    for row_project, status, priority, n in connection.execute(query):
+        delta = IssueStatsDelta()
+        delta.add(status, priority, n)
+        counts.setdefault(row_project, Counter()).update(delta.counts)
+    return counts
+
+
+def reconcile(engine, fix: bool = True) -> dict:
+    """Compare every project's stored counters with a recount.
+
+    Returns the projects that drifted, with the stored and actual values of
+    each differing counter, and rewrites them when ``fix`` is set.
+    """
+    table = ProjectIssueStats.__table__
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            # keep issue writes out until the counters are rewritten
+            connection.execute(text("LOCK TABLE issues IN SHARE MODE"))
+        actual = count_issues(connection)
+        stored = {row.project_id: row for row in connection.execute(select(table))}
+        project_ids = connection.execute(select(Project.id).order_by(Project.id)).scalars().all()
+
+        drift = {}
+        for project_id in project_ids:
+            row = stored.get(project_id)
+            counts = actual.get(project_id, Counter())
+            differences = {
+                name: {"stored": getattr(row, name) if row else None, "actual": counts[name]}
+                for name in COUNTER_COLUMNS
+                if row is None or getattr(row, name) != counts[name]
+            }
+            if not differences:
+                continue
+            drift[project_id] = differences
+            if fix:
+                values = {name: counts[name] for name in COUNTER_COLUMNS}
+                if row is None:
+                    connection.execute(insert(table).values(project_id=project_id, **values))
+                else:
+                    connection.execute(update(table).where(table.c.project_id == project_id).values(values))
+    return {"projects": len(project_ids), "drifted": len(drift), "fixed": fix, "drift": drift}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.issue_stats", description="Rebuild per-project issue counters and report drift"
+    )
+    parser.add_argument("--database-url", help="target database (default: DATABASE_URL from settings)")
+    parser.add_argument("--check", action="store_true", help="only report drift; exit with status 1 if any")
+    args = parser.parse_args()
+
+    from sqlalchemy import create_engine
+    from .config import settings
+    from .models import comment, project_member, user  # noqa: F401  (configure the mappers)
+    engine = create_engine(args.database_url or settings.database_url)
+    report = reconcile(engine, fix=not args.check)
+    print(json.dumps(report, indent=2))
+    if args.check and report["drifted"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
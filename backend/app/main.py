@@ -7,14 +7,17 @@ warnings.filterwarnings("ignore", category=DeprecationWarning)
 
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from .config import settings
-from .routes import auth, projects, issues, comments
+from .routes import auth, projects, issues, comments, events
+from .events import hub
+from .responses import FastJSONResponse
 
 app = FastAPI(
     title="IssueHub API",
     description="A lightweight bug tracker API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
 
@@ -27,6 +30,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Slow-query log; the middleware gives it the route being served
+if settings.slow_query_threshold_ms > 0:
+    from . import slow_queries
+    slow_queries.install()
+    app.add_middleware(slow_queries.RequestScopeMiddleware)
+
+# Metrics middleware, added last so it is outermost and times the whole request
+if settings.metrics_enabled:
+    from .metrics import MetricsMiddleware, install_sql_events
+    install_sql_events()
+    app.add_middleware(MetricsMiddleware)
+
 # Exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -40,16 +55,28 @@ async def global_exception_handler(request: Request, exc: Exception):
         }
     )
 
-# Include routers
-app.include_router(auth.router)
-app.include_router(projects.router)
-app.include_router(issues.router)
-app.include_router(comments.router)
+# Include routers; the async stack wraps the same handlers (see routes/aio.py)
+routers = [auth.router, projects.router, issues.router, comments.router, events.router]
+if settings.async_database:
+    from .routes.aio import async_router
+    routers = [async_router(router) for router in routers]
+for router in routers:
+    app.include_router(router)
+
+@app.on_event("shutdown")
+def close_event_streams():
+    hub.close_all()
 
 @app.get("/")
 def root():
     return {"message": "Welcome to IssueHub API"}
 
+if settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        from .metrics import CONTENT_TYPE, registry
+        return Response(registry.render(), media_type=CONTENT_TYPE)
+
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
@@ -0,0 +1,322 @@
+"""Prometheus metrics, served as text from ``GET /metrics``.
+
+Collected here:
+
+* per request, by method, route template and status: a latency histogram,
+  plus histograms of the SQL statements run and the time spent in them,
+* requests in flight,
+* every SQL statement's duration, from engine events,
+* how long checkouts waited for a pooled connection, and the pool's
+  current size and usage, plus open sessions per read replica,
+* hits, misses and hit ratio of the in-process caches, and the live event hub.
+
+Recording is a few dict lookups and additions under a lock, so it stays on
+in production (``METRICS_ENABLED``). Values are per process: with several
+workers each one is scraped on its own, as Prometheus expects. There is no
+client library dependency; the exposition format is written here.
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from . import statement_timer
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+SQL_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+SQL_TIME_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+# Requests that matched no route share one label value, so stray URLs can't
+# grow the number of series
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    @abstractmethod
+    def render(self) -> List[str]:
+        """The metric in the text exposition format, one line per item"""
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}" for labels, value in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket (the last one is +Inf), sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._values.items())
+        lines = self.header()
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="%s"' % _number(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Collected(Metric):
+    """A metric whose samples are read from elsewhere at scrape time"""
+
+    def __init__(self, kind: str, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+
+    def render(self, samples: Iterable[tuple] = ()) -> List[str]:
+        """``samples`` are ``(labels, value)`` pairs from a collector"""
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}" for labels, value in samples
+        ]
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+        # called at scrape time; each yields (Collected, [(labels, value), ...])
+        self.collectors: List[Callable[[], Iterable[tuple]]] = []
+
+    def add(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collect in self.collectors:
+            for metric, samples in collect():
+                lines.extend(metric.render(samples))
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUEST_LATENCY = registry.add(Histogram(
+    "issuehub_http_request_duration_seconds", "Time to complete a request, by route template.",
+    ("method", "route", "status"),
+))
+REQUESTS_IN_FLIGHT = registry.add(Gauge(
+    "issuehub_http_requests_in_flight", "Requests being served, open event streams included.",
+))
+REQUEST_SQL_STATEMENTS = registry.add(Histogram(
+    "issuehub_http_request_sql_statements", "SQL statements run while serving a request.",
+    ("method", "route"), SQL_COUNT_BUCKETS,
+))
+REQUEST_SQL_SECONDS = registry.add(Histogram(
+    "issuehub_http_request_sql_seconds", "Time spent in SQL statements while serving a request.",
+    ("method", "route"), SQL_TIME_BUCKETS,
+))
+SQL_STATEMENT_SECONDS = registry.add(Histogram(
+    "issuehub_sql_statement_duration_seconds", "Duration of each SQL statement.", (), SQL_TIME_BUCKETS,
+))
+POOL_CHECKOUT_WAIT = registry.add(Histogram(
+    "issuehub_db_pool_checkout_wait_seconds", "Time spent waiting for a pooled database connection.",
+    (), POOL_WAIT_BUCKETS,
+))
+
+# SQL statement count and time of the current request. A mutable cell, so the
+# copies of the context that threadpool workers run in share it.
+_request_sql: ContextVar[Optional[list]] = ContextVar("request_sql", default=None)
+
+
+def _observe_statement(conn, statement, parameters, executemany, elapsed):
+    SQL_STATEMENT_SECONDS.observe(elapsed)
+    cell = _request_sql.get()
+    if cell is not None:
+        cell[0] += 1
+        cell[1] += elapsed
+
+
+def install_sql_events() -> None:
+    """Time every statement on every engine, the async stack's included"""
+    statement_timer.observe(_observe_statement)
+
+
+class _TimedCheckout:
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    """QueuePool that records how long each checkout waited"""
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waited"""
+
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """ASGI middleware feeding the request metrics"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status_code[0] = message["status"]
+            await send(message)
+
+        cell = [0, 0.0]
+        token = _request_sql.set(cell)
+        started = time.perf_counter()
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            REQUESTS_IN_FLIGHT.dec()
+            _request_sql.reset(token)
+            # the router records the matched route in the scope
+            method, route = scope["method"], _route_template(scope)
+            REQUEST_LATENCY.observe(elapsed, method, route, str(status_code[0]))
+            REQUEST_SQL_STATEMENTS.observe(cell[0], method, route)
+            REQUEST_SQL_SECONDS.observe(cell[1], method, route)
+
+
+POOL_CONNECTIONS = Collected("gauge", "issuehub_db_pool_connections", "Pooled connections by state.", ("state",))
+CACHE_HITS = Collected("counter", "issuehub_cache_hits_total", "Cache lookups that found an entry.", ("cache",))
+CACHE_MISSES = Collected("counter", "issuehub_cache_misses_total", "Cache lookups that found nothing.", ("cache",))
+CACHE_HIT_RATIO = Collected("gauge", "issuehub_cache_hit_ratio", "Share of lookups that hit, since start.", ("cache",))
+CACHE_ENTRIES = Collected("gauge", "issuehub_cache_entries", "Entries held.", ("cache",))
+REPLICA_SESSIONS = Collected("gauge", "issuehub_db_replica_sessions", "Open sessions per read replica.", ("replica",))
+EVENT_SUBSCRIBERS = Collected("gauge", "issuehub_event_subscribers", "Open event streams.")
+EVENT_EVICTIONS = Collected("counter", "issuehub_event_evictions_total", "Event streams closed for falling behind.")
+
+
+def _collect_pool():
+    from . import database
+    pool = database.engine.pool
+    if isinstance(pool, QueuePool):
+        yield POOL_CONNECTIONS, [
+            (("checked_out",), pool.checkedout()),
+            (("idle",), pool.checkedin()),
+            (("overflow",), max(pool.overflow(), 0)),
+            (("size",), pool.size()),
+        ]
+    replicas = database.read_replicas.stats()["in_use"]
+    if replicas:
+        yield REPLICA_SESSIONS, [((name,), in_use) for name, in_use in replicas.items()]
+
+
+def _collect_caches():
+    from .auth.permissions import membership_cache
+    from .auth.security import user_cache
+    from .response_cache import issue_list_cache
+    stats = {
+        "membership": membership_cache.stats(),
+        "user": user_cache.stats(),
+        "issue_list": issue_list_cache.stats(),
+    }
+    stats = {name: values for name, values in stats.items() if "hits" in values}
+    yield CACHE_HITS, [((name,), values["hits"]) for name, values in stats.items()]
+    yield CACHE_MISSES, [((name,), values["misses"]) for name, values in stats.items()]
+    yield CACHE_HIT_RATIO, [
+        ((name,), values["hits"] / (values["hits"] + values["misses"]))
+        for name, values in stats.items() if values["hits"] + values["misses"]
+    ]
+    yield CACHE_ENTRIES, [
+        ((name,), values.get("size", values.get("entries", 0))) for name, values in stats.items()
+    ]
+
+
+def _collect_events():
+    from .events import hub
+    stats = hub.stats()
+    yield EVENT_SUBSCRIBERS, [((), stats["subscribers"])]
+    yield EVENT_EVICTIONS, [((), stats["evictions"])]
+
+
+registry.collectors.extend([_collect_pool, _collect_caches, _collect_events])
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index, Enum as SQLEnum
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database import Base
@@ -18,6 +18,15 @@ class IssuePriority(str, enum.Enum):
 
 class Issue(Base):
     __tablename__ = "issues"
+    # One index per list_issues sort mode / filter, each led by project_id and
+    # ending in id so keyset pages can seek (see migration 003)
+    __table_args__ = (
+        Index("ix_issues_project_created", "project_id", "created_at", "id"),
+        Index("ix_issues_project_updated", "project_id", "updated_at", "id"),
+        Index("ix_issues_project_priority", "project_id", "priority", "id"),
+        Index("ix_issues_project_status", "project_id", "status", "id"),
+        Index("ix_issues_project_assignee", "project_id", "assignee_id", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
@@ -11,6 +11,8 @@ class Project(Base):
     key = Column(String, unique=True, index=True, nullable=False)
     description = Column(String)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Bumped on every issue create/update/delete in the project (see app.versions)
+    issues_version = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationships
     issues = relationship("Issue", back_populates="project", cascade="all, delete-orphan")
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from ..database import Base
+
+class ProjectIssueStats(Base):
+    """Issue counts per project, maintained alongside every issue write
+    (see app.issue_stats)"""
+    __tablename__ = "project_issue_stats"
+    
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    total = Column(Integer, nullable=False, default=0, server_default="0")
+    status_open = Column(Integer, nullable=False, default=0, server_default="0")
+    status_in_progress = Column(Integer, nullable=False, default=0, server_default="0")
+    status_resolved = Column(Integer, nullable=False, default=0, server_default="0")
+    status_closed = Column(Integer, nullable=False, default=0, server_default="0")
+    priority_low = Column(Integer, nullable=False, default=0, server_default="0")
+    priority_medium = Column(Integer, nullable=False, default=0, server_default="0")
+    priority_high = Column(Integer, nullable=False, default=0, server_default="0")
+    priority_critical = Column(Integer, nullable=False, default=0, server_default="0")
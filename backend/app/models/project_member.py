@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from ..database import Base
 import enum
@@ -9,6 +9,10 @@ class MemberRole(str, enum.Enum):
 
 class ProjectMember(Base):
     __tablename__ = "project_members"
+    __table_args__ = (
+        Index("uq_project_members_project_user", "project_id", "user_id", unique=True),
+        Index("ix_project_members_user_id", "user_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
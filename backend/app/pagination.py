@@ -0,0 +1,70 @@
+"""Keyset (cursor) pagination helpers.
+
+A cursor is an opaque, URL-safe token that records the sort mode and the sort
+key + primary key of the last row on a page. The next page is selected with a
+row-value comparison against those values, so the database can seek straight
+to the right spot in the index instead of skipping over OFFSET rows.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import literal, tuple_, type_coerce
+from sqlalchemy.types import NullType
+
+
+def raw_value(column):
+    """Select ``column`` without result processing.
+
+    Cursor values are compared against the column exactly as the database
+    stores them (e.g. SQLite keeps timestamps as text whose format depends on
+    whether the value came from ``CURRENT_TIMESTAMP`` or from Python), so we
+    round-trip the driver's raw value rather than the ORM-converted one.
+    """
+    return type_coerce(column, NullType())
+
+
+def encode_cursor(sort: str, value: Any, row_id: int) -> str:
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    payload = json.dumps([sort, value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    """Return ``(value, row_id)`` from a cursor; raise ValueError if it is
+    malformed or was issued for a different sort mode."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError("Malformed cursor")
+    if cursor_sort != sort or not isinstance(row_id, int):
+        raise ValueError("Cursor does not match the requested sort")
+    if isinstance(value, dict):
+        value = datetime.fromisoformat(value["dt"])
+    return value, row_id
+
+
+def after_cursor(column, id_column, value: Any, row_id: int, descending: bool):
+    """WHERE clause selecting rows that come after ``(value, row_id)`` when
+    ordering by ``(column, id_column)`` in the given direction."""
+    key = tuple_(column, id_column)
+    boundary = tuple_(literal(value, NullType()), literal(row_id))
+    return key < boundary if descending else key > boundary
+
+
+def page_order(column, id_column, descending: bool):
+    if descending:
+        return column.desc(), id_column.desc()
+    return column.asc(), id_column.asc()
+
+
+def split_page(rows: list, limit: int) -> Tuple[list, Optional[Any]]:
+    """Split ``limit + 1`` fetched rows into the page and the last row on it,
+    which is None when there is no further page."""
+    if len(rows) > limit:
+        page = rows[:limit]
+        return page, page[-1]
+    return rows, None
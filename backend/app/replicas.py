@@ -0,0 +1,97 @@
+"""Read-replica routing (``READ_REPLICA_URLS``).
+
+Requests made with a read method (GET, HEAD, OPTIONS) get their session from
+a replica. Everything else stays on the primary. The replica is picked by
+``READ_REPLICA_STRATEGY``:
+
+* ``round_robin`` cycles through the replicas;
+* ``least_busy`` picks the one with the fewest sessions open from this
+  process right now.
+
+Replicas lag the primary, so a client that just wrote reads from the primary
+for ``READ_REPLICA_STICKY_SECONDS`` after each write, and sees its own
+changes. The client is identified by its credential, the Authorization
+header. The window starts when the write request arrives, so it covers
+reads sent while the write is still in flight, and starts again when the
+write is done, so a slow write still gets the full window after its commit.
+Stickiness is tracked per process, like the other in-process caches. With
+several workers, a read served by a worker other than the one that took the
+write can still see replication lag.
+"""
+import itertools
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+from sqlalchemy.engine import make_url
+
+from .cache import TTLCache
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+STRATEGIES = ("round_robin", "least_busy")
+
+
+def parse_urls(value: str) -> List[str]:
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+@dataclass
+class Replica:
+    url: str
+    session_factory: Callable[[], Any]
+    # sessions handed out and not yet closed
+    in_use: int = 0
+
+
+class ReplicaSet:
+    """Chooses where each request's session comes from"""
+
+    def __init__(self, replicas: List[Replica], strategy: str = "round_robin",
+                 sticky_seconds: float = 5.0, max_sticky_clients: int = 100000):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown read replica strategy {strategy!r}; expected one of {STRATEGIES}")
+        self.replicas = replicas
+        self.strategy = strategy
+        # credential -> True while the client's writes may not have replicated
+        self.sticky = TTLCache(maxsize=max_sticky_clients, ttl=sticky_seconds)
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+
+    def choose(self, method: str, credential: Optional[str]) -> Optional[Replica]:
+        """Return the replica to read from, or None to use the primary"""
+        if not self.replicas:
+            return None
+        if method not in READ_METHODS:
+            if credential:
+                self.sticky.set(credential, True)
+            return None
+        if credential and self.sticky.get(credential):
+            return None
+        with self._lock:
+            if self.strategy == "least_busy":
+                replica = min(self.replicas, key=lambda candidate: candidate.in_use)
+            else:
+                replica = self.replicas[next(self._next) % len(self.replicas)]
+            replica.in_use += 1
+        return replica
+
+    def finished(self, method: str, credential: Optional[str]) -> None:
+        """Restart a writer's sticky window once its request is done"""
+        if self.replicas and credential and method not in READ_METHODS:
+            self.sticky.set(credential, True)
+
+    def release(self, replica: Replica) -> None:
+        with self._lock:
+            replica.in_use -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            in_use = {
+                make_url(replica.url).render_as_string(hide_password=True): replica.in_use
+                for replica in self.replicas
+            }
+        return {"strategy": self.strategy, "in_use": in_use, "sticky_clients": self.sticky.stats()["size"]}
+
+
+def credential(request) -> Optional[str]:
+    return request.headers.get("authorization")
@@ -0,0 +1,136 @@
+"""Cache of serialized ``list_issues`` pages.
+
+Entries are keyed by the project, its ``issues_version`` (see app.versions)
+and the full query string: filters, sort, cursor and limit. Any issue write
+bumps the version, so later requests compute a new key and never see a stale
+page. Entries for old versions are not deleted; they stop being requested
+and fall out through LRU eviction. Because the version lives in the
+database, this stays correct with several worker processes each holding
+their own cache.
+
+Values are the exact response bodies, so a hit skips the query and the
+serialization. Storage is a pluggable :class:`ResponseCacheBackend`,
+selected with ``settings.response_cache_backend``:
+
+* ``"memory"`` (default): an in-process LRU bounded by total bytes,
+* ``"off"``: no caching,
+* ``"package.module:ClassName"``: any backend class, constructed without
+  arguments, e.g. one that talks to a shared cache service.
+"""
+import importlib
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+
+from .config import settings
+
+
+class ResponseCacheBackend(ABC):
+    """Storage for cached response bodies. Keys are strings and values are
+    bytes, so an implementation can hand them to an external store as-is."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    def stats(self) -> dict:
+        return {}
+
+
+class NullBackend(ResponseCacheBackend):
+    def get(self, key: str) -> Optional[bytes]:
+        return None
+
+    def set(self, key: str, value: bytes) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+class MemoryBackend(ResponseCacheBackend):
+    """Thread-safe LRU holding at most ``max_bytes`` of values.
+
+    Values larger than ``max_entry_bytes`` are not stored, so one huge page
+    can't flush everything else.
+    """
+
+    def __init__(self, max_bytes: int, max_entry_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes if max_entry_bytes is not None else max_bytes // 8
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_entry_bytes:
+            return
+        with self._lock:
+            previous = self._data.pop(key, None)
+            if previous is not None:
+                self.bytes -= len(previous)
+            self._data[key] = value
+            self.bytes += len(value)
+            while self.bytes > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self.bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "entries": len(self._data),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def load_backend(name: str) -> ResponseCacheBackend:
+    if name == "memory":
+        return MemoryBackend(settings.response_cache_max_bytes)
+    if name == "off":
+        return NullBackend()
+    module_name, _, class_name = name.partition(":")
+    if not class_name:
+        raise ValueError(f"unknown response cache backend {name!r}")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+issue_list_cache = load_backend(settings.response_cache_backend)
+
+
+def issue_list_key(project_id: int, etag: str) -> str:
+    # The ETag already covers the project's version and the query string
+    return "issues:%d:%s" % (project_id, etag.strip('"'))
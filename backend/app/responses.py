@@ -0,0 +1,33 @@
+"""JSON encoding for API responses.
+
+:class:`FastJSONResponse` is the app's default response class. Handlers on
+hot paths build their payloads from row tuples (see
+``serializers/issue.py``) and return it directly. That skips FastAPI's
+``response_model`` pass, which would validate the payload into models and
+dump them back to plain data before encoding. The ``response_model`` stays on
+the route for the OpenAPI schema.
+
+:func:`dumps` encodes datetimes and enums natively, in the format pydantic
+writes them: ISO 8601, with ``Z`` for UTC. It uses orjson when it is
+installed and pydantic-core otherwise.
+"""
+from typing import Any
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return pydantic_core.to_json(content)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
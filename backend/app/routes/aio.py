@@ -0,0 +1,106 @@
+"""Async versions of the API routers.
+
+When `settings.async_database` is on, `main.py` mounts `async_router(...)` of
+each router instead of the router itself. Every endpoint that takes a database
+session becomes an `async def` that receives an `AsyncSession` and runs the
+original handler body through `AsyncSession.run_sync`: the handler sees an
+ordinary `Session`, but its statements go through the asyncio driver on the
+event loop instead of occupying a threadpool worker. Dependencies that need
+the database are swapped for their async counterparts the same way.
+
+Endpoints that are already `async def` are mounted with their dependencies
+swapped and must do their own session handling. Routes that should stay on
+the sync stack (e.g. ones that stream from a server-side cursor after the
+handler returns) can be listed in `SYNC_ONLY_ROUTES` and are mounted as-is.
+"""
+import functools
+import inspect
+from typing import Callable, Dict, Set
+
+from fastapi import APIRouter, Depends
+from fastapi.params import Depends as DependsParam
+from fastapi.routing import APIRoute
+
+from ..auth.security import (
+    get_current_user,
+    get_current_user_async,
+    get_current_user_record,
+    get_current_user_record_async,
+)
+from ..database import get_async_db, get_db
+
+# sync dependency -> async replacement
+ASYNC_DEPENDENCIES: Dict[Callable, Callable] = {
+    get_db: get_async_db,
+    get_current_user: get_current_user_async,
+    get_current_user_record: get_current_user_record_async,
+}
+
+# endpoint names mounted unchanged on the async stack
+SYNC_ONLY_ROUTES: Set[str] = {
+    # streams on a sync session of its own after the handler returns
+    "export_issues",
+}
+
+_ROUTE_OPTIONS = (
+    "response_model", "status_code", "tags", "dependencies", "summary",
+    "description", "response_description", "responses", "deprecated",
+    "methods", "operation_id", "response_model_include", "response_model_exclude",
+    "response_model_by_alias", "response_model_exclude_unset",
+    "response_model_exclude_defaults", "response_model_exclude_none",
+    "include_in_schema", "response_class", "name", "openapi_extra",
+)
+
+
+def _swap_dependencies(signature: inspect.Signature):
+    """Return the signature with async dependencies, and the names of the
+    parameters that receive a database session."""
+    parameters, session_params = [], []
+    for param in signature.parameters.values():
+        default = param.default
+        if isinstance(default, DependsParam) and default.dependency in ASYNC_DEPENDENCIES:
+            if default.dependency is get_db:
+                session_params.append(param.name)
+            param = param.replace(
+                default=Depends(ASYNC_DEPENDENCIES[default.dependency], use_cache=default.use_cache),
+                annotation=inspect.Parameter.empty,
+            )
+        parameters.append(param)
+    return signature.replace(parameters=parameters), session_params
+
+
+def async_endpoint(endpoint: Callable) -> Callable:
+    signature, session_params = _swap_dependencies(inspect.signature(endpoint))
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(**kwargs):
+            return await endpoint(**kwargs)
+    elif session_params:
+        @functools.wraps(endpoint)
+        async def wrapper(**kwargs):
+            db = kwargs[session_params[0]]
+
+            def call(session):
+                for name in session_params:
+                    kwargs[name] = session
+                return endpoint(**kwargs)
+
+            return await db.run_sync(call)
+    else:
+        return endpoint
+
+    wrapper.__signature__ = signature
+    return wrapper
+
+
+def async_router(router: APIRouter) -> APIRouter:
+    """Build the async-stack equivalent of `router`."""
+    converted = APIRouter()
+    for route in router.routes:
+        if not isinstance(route, APIRoute) or route.name in SYNC_ONLY_ROUTES:
+            converted.routes.append(route)
+            continue
+        options = {option: getattr(route, option) for option in _ROUTE_OPTIONS}
+        converted.add_api_route(route.path, async_endpoint(route.endpoint), **options)
+    return converted
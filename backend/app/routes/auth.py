@@ -1,60 +1,95 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+import logging
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from ..database import get_db
+from starlette.concurrency import run_in_threadpool
+from .. import database
+from ..database import get_db, run_db
 from ..models.user import User
 from ..schemas.auth import SignupRequest, LoginRequest, TokenResponse, UserResponse
-from ..auth.security import get_password_hash, verify_password, create_access_token, get_current_user, needs_rehash
+from ..auth.security import create_access_token, get_current_user_record, needs_rehash, user_token_claims
+from ..auth.hashing import async_hash_password, async_verify_password
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
+logger = logging.getLogger(__name__)
+
+# signup and login are `async def` so that waiting on the password hashing
+# pool doesn't hold a request thread; their database work goes through run_db.
+
+def _find_user(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+def _add_user(db: Session, name: str, email: str, password_hash: str) -> User:
+    new_user = User(
+        name=name,
+        email=email,
+        password_hash=password_hash
+    )
+    db.add(new_user)
+    db.commit()
+    db.refresh(new_user)
+    return new_user
+
+def _store_rehash(user_id: int, old_hash: str, new_hash: str) -> None:
+    db = database.SessionLocal()
+    try:
+        # Only replace the hash we verified against, so a password changed in
+        # the meantime isn't overwritten
+        db.query(User).filter(
+            User.id == user_id,
+            User.password_hash == old_hash
+        ).update({User.password_hash: new_hash}, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+async def rehash_password(user_id: int, password: str, old_hash: str) -> None:
+    """Background task: upgrade a stored hash to the preferred scheme"""
+    try:
+        new_hash = await async_hash_password(password)
+        await run_in_threadpool(_store_rehash, user_id, old_hash, new_hash)
+    except Exception:
+        # The user is already logged in; try again on their next login
+        logger.warning("password re-hash failed for user %s", user_id, exc_info=True)
+
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def signup(request: SignupRequest, db: Session = Depends(get_db)):
+async def signup(request: SignupRequest, db: Session = Depends(get_db)):
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == request.email).first()
+    existing_user = await run_db(db, _find_user, request.email)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
-    
+
     # Create new user
-    hashed_password = get_password_hash(request.password)
-    new_user = User(
-        name=request.name,
-        email=request.email,
-        password_hash=hashed_password
-    )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    
-    return new_user
+    hashed_password = await async_hash_password(request.password)
+    return await run_db(db, _add_user, request.name, request.email, hashed_password)
 
 @router.post("/login", response_model=TokenResponse)
-def login(request: LoginRequest, response: Response, db: Session = Depends(get_db)):
+async def login(
+    request: LoginRequest,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
     # Find user
-    user = db.query(User).filter(User.email == request.email).first()
-    if not user or not verify_password(request.password, user.password_hash):
+    user = await run_db(db, _find_user, request.email)
+    if not user or not await async_verify_password(request.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
     # If the stored hash uses an older scheme, re-hash with the preferred/current
     # scheme and update the database. This migrates users to stronger hashes on
-    # their next successful login without forcing a password reset.
-    try:
-        if needs_rehash(user.password_hash):
-            user.password_hash = get_password_hash(request.password)
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-    except Exception:
-        # If re-hash fails for any reason, continue without blocking login.
-        pass
-    
+    # their next successful login without forcing a password reset. It runs
+    # after the response is sent so the login isn't charged a second hash.
+    if needs_rehash(user.password_hash):
+        background_tasks.add_task(rehash_password, user.id, request.password, user.password_hash)
+
     # Create access token
-    access_token = create_access_token(data={"sub": str(user.id)})
-    
+    access_token = create_access_token(data=user_token_claims(user))
+
     # Set httpOnly cookie
     response.set_cookie(
         key="access_token",
@@ -63,7 +98,7 @@ def login(request: LoginRequest, response: Response, db: Session = Depends(get_d
         max_age=1800,  # 30 minutes
         samesite="lax"
     )
-    
+
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/logout")
@@ -72,5 +107,5 @@ def logout(response: Response):
     return {"message": "Logged out successfully"}
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
+def get_me(current_user: User = Depends(get_current_user_record)):
     return current_user
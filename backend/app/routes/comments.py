@@ -1,24 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime, timezone
+from typing import Optional
 from ..database import get_db
-from ..models.user import User
 from ..models.issue import Issue
 from ..models.comment import Comment
-from ..schemas.comment import CommentCreate, CommentResponse
-from ..auth.security import get_current_user
+from ..models.user import User
+from ..schemas.comment import CommentCreate, CommentResponse, CommentPage
+from ..auth.security import Principal, get_current_user
 from ..auth.permissions import check_project_access
+from ..etag import etag_matches, make_etag, not_modified, tagged_json
+from ..events import publish
+from ..responses import FastJSONResponse, dumps
+from ..pagination import encode_cursor, decode_cursor, after_cursor, page_order, raw_value, split_page
 
 router = APIRouter(prefix="/api/issues", tags=["comments"])
 
-@router.get("/{issue_id}/comments", response_model=List[CommentResponse])
+def _comment_page(query, issue_id: int, since: Optional[datetime], cursor: Optional[str], limit: int):
+    """Restrict ``query`` to one page of the issue's comments, oldest first,
+    fetching one extra row to tell whether another page follows."""
+    query = query.filter(Comment.issue_id == issue_id)
+    if since is not None:
+        if since.tzinfo is not None:
+            since = since.astimezone(timezone.utc)
+        query = query.filter(Comment.created_at > since)
+    if cursor:
+        try:
+            value, last_id = decode_cursor(cursor, "comments")
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        query = query.filter(after_cursor(Comment.created_at, Comment.id, value, last_id, False))
+    return query.order_by(*page_order(Comment.created_at, Comment.id, False)).limit(limit + 1)
+
+@router.get("/{issue_id}/comments", response_model=CommentPage)
 def list_comments(
     issue_id: int,
+    http_request: Request,
+    since: Optional[datetime] = Query(None, description="Only comments created after this time"),
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of comments to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
-    # Get issue and check access
-    issue = db.query(Issue).filter(Issue.id == issue_id).first()
+    # Get issue and check access; only its project is needed
+    issue = db.query(Issue.project_id).filter(Issue.id == issue_id).first()
     if not issue:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -27,29 +55,50 @@ def list_comments(
     
     check_project_access(db, current_user.id, issue.project_id)
     
-    # Get comments
-    comments = db.query(Comment).filter(Comment.issue_id == issue_id).order_by(Comment.created_at).all()
+    # Comments are only ever added, with ever higher ids, or removed along
+    # with their issue. So a page is identified by the query string, how many
+    # rows it holds, its highest id and whether another page follows; on
+    # revalidation those come from the (issue_id, created_at, id) index alone.
+    query_key = sorted(http_request.query_params.multi_items())
+    if http_request.headers.get("if-none-match"):
+        ids = [row.id for row in _comment_page(db.query(Comment.id), issue_id, since, cursor, limit)]
+        page_ids, last = split_page(ids, limit)
+        etag = make_etag("comments", issue_id, query_key, len(page_ids), max(page_ids, default=None), last is not None)
+        if etag_matches(http_request, etag):
+            return not_modified(etag)
+    
+    # Author names come from the same statement
+    rows = _comment_page(
+        db.query(Comment, User.name, raw_value(Comment.created_at)).join(User, User.id == Comment.author_id),
+        issue_id, since, cursor, limit
+    ).all()
+    rows, last = split_page(rows, limit)
+    page_ids = [comment.id for comment, _, _ in rows]
+    etag = make_etag("comments", issue_id, query_key, len(page_ids), max(page_ids, default=None), last is not None)
     
     # Format response
-    result = []
-    for comment in comments:
-        result.append({
+    items = []
+    for comment, author_name, _ in rows:
+        items.append({
             "id": comment.id,
             "issue_id": comment.issue_id,
             "author_id": comment.author_id,
             "body": comment.body,
             "created_at": comment.created_at,
-            "author_name": comment.author.name
+            "author_name": author_name
         })
     
-    return result
+    return tagged_json(dumps({
+        "items": items,
+        "next_cursor": encode_cursor("comments", last[2], last[0].id) if last else None
+    }), etag)
 
 @router.post("/{issue_id}/comments", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
 def create_comment(
     issue_id: int,
     request: CommentCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     # Get issue and check access
     issue = db.query(Issue).filter(Issue.id == issue_id).first()
@@ -71,7 +120,7 @@ def create_comment(
     db.commit()
     db.refresh(new_comment)
     
-    return {
+    comment = {
         "id": new_comment.id,
         "issue_id": new_comment.issue_id,
         "author_id": new_comment.author_id,
@@ -79,3 +128,5 @@ def create_comment(
         "created_at": new_comment.created_at,
         "author_name": current_user.name
     }
+    publish(issue.project_id, "comment.added", comment)
+    return FastJSONResponse(comment, status_code=status.HTTP_201_CREATED)
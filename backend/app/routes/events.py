@@ -0,0 +1,58 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..database import get_db, release_db, run_db
+from ..auth.security import (
+    Principal, create_events_token, get_current_user, optional_oauth2_scheme, resolve_stream_user
+)
+from ..auth.permissions import check_project_access
+from ..events import HubFull, hub
+
+router = APIRouter(prefix="/api/projects", tags=["events"])
+
+@router.post("/{project_id}/events/token")
+def create_events_stream_token(
+    project_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """A short-lived token for `GET /{project_id}/events?token=...`, for
+    browsers, whose EventSource can't send the Authorization header"""
+    check_project_access(db, current_user.id, project_id)
+    return {
+        "token": create_events_token(current_user.id, project_id),
+        "expires_in": settings.events_token_expire_seconds,
+    }
+
+# `async def`, so an open stream waits on the event loop instead of holding a
+# threadpool worker
+@router.get("/{project_id}/events")
+async def project_events(
+    project_id: int,
+    token: Optional[str] = Query(None, description="Token from POST /{project_id}/events/token, instead of the Authorization header"),
+    bearer: Optional[str] = Depends(optional_oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    current_user = await run_db(db, resolve_stream_user, project_id, token, bearer)
+    # Check access
+    await run_db(db, check_project_access, current_user.id, project_id)
+    # The stream may stay open for hours; don't keep a pooled connection
+    await release_db(db)
+
+    try:
+        hub.check_capacity()
+    except HubFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many open event streams",
+            headers={"Retry-After": "30"}
+        )
+
+    return StreamingResponse(
+        hub.stream(project_id, settings.events_heartbeat_seconds),
+        media_type="text/event-stream",
+        # no-transform and X-Accel-Buffering keep proxies from buffering events
+        headers={"Cache-Control": "no-cache, no-transform", "X-Accel-Buffering": "no"}
+    )
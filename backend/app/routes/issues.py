@@ -1,95 +1,223 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import bindparam
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import List, Optional
-from ..database import get_db
-from ..models.user import User
+from typing import Dict, List, Optional, Tuple
+import io
+import tempfile
+from ..config import settings
+from ..database import get_db, run_db
+from ..models.comment import Comment
 from ..models.issue import Issue, IssueStatus, IssuePriority
-from ..schemas.issue import IssueCreate, IssueUpdate, IssueResponse
-from ..auth.security import get_current_user
+from ..models.project import Project
+from ..models.project_member import MemberRole
+from ..models.user import User
+from ..schemas.issue import (
+    IssueCreate, IssueUpdate, IssueResponse, IssuePage, IssueBulkRequest, IssueBulkResponse,
+    IssueImportReport
+)
+from ..auth.security import Principal, get_current_user
 from ..auth.permissions import check_project_access, check_maintainer_access
+from ..serializers.issue import issue_rows, load_issue_row, parse_fields, serialize_issue
+from ..search import apply_search
+from ..pagination import encode_cursor, decode_cursor, after_cursor, page_order, raw_value, split_page
+from ..etag import etag_matches, make_etag, not_modified, tagged_json
+from ..responses import FastJSONResponse, dumps
+from ..response_cache import issue_list_cache, issue_list_key
+from ..versions import bump_issues_version, get_issues_version
+from ..issue_stats import IssueStatsDelta
+from ..export import MEDIA_TYPES, export_query, stream_export
+from ..replicas import credential
+from ..importer import READERS, Importer
+from ..events import publish
 
 router = APIRouter(prefix="/api", tags=["issues"])
 
-@router.get("/projects/{project_id}/issues", response_model=List[IssueResponse])
+# sort name -> (column, descending)
+SORT_KEYS = {
+    "created_at": (Issue.created_at, True),
+    "updated_at": (Issue.updated_at, True),
+    "priority": (Issue.priority, True),
+    "status": (Issue.status, False),
+}
+
+def filter_issues(query, db: Session, q: Optional[str], issue_status: Optional[str],
+                  priority: Optional[str], assignee: Optional[int]):
+    """Apply the list_issues filters to ``query``.
+
+    Returns ``(query, score)``; the search uses the full-text index when there
+    is one and then yields a relevance score to sort by.
+    """
+    score = None
+    if q:
+        query, score = apply_search(query, db, q)
+    
+    if issue_status:
+        query = query.filter(Issue.status == issue_status)
+    
+    if priority:
+        query = query.filter(Issue.priority == priority)
+    
+    if assignee:
+        query = query.filter(Issue.assignee_id == assignee)
+    
+    return query, score
+
+FIELDS_DESCRIPTION = (
+    "Comma-separated issue fields to return, e.g. id,title,status; all fields when omitted. "
+    "When given, each issue contains only the requested keys, so the fields the response "
+    "schema lists as required may be missing"
+)
+SPARSE_RESPONSE_DESCRIPTION = "Successful Response; with `fields`, each issue holds only the requested keys"
+
+def _parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    try:
+        return parse_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+
+@router.get("/projects/{project_id}/issues", response_model=IssuePage,
+            response_description=SPARSE_RESPONSE_DESCRIPTION)
 def list_issues(
     project_id: int,
+    http_request: Request,
     q: Optional[str] = Query(None, description="Search query"),
     status: Optional[str] = Query(None, description="Filter by status"),
     priority: Optional[str] = Query(None, description="Filter by priority"),
     assignee: Optional[int] = Query(None, description="Filter by assignee ID"),
-    sort: Optional[str] = Query("created_at", description="Sort field"),
+    sort: Optional[str] = Query(None, description="Sort field; defaults to relevance when searching, else created_at"),
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of issues to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
+    selected = _parse_fields(fields)
+    
     # Check access
     check_project_access(db, current_user.id, project_id)
     
-    # Base query
-    query = db.query(Issue).filter(Issue.project_id == project_id)
-    
-    # Apply filters
-    if q:
-        query = query.filter(
-            or_(
-                Issue.title.ilike(f"%{q}%"),
-                Issue.description.ilike(f"%{q}%")
-            )
-        )
+    # Any issue write bumps the project's version, so it and the query string
+    # identify this page's content
+    etag = make_etag(
+        "issues", project_id, get_issues_version(db, project_id), sorted(http_request.query_params.multi_items())
+    )
+    if etag_matches(http_request, etag):
+        return not_modified(etag)
     
-    if status:
-        query = query.filter(Issue.status == status)
+    # The same key covers the serialized page, so a hit skips the query too
+    cache_key = issue_list_key(project_id, etag)
+    body = issue_list_cache.get(cache_key)
+    if body is not None:
+        return tagged_json(body, etag)
     
-    if priority:
-        query = query.filter(Issue.priority == priority)
+    # Base query; reporter and assignee names come from the same statement,
+    # and columns that weren't asked for aren't read at all
+    query = issue_rows(db, selected).filter(Issue.project_id == project_id)
     
-    if assignee:
-        query = query.filter(Issue.assignee_id == assignee)
+    # Apply filters
+    query, score = filter_issues(query, db, q, status, priority, assignee)
     
-    # Apply sorting
-    if sort == "priority":
-        query = query.order_by(Issue.priority.desc())
-    elif sort == "status":
-        query = query.order_by(Issue.status)
-    elif sort == "updated_at":
-        query = query.order_by(Issue.updated_at.desc())
+    # Apply sorting. Every mode is keyed on (sort column, id) so that pages
+    # can be resumed from a cursor with an index seek rather than an OFFSET.
+    if score is not None and sort in (None, "relevance"):
+        sort_name, sort_column, descending = "relevance", score, False
     else:
-        query = query.order_by(Issue.created_at.desc())
+        sort_name = sort if sort in SORT_KEYS else "created_at"
+        sort_column, descending = SORT_KEYS[sort_name]
+
+    if cursor:
+        try:
+            value, last_id = decode_cursor(cursor, sort_name)
+        except ValueError:
+            # `status` is shadowed by the query parameter in this handler
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid cursor"
+            )
+        query = query.filter(after_cursor(sort_column, Issue.id, value, last_id, descending))
+
+    query = query.order_by(*page_order(sort_column, Issue.id, descending))
+
+    rows = query.add_columns(raw_value(sort_column)).limit(limit + 1).all()
+    rows, last = split_page(rows, limit)
+    next_cursor = encode_cursor(sort_name, last[3], last[0].id) if last else None
+
+    body = dumps({"items": [serialize_issue(*row[:3], selected) for row in rows], "next_cursor": next_cursor})
+    issue_list_cache.set(cache_key, body)
+    return tagged_json(body, etag)
+
+@router.get("/projects/{project_id}/issues/export")
+def export_issues(
+    project_id: int,
+    http_request: Request,
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    q: Optional[str] = Query(None, description="Search query"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    priority: Optional[str] = Query(None, description="Filter by priority"),
+    assignee: Optional[int] = Query(None, description="Filter by assignee ID"),
+    include_comments: bool = Query(False, description="Embed each issue's comments"),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    # Check access up front; the rows are streamed after this returns
+    check_project_access(db, current_user.id, project_id)
     
-    issues = query.all()
+    def build_query(export_db: Session):
+        query = export_query(export_db).filter(Issue.project_id == project_id)
+        return filter_issues(query, export_db, q, status, priority, assignee)[0]
     
-    # Format response with user names
-    result = []
-    for issue in issues:
-        assignee_name = None
-        if issue.assignee_id:
-            assignee = db.query(User).filter(User.id == issue.assignee_id).first()
-            if assignee:
-                assignee_name = assignee.name
-        
-        result.append({
-            "id": issue.id,
-            "project_id": issue.project_id,
-            "title": issue.title,
-            "description": issue.description,
-            "status": issue.status.value,
-            "priority": issue.priority.value,
-            "reporter_id": issue.reporter_id,
-            "assignee_id": issue.assignee_id,
-            "created_at": issue.created_at,
-            "updated_at": issue.updated_at,
-            "reporter_name": issue.reporter.name,
-            "assignee_name": assignee_name
-        })
+    return StreamingResponse(
+        stream_export(build_query, export_format, include_comments, credential=credential(http_request)),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="project-{project_id}-issues.{export_format}"'}
+    )
+
+# Request bodies larger than this are spooled to a temporary file
+IMPORT_SPOOL_BYTES = 1024 * 1024
+
+def _run_import(body, import_format: str, project_id: int, reporter_id: int, batch_size: int) -> dict:
+    lines = io.TextIOWrapper(body, encoding="utf-8", newline="")
+    try:
+        return Importer(project_id, reporter_id, batch_size).run(READERS[import_format](lines))
+    finally:
+        lines.close()
+
+@router.post("/projects/{project_id}/issues/import", response_model=IssueImportReport)
+async def import_issues(
+    project_id: int,
+    http_request: Request,
+    import_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    batch_size: int = Query(settings.import_batch_size, ge=1, le=10000, description="Issues per transaction"),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    # Only maintainers can import
+    await run_db(db, check_maintainer_access, current_user.id, project_id)
     
-    return result
+    # The body is read as it arrives and spooled, so a large upload neither
+    # sits in memory nor holds a thread while it trickles in
+    body = tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_BYTES)
+    try:
+        async for chunk in http_request.stream():
+            body.write(chunk)
+        body.seek(0)
+    except BaseException:
+        body.close()
+        raise
+    # Batches commit on the importer's own sessions
+    return await run_in_threadpool(_run_import, body, import_format, project_id, current_user.id, batch_size)
 
 @router.post("/projects/{project_id}/issues", response_model=IssueResponse, status_code=status.HTTP_201_CREATED)
 def create_issue(
     project_id: int,
     request: IssueCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     # Check access
     check_project_access(db, current_user.id, project_id)
@@ -113,77 +241,232 @@ def create_issue(
         assignee_id=request.assignee_id
     )
     db.add(new_issue)
+    db.flush()
+    issue_id = new_issue.id
+    stats = IssueStatsDelta()
+    stats.add(new_issue.status, new_issue.priority)
+    stats.apply(db, project_id)
+    bump_issues_version(db, project_id)
     db.commit()
-    db.refresh(new_issue)
     
-    # Get assignee name if exists
-    assignee_name = None
-    if new_issue.assignee_id:
-        assignee = db.query(User).filter(User.id == new_issue.assignee_id).first()
-        if assignee:
-            assignee_name = assignee.name
-    
-    return {
-        "id": new_issue.id,
-        "project_id": new_issue.project_id,
-        "title": new_issue.title,
-        "description": new_issue.description,
-        "status": new_issue.status.value,
-        "priority": new_issue.priority.value,
-        "reporter_id": new_issue.reporter_id,
-        "assignee_id": new_issue.assignee_id,
-        "created_at": new_issue.created_at,
-        "updated_at": new_issue.updated_at,
-        "reporter_name": new_issue.reporter.name,
-        "assignee_name": assignee_name
+    created = serialize_issue(*load_issue_row(db, issue_id))
+    publish(project_id, "issue.created", created)
+    return FastJSONResponse(created, status_code=status.HTTP_201_CREATED)
+
+# per-item result status -> event published for it
+BULK_EVENTS = {201: "issue.created", 200: "issue.updated", 204: "issue.deleted"}
+
+def _bulk_result(op: str, index: int, code: int, issue_id: Optional[int] = None, detail: Optional[str] = None) -> dict:
+    return {"op": op, "index": index, "id": issue_id, "status": code, "detail": detail, "issue": None}
+
+@router.post("/projects/{project_id}/issues/bulk", response_model=IssueBulkResponse)
+def bulk_issues(
+    project_id: int,
+    request: IssueBulkRequest,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Create, update and delete many issues of one project at once.
+
+    Access is checked once for the whole request. Each item gets its own
+    result with an HTTP-style status; items that fail validation are skipped
+    and the rest are written in a single transaction, with one executemany
+    statement per kind of change rather than one round trip per issue.
+    """
+    membership = check_project_access(db, current_user.id, project_id)
+    is_maintainer = membership.role == MemberRole.MAINTAINER
+    issues = Issue.__table__
+    results: List[dict] = []
+
+    # Look up every referenced issue and assignee up front, one query each.
+    # The issues are locked so the counter deltas below are computed from
+    # their current status and priority.
+    target_ids = {item.id for item in request.update} | set(request.delete)
+    current = {}
+    if target_ids:
+        current = {row.id: (row.status, row.priority) for row in db.query(
+            Issue.id, Issue.status, Issue.priority
+        ).filter(Issue.id.in_(target_ids), Issue.project_id == project_id).with_for_update()}
+    in_project = set(current)
+    assignee_ids = {
+        item.assignee_id for item in [*request.create, *request.update] if item.assignee_id is not None
     }
+    known_users = set()
+    if assignee_ids:
+        known_users = {user_id for (user_id,) in db.query(User.id).filter(User.id.in_(assignee_ids))}
 
-@router.get("/issues/{issue_id}", response_model=IssueResponse)
+    stats = IssueStatsDelta()
+
+    # Creates
+    new_rows, created = [], []
+    for index, item in enumerate(request.create):
+        try:
+            priority = IssuePriority(item.priority)
+        except ValueError:
+            results.append(_bulk_result("create", index, 400, detail="Invalid priority value"))
+            continue
+        if item.assignee_id is not None and item.assignee_id not in known_users:
+            results.append(_bulk_result("create", index, 400, detail="Unknown assignee"))
+            continue
+        new_rows.append({
+            "project_id": project_id,
+            "title": item.title,
+            "description": item.description,
+            "status": IssueStatus.OPEN,
+            "priority": priority,
+            "reporter_id": current_user.id,
+            "assignee_id": item.assignee_id,
+        })
+        stats.add(IssueStatus.OPEN, priority)
+        created.append(len(results))
+        results.append(_bulk_result("create", index, 201))
+
+    # Updates, grouped by the set of columns they change so that each group
+    # is a single executemany
+    deleted = set(request.delete) & in_project if is_maintainer else set()
+    changes: Dict[Tuple[str, ...], List[dict]] = {}
+    updated = set()
+    for index, item in enumerate(request.update):
+        if item.id not in in_project:
+            results.append(_bulk_result("update", index, 404, item.id, "Issue not found"))
+            continue
+        if item.id in updated:
+            # The groups don't run in item order, so a second update of the
+            # same issue could be applied before the first
+            results.append(_bulk_result("update", index, 409, item.id, "Issue is updated more than once"))
+            continue
+        if (item.status or item.assignee_id is not None) and not is_maintainer:
+            results.append(_bulk_result(
+                "update", index, 403, item.id, "Only maintainers can change status and assignee"
+            ))
+            continue
+        if item.id in deleted:
+            results.append(_bulk_result("update", index, 409, item.id, "Issue is also being deleted"))
+            continue
+        values = {}
+        if item.title:
+            values["title"] = item.title
+        if item.description is not None:
+            values["description"] = item.description
+        try:
+            if item.status:
+                values["status"] = IssueStatus(item.status)
+        except ValueError:
+            results.append(_bulk_result("update", index, 400, item.id, "Invalid status value"))
+            continue
+        try:
+            if item.priority:
+                values["priority"] = IssuePriority(item.priority)
+        except ValueError:
+            results.append(_bulk_result("update", index, 400, item.id, "Invalid priority value"))
+            continue
+        if item.assignee_id is not None:
+            if item.assignee_id not in known_users:
+                results.append(_bulk_result("update", index, 400, item.id, "Unknown assignee"))
+                continue
+            values["assignee_id"] = item.assignee_id
+        if values:
+            changes.setdefault(tuple(sorted(values)), []).append({"issue_id": item.id, **values})
+            old_status, old_priority = current[item.id]
+            stats.change(
+                old_status, old_priority,
+                values.get("status", old_status), values.get("priority", old_priority)
+            )
+        updated.add(item.id)
+        results.append(_bulk_result("update", index, 200, item.id))
+
+    # Deletes
+    for index, issue_id in enumerate(request.delete):
+        if issue_id not in in_project:
+            results.append(_bulk_result("delete", index, 404, issue_id, "Issue not found"))
+        elif not is_maintainer:
+            results.append(_bulk_result("delete", index, 403, issue_id, "Only project maintainers can perform this action"))
+        else:
+            results.append(_bulk_result("delete", index, 204, issue_id))
+    for issue_id in deleted:
+        stats.remove(*current[issue_id])
+
+    # Apply everything in one transaction. The update statements leave
+    # updated_at out of the parameters, so its onupdate default still applies.
+    for params in changes.values():
+        db.execute(issues.update().where(issues.c.id == bindparam("issue_id")), params)
+    if deleted:
+        db.execute(Comment.__table__.delete().where(Comment.issue_id.in_(deleted)))
+        db.execute(issues.delete().where(issues.c.id.in_(deleted)))
+    if new_rows:
+        # Matching generated ids back to their items needs RETURNING in
+        # parameter order. PostgreSQL batches that; on SQLite, SQLAlchemy
+        # falls back to a statement per row, which is still in-process.
+        new_ids = db.execute(
+            issues.insert().returning(issues.c.id, sort_by_parameter_order=True), new_rows
+        ).scalars().all()
+        for position, issue_id in zip(created, new_ids):
+            results[position]["id"] = issue_id
+    if changes or deleted or new_rows:
+        stats.apply(db, project_id)
+        bump_issues_version(db, project_id)
+    db.commit()
+
+    # Return the current state of every created or updated issue
+    touched = {result["id"] for result in results if result["status"] in (200, 201)}
+    if touched:
+        rows = {row[0].id: row for row in issue_rows(db).filter(Issue.id.in_(touched))}
+        for result in results:
+            if result["id"] in rows and result["status"] in (200, 201):
+                result["issue"] = serialize_issue(*rows[result["id"]])
+
+    for result in results:
+        if result["status"] in BULK_EVENTS:
+            publish(project_id, BULK_EVENTS[result["status"]], result["issue"] or {"id": result["id"]})
+
+    return FastJSONResponse({"results": results})
+
+@router.get("/issues/{issue_id}", response_model=IssueResponse,
+            response_description=SPARSE_RESPONSE_DESCRIPTION)
 def get_issue(
     issue_id: int,
+    http_request: Request,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
-    issue = db.query(Issue).filter(Issue.id == issue_id).first()
-    if not issue:
+    selected = _parse_fields(fields)
+    
+    # Just the issue's project and its change counter, enough to revalidate
+    head = db.query(Issue.project_id, Project.issues_version).join(
+        Project, Project.id == Issue.project_id
+    ).filter(Issue.id == issue_id).first()
+    if not head:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Issue not found"
         )
     
     # Check access
-    check_project_access(db, current_user.id, issue.project_id)
+    check_project_access(db, current_user.id, head.project_id)
     
-    # Get assignee name if exists
-    assignee_name = None
-    if issue.assignee_id:
-        assignee = db.query(User).filter(User.id == issue.assignee_id).first()
-        if assignee:
-            assignee_name = assignee.name
+    etag = make_etag("issue", issue_id, head.issues_version, selected)
+    if etag_matches(http_request, etag):
+        return not_modified(etag)
     
-    return {
-        "id": issue.id,
-        "project_id": issue.project_id,
-        "title": issue.title,
-        "description": issue.description,
-        "status": issue.status.value,
-        "priority": issue.priority.value,
-        "reporter_id": issue.reporter_id,
-        "assignee_id": issue.assignee_id,
-        "created_at": issue.created_at,
-        "updated_at": issue.updated_at,
-        "reporter_name": issue.reporter.name,
-        "assignee_name": assignee_name
-    }
+    # Loaded after the version was read, so the tag is never newer than the body
+    row = load_issue_row(db, issue_id, selected)
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Issue not found"
+        )
+    return tagged_json(dumps(serialize_issue(*row, selected)), etag)
 
 @router.patch("/issues/{issue_id}", response_model=IssueResponse)
 def update_issue(
     issue_id: int,
     request: IssueUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
-    issue = db.query(Issue).filter(Issue.id == issue_id).first()
+    # Locked, so the counter delta below starts from the current values
+    issue = db.query(Issue).filter(Issue.id == issue_id).with_for_update().first()
     if not issue:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -201,6 +484,7 @@ def update_issue(
         )
     
     # Update fields
+    old_status, old_priority = issue.status, issue.priority
     if request.title:
         issue.title = request.title
     if request.description is not None:
@@ -224,38 +508,24 @@ def update_issue(
     if request.assignee_id is not None:
         issue.assignee_id = request.assignee_id
     
+    stats = IssueStatsDelta()
+    stats.change(old_status, old_priority, issue.status, issue.priority)
+    stats.apply(db, issue.project_id)
+    bump_issues_version(db, issue.project_id)
     db.commit()
-    db.refresh(issue)
     
-    # Get assignee name if exists
-    assignee_name = None
-    if issue.assignee_id:
-        assignee = db.query(User).filter(User.id == issue.assignee_id).first()
-        if assignee:
-            assignee_name = assignee.name
-    
-    return {
-        "id": issue.id,
-        "project_id": issue.project_id,
-        "title": issue.title,
-        "description": issue.description,
-        "status": issue.status.value,
-        "priority": issue.priority.value,
-        "reporter_id": issue.reporter_id,
-        "assignee_id": issue.assignee_id,
-        "created_at": issue.created_at,
-        "updated_at": issue.updated_at,
-        "reporter_name": issue.reporter.name,
-        "assignee_name": assignee_name
-    }
+    # Re-select with the joined user names; this also refreshes the expired issue
+    updated = serialize_issue(*load_issue_row(db, issue_id))
+    publish(updated["project_id"], "issue.updated", updated)
+    return FastJSONResponse(updated)
 
 @router.delete("/issues/{issue_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_issue(
     issue_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
-    issue = db.query(Issue).filter(Issue.id == issue_id).first()
+    issue = db.query(Issue).filter(Issue.id == issue_id).with_for_update().first()
     if not issue:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -265,7 +535,13 @@ def delete_issue(
     # Only maintainers can delete
     check_maintainer_access(db, current_user.id, issue.project_id)
     
+    project_id = issue.project_id
     db.delete(issue)
+    stats = IssueStatsDelta()
+    stats.remove(issue.status, issue.priority)
+    stats.apply(db, project_id)
+    bump_issues_version(db, project_id)
     db.commit()
     
+    publish(project_id, "issue.deleted", {"id": issue_id})
     return None
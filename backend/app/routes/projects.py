@@ -5,8 +5,9 @@ from ..database import get_db
 from ..models.user import User
 from ..models.project import Project
 from ..models.project_member import ProjectMember, MemberRole
-from ..schemas.project import ProjectCreate, ProjectResponse, AddMemberRequest, MemberResponse
-from ..auth.security import get_current_user
+from ..schemas.project import ProjectCreate, ProjectResponse, AddMemberRequest, MemberResponse, ProjectStatsResponse
+from ..auth.security import Principal, get_current_user
+from ..issue_stats import create_stats_row, read_stats
 
 router = APIRouter(prefix="/api/projects", tags=["projects"])
 
@@ -14,7 +15,7 @@ router = APIRouter(prefix="/api/projects", tags=["projects"])
 def create_project(
     request: ProjectCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     # Check if project key already exists
     existing_project = db.query(Project).filter(Project.key == request.key).first()
@@ -34,13 +35,14 @@ def create_project(
     db.commit()
     db.refresh(new_project)
     
-    # Add creator as maintainer
+    # Add creator as maintainer, and start the project's issue counters
     membership = ProjectMember(
         project_id=new_project.id,
         user_id=current_user.id,
         role=MemberRole.MAINTAINER
     )
     db.add(membership)
+    create_stats_row(db, new_project.id)
     db.commit()
     
     return new_project
@@ -48,7 +50,7 @@ def create_project(
 @router.get("", response_model=List[ProjectResponse])
 def list_projects(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     # Get all projects where user is a member
     memberships = db.query(ProjectMember).filter(
@@ -60,15 +62,27 @@ def list_projects(
     
     return projects
 
+@router.get("/{project_id}/stats", response_model=ProjectStatsResponse)
+def get_project_stats(
+    project_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    from ..auth.permissions import check_project_access
+    check_project_access(db, current_user.id, project_id)
+    
+    # Counters are kept up to date by every issue write, so this is one row
+    return read_stats(db, project_id)
+
 @router.post("/{project_id}/members", response_model=MemberResponse, status_code=status.HTTP_201_CREATED)
 def add_member(
     project_id: int,
     request: AddMemberRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     # Check if current user is maintainer
-    from ..auth.permissions import check_maintainer_access
+    from ..auth.permissions import check_maintainer_access, invalidate_membership
     check_maintainer_access(db, current_user.id, project_id)
     
     # Find user by email
@@ -100,6 +114,9 @@ def add_member(
     db.add(new_member)
     db.commit()
     db.refresh(new_member)
+    # Drop the cached role again now that the row is committed, in case another
+    # request cached it between the flush and the commit
+    invalidate_membership(user.id, project_id)
     
     return {
         "id": new_member.id,
@@ -1,10 +1,15 @@
 from pydantic import BaseModel
 from pydantic import ConfigDict
 from datetime import datetime
+from typing import List, Optional
 
 class CommentCreate(BaseModel):
     body: str
 
+class CommentImport(CommentCreate):
+    author_email: Optional[str] = None
+    created_at: Optional[datetime] = None
+
 class CommentResponse(BaseModel):
     id: int
     issue_id: int
@@ -14,3 +19,7 @@ class CommentResponse(BaseModel):
     author_name: str
     
     model_config = ConfigDict(from_attributes=True)
+
+class CommentPage(BaseModel):
+    items: List[CommentResponse]
+    next_cursor: Optional[str] = None
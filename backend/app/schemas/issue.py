@@ -1,7 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from pydantic import ConfigDict
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+from .comment import CommentImport
 
 class IssueCreate(BaseModel):
     title: str
@@ -9,6 +10,15 @@ class IssueCreate(BaseModel):
     priority: str = "medium"
     assignee_id: Optional[int] = None
 
+class IssueImport(IssueCreate):
+    """One issue of an import (see app.importer); users are given by email"""
+    status: str = "open"
+    reporter_email: Optional[str] = None
+    assignee_email: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    comments: List[CommentImport] = []
+
 class IssueUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
@@ -31,3 +41,42 @@ class IssueResponse(BaseModel):
     assignee_name: Optional[str] = None
     
     model_config = ConfigDict(from_attributes=True)
+
+class IssuePage(BaseModel):
+    items: List[IssueResponse]
+    next_cursor: Optional[str] = None
+
+# Largest number of operations accepted by one bulk request
+BULK_MAX_ITEMS = 1000
+
+class IssueBulkUpdate(IssueUpdate):
+    id: int
+
+class IssueBulkRequest(BaseModel):
+    create: List[IssueCreate] = Field(default_factory=list, max_length=BULK_MAX_ITEMS)
+    update: List[IssueBulkUpdate] = Field(default_factory=list, max_length=BULK_MAX_ITEMS)
+    delete: List[int] = Field(default_factory=list, max_length=BULK_MAX_ITEMS)
+
+class IssueBulkResult(BaseModel):
+    op: str
+    index: int
+    id: Optional[int] = None
+    status: int
+    detail: Optional[str] = None
+    issue: Optional[IssueResponse] = None
+
+class IssueBulkResponse(BaseModel):
+    results: List[IssueBulkResult]
+
+class IssueImportError(BaseModel):
+    line: int
+    error: str
+
+class IssueImportReport(BaseModel):
+    lines: int
+    issues: int
+    comments: int
+    failed: int
+    elapsed_sec: float
+    issues_per_sec: Optional[float] = None
+    errors: List[IssueImportError]
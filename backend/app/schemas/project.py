@@ -1,7 +1,7 @@
 from pydantic import BaseModel
 from pydantic import ConfigDict
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 class ProjectCreate(BaseModel):
     name: str
@@ -29,3 +29,9 @@ class MemberResponse(BaseModel):
     user_email: str
     
     model_config = ConfigDict(from_attributes=True)
+
+class ProjectStatsResponse(BaseModel):
+    project_id: int
+    total: int
+    by_status: Dict[str, int]
+    by_priority: Dict[str, int]
@@ -0,0 +1,144 @@
+"""Full-text search for the issue list ``q`` parameter.
+
+SQLite uses an external-content FTS5 table (``issues_fts``) that triggers keep
+in step with ``issues`` on every insert, update and delete. Postgres uses a GIN
+index over a ``to_tsvector`` expression, which the database maintains itself.
+Both are created by the ``002`` migration; :func:`install_search_index` creates
+the same objects for databases built with ``Base.metadata.create_all``.
+
+When neither exists (e.g. an older database that hasn't been migrated) the
+list endpoint falls back to the original ``ILIKE`` filter.
+"""
+import re
+from typing import Dict, List, Optional
+
+from sqlalchemy import Float, Integer, bindparam, func, literal_column, or_, text
+from sqlalchemy.orm import Session
+
+from .models.issue import Issue
+
+FTS5 = "fts5"
+TSVECTOR = "tsvector"
+
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5("
+    "title, description, content='issues', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS issues_fts_ai AFTER INSERT ON issues BEGIN "
+    "INSERT INTO issues_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS issues_fts_ad AFTER DELETE ON issues BEGIN "
+    "INSERT INTO issues_fts(issues_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS issues_fts_au AFTER UPDATE OF title, description ON issues BEGIN "
+    "INSERT INTO issues_fts(issues_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO issues_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END",
+    # index whatever rows already exist
+    "INSERT INTO issues_fts(issues_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS issues_fts_au",
+    "DROP TRIGGER IF EXISTS issues_fts_ad",
+    "DROP TRIGGER IF EXISTS issues_fts_ai",
+    "DROP TABLE IF EXISTS issues_fts",
+]
+
+# The query below must use exactly this expression for Postgres to pick the index.
+PG_DOCUMENT = "to_tsvector('english', coalesce(issues.title, '') || ' ' || coalesce(issues.description, ''))"
+
+POSTGRES_DDL = [
+    "CREATE INDEX IF NOT EXISTS ix_issues_search ON issues USING gin "
+    "((to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))))",
+]
+
+POSTGRES_DROP = ["DROP INDEX IF EXISTS ix_issues_search"]
+
+# engine url -> detected backend (None when no index exists)
+_backends: Dict[str, Optional[str]] = {}
+
+
+def install_search_index(connection) -> None:
+    """Create the search index objects for the connection's dialect."""
+    ddl = {"sqlite": SQLITE_DDL, "postgresql": POSTGRES_DDL}.get(connection.dialect.name, [])
+    for statement in ddl:
+        connection.execute(text(statement))
+    _backends.pop(str(connection.engine.url), None)
+
+
+def drop_search_index(connection) -> None:
+    ddl = {"sqlite": SQLITE_DROP, "postgresql": POSTGRES_DROP}.get(connection.dialect.name, [])
+    for statement in ddl:
+        connection.execute(text(statement))
+    _backends.pop(str(connection.engine.url), None)
+
+
+def search_backend_for(connection) -> Optional[str]:
+    """Look up which search backend exists on the connection's database."""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        found = connection.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'issues_fts'"
+        )).first()
+        return FTS5 if found else None
+    if dialect == "postgresql":
+        found = connection.execute(text(
+            "SELECT 1 FROM pg_indexes WHERE indexname = 'ix_issues_search'"
+        )).first()
+        return TSVECTOR if found else None
+    return None
+
+
+def search_backend(db: Session) -> Optional[str]:
+    """Return the search backend available on the session's database, or None.
+
+    The catalog is only consulted once per engine.
+    """
+    key = str(db.get_bind().url)
+    if key not in _backends:
+        _backends[key] = search_backend_for(db.connection())
+    return _backends[key]
+
+
+def search_terms(q: str) -> List[str]:
+    """Split a user query into plain word tokens, dropping any query syntax."""
+    return re.findall(r"\w+", q)
+
+
+def apply_search(query, db: Session, q: str):
+    """Restrict ``query`` to issues matching ``q``.
+
+    Returns ``(query, score)`` where ``score`` is a column to sort on
+    ascending for best-first relevance, or None if the ``ILIKE`` fallback
+    was used.
+    """
+    terms = search_terms(q)
+    backend = search_backend(db) if terms else None
+
+    if backend == FTS5:
+        # every term must match, each as a prefix ("log" finds "login")
+        match = " ".join('"%s"*' % term for term in terms)
+        matches = text(
+            "SELECT rowid AS issue_id, bm25(issues_fts) AS score "
+            "FROM issues_fts WHERE issues_fts MATCH :match"
+        ).bindparams(match=match).columns(issue_id=Integer, score=Float).subquery("search")
+        return query.join(matches, matches.c.issue_id == Issue.id), matches.c.score
+
+    if backend == TSVECTOR:
+        document = literal_column(PG_DOCUMENT)
+        tsquery = func.to_tsquery(
+            literal_column("'english'"),
+            bindparam("search_terms", " & ".join(f"{term}:*" for term in terms)),
+        )
+        # ts_rank is higher-is-better; negate so every backend sorts ascending
+        score = -func.ts_rank(document, tsquery)
+        return query.filter(document.op("@@")(tsquery)), score
+
+    return query.filter(
+        or_(
+            Issue.title.ilike(f"%{q}%"),
+            Issue.description.ilike(f"%{q}%")
+        )
+    ), None
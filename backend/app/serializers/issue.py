@@ -0,0 +1,105 @@
+"""Shared issue serialization.
+
+Issue responses carry the reporter's and assignee's display names. Rather than
+lazy-loading ``issue.reporter`` and querying the assignee for every row, all
+issue endpoints select issues through :func:`issue_rows`, which joins both
+users in the same statement. A page therefore costs one query no matter how
+many issues it holds.
+
+Callers can ask for a subset of the fields (``?fields=id,title,status``).
+Then only those columns are selected and only the joins they need are made.
+The other columns are set to raise rather than lazy-load, so leaving out
+``description`` really does keep it off the wire, both from the database and
+to the client.
+"""
+from typing import Optional, Sequence, Tuple
+from sqlalchemy import null
+from sqlalchemy.orm import Session, aliased, load_only
+from ..models.issue import Issue
+from ..models.user import User
+
+Reporter = aliased(User, name="reporter")
+Assignee = aliased(User, name="assignee")
+
+# Response keys in response order; each is an Issue column unless noted
+ISSUE_FIELDS = (
+    "id", "project_id", "title", "description", "status", "priority", "reporter_id",
+    "assignee_id", "created_at", "updated_at", "reporter_name", "assignee_name",
+)
+NAME_FIELDS = ("reporter_name", "assignee_name")
+
+
+def parse_fields(value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Turn a ``fields`` parameter into response keys, in response order.
+
+    Returns None (every field) when the parameter is absent or empty; raises
+    ValueError naming any unknown field.
+    """
+    if not value:
+        return None
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = requested.difference(ISSUE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(name for name in ISSUE_FIELDS if name in requested) or None
+
+
+def issue_rows(db: Session, fields: Optional[Sequence[str]] = None):
+    """Query yielding ``(Issue, reporter_name, assignee_name)`` rows.
+
+    With ``fields``, the Issue is loaded with only those columns (plus its
+    id), and a name that wasn't asked for is a NULL instead of a join.
+    Callers add their own filters, ordering and limits.
+    """
+    if fields is None:
+        return (
+            db.query(Issue, Reporter.name, Assignee.name)
+            .join(Reporter, Reporter.id == Issue.reporter_id)
+            .outerjoin(Assignee, Assignee.id == Issue.assignee_id)
+        )
+    columns = [getattr(Issue, name) for name in fields if name not in NAME_FIELDS]
+    query = db.query(
+        Issue,
+        Reporter.name if "reporter_name" in fields else null().label("reporter_name"),
+        Assignee.name if "assignee_name" in fields else null().label("assignee_name"),
+    ).options(load_only(*(columns or [Issue.id]), raiseload=True))
+    if "reporter_name" in fields:
+        query = query.join(Reporter, Reporter.id == Issue.reporter_id)
+    if "assignee_name" in fields:
+        query = query.outerjoin(Assignee, Assignee.id == Issue.assignee_id)
+    return query
+
+
+def serialize_issue(
+    issue: Issue, reporter_name: str, assignee_name: Optional[str], fields: Optional[Sequence[str]] = None
+) -> dict:
+    if fields is not None:
+        values = {"reporter_name": reporter_name, "assignee_name": assignee_name}
+        return {
+            name: values[name] if name in values else _column_value(issue, name)
+            for name in fields
+        }
+    return {
+        "id": issue.id,
+        "project_id": issue.project_id,
+        "title": issue.title,
+        "description": issue.description,
+        "status": issue.status.value,
+        "priority": issue.priority.value,
+        "reporter_id": issue.reporter_id,
+        "assignee_id": issue.assignee_id,
+        "created_at": issue.created_at,
+        "updated_at": issue.updated_at,
+        "reporter_name": reporter_name,
+        "assignee_name": assignee_name
+    }
+
+
+def _column_value(issue: Issue, name: str):
+    value = getattr(issue, name)
+    return value.value if name in ("status", "priority") else value
+
+
+def load_issue_row(db: Session, issue_id: int, fields: Optional[Sequence[str]] = None):
+    """Return the ``(Issue, reporter_name, assignee_name)`` row for one issue, or None."""
+    return issue_rows(db, fields).filter(Issue.id == issue_id).first()
@@ -0,0 +1,197 @@
+"""Slow-query log.
+
+Statements that take longer than ``SLOW_QUERY_THRESHOLD_MS`` are logged to the
+``app.slow_queries`` logger as one line of JSON:
+
+    {"event": "slow_query", "duration_ms": 812.4, "threshold_ms": 500.0,
+     "method": "GET", "route": "/api/projects/{project_id}/issues",
+     "statement": "SELECT issues.id, ... WHERE issues.project_id = ? ...",
+     "parameters": ["<int>", "<int>"], "executemany": false,
+     "plan": ["SEARCH issues USING INDEX ix_issues_project_created (project_id=?)"],
+     "suppressed": 0}
+
+The statement is normalized (literals and placeholders become ``?``, long
+``IN`` lists collapse, whitespace is squeezed), and it is also the key for
+rate limiting. Each normalized statement is logged at most once per
+``SLOW_QUERY_LOG_INTERVAL_SECONDS``; later logs report how many occurrences
+were skipped in ``suppressed``. Parameters are replaced by their type names
+unless ``SLOW_QUERY_REDACT_PARAMETERS`` is off.
+
+The plan is captured right after the slow statement, on the same connection
+and with the same parameters: ``EXPLAIN QUERY PLAN`` on SQLite, ``EXPLAIN``
+elsewhere. It is only captured when the statement is about to be logged.
+
+Statements are timed by ``statement_timer``, the same hook the metrics use, so
+they also cover the async stack's engine. Timing one statement costs two
+``perf_counter`` calls, however many observers there are.
+"""
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, List, Optional
+
+from . import statement_timer
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Normalized statements whose rate limit is remembered
+MAX_TRACKED_STATEMENTS = 1000
+# Parameter values shown when not redacted, and parameter sets for executemany
+MAX_LOGGED_PARAMETER_SETS = 3
+MAX_PARAMETER_CHARS = 200
+
+EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH|INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+
+_NORMALIZE = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),                 # string literals
+    (re.compile(r"%\(\w+\)s|\$\d+|(?<![\w:]):\w+"), "?"),  # named and numbered placeholders
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),             # numbers
+    (re.compile(r"\s+"), " "),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)"), "(?, ...)"),  # IN (?, ?, ?)
+]
+
+# The scope of the request being served, for the route in log lines
+_request_scope: ContextVar[Optional[dict]] = ContextVar("slow_query_request_scope", default=None)
+
+
+def normalize(statement: str) -> str:
+    for pattern, replacement in _NORMALIZE:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip()
+
+
+def _describe(parameters: Any, redact: bool) -> Any:
+    if isinstance(parameters, dict):
+        return {key: _describe(value, redact) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_describe(value, redact) for value in parameters]
+    if redact:
+        return f"<{type(parameters).__name__}>"
+    if parameters is None or isinstance(parameters, (bool, int, float)):
+        return parameters
+    text = str(parameters)
+    return text if len(text) <= MAX_PARAMETER_CHARS else text[:MAX_PARAMETER_CHARS] + "..."
+
+
+class SlowQueryLog:
+    """Times statements and logs the slow ones, at most once per interval each"""
+
+    def __init__(self, threshold_ms: float, interval_seconds: float, redact: bool, explain: bool):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_seconds
+        self.redact = redact
+        self.explain = explain
+        # normalized statement -> [time last logged, occurrences skipped since]
+        self._seen: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _should_log(self, key: str, now: float) -> Optional[int]:
+        """Return the skipped count to report, or None to skip this one"""
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is not None and now - entry[0] < self.interval:
+                entry[1] += 1
+                return None
+            suppressed = entry[1] if entry is not None else 0
+            self._seen[key] = [now, 0]
+            self._seen.move_to_end(key)
+            while len(self._seen) > MAX_TRACKED_STATEMENTS:
+                self._seen.popitem(last=False)
+            return suppressed
+
+    def _plan(self, conn, statement: str, parameters: Any, executemany: bool) -> Optional[List[str]]:
+        if not EXPLAINABLE.match(statement):
+            return None
+        dialect = conn.dialect.name
+        prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+        if executemany:
+            parameters = parameters[0] if parameters else ()
+        # a raw DBAPI cursor, so the EXPLAIN fires no events of its own
+        cursor = conn.connection.dbapi_connection.cursor()
+        savepoint = dialect == "postgresql"
+        try:
+            if savepoint:
+                # a failed EXPLAIN mustn't abort the request's transaction
+                cursor.execute("SAVEPOINT slow_query_explain")
+            try:
+                cursor.execute(prefix + statement, parameters)
+                rows = cursor.fetchall()
+            except Exception as exc:
+                if savepoint:
+                    cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                return [f"EXPLAIN failed: {exc}".splitlines()[0]]
+            if savepoint:
+                cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        finally:
+            cursor.close()
+        # SQLite rows are (id, parent, notused, detail); others are one text column
+        return [str(row[-1]) for row in rows]
+
+    def record(self, conn, statement: str, parameters: Any, executemany: bool, elapsed: float) -> None:
+        key = normalize(statement)
+        suppressed = self._should_log(key, time.monotonic())
+        if suppressed is None:
+            return
+        scope = _request_scope.get()
+        route = scope.get("route") if scope else None
+        if executemany:
+            parameters_logged = _describe(list(parameters[:MAX_LOGGED_PARAMETER_SETS]), self.redact)
+        else:
+            parameters_logged = _describe(parameters, self.redact)
+        entry = {
+            "event": "slow_query",
+            "duration_ms": round(elapsed * 1000, 1),
+            "threshold_ms": round(self.threshold * 1000, 1),
+            "method": scope.get("method") if scope else None,
+            "route": getattr(route, "path_format", None) or getattr(route, "path", None),
+            "statement": key,
+            "parameters": parameters_logged,
+            "executemany": executemany,
+            "plan": self._plan(conn, statement, parameters, executemany) if self.explain else None,
+            "suppressed": suppressed,
+        }
+        logger.warning(json.dumps(entry, default=str))
+
+
+slow_query_log = SlowQueryLog(
+    settings.slow_query_threshold_ms,
+    settings.slow_query_log_interval_seconds,
+    settings.slow_query_redact_parameters,
+    settings.slow_query_explain,
+)
+
+
+def _observe_statement(conn, statement, parameters, executemany, elapsed):
+    if elapsed >= slow_query_log.threshold:
+        try:
+            slow_query_log.record(conn, statement, parameters, executemany, elapsed)
+        except Exception:
+            # the log is best effort and must never fail the query
+            logger.debug("slow query logging failed", exc_info=True)
+
+
+def install() -> None:
+    """Start timing statements on every engine"""
+    statement_timer.observe(_observe_statement)
+
+
+class RequestScopeMiddleware:
+    """Makes the current request's scope available to the log, for its route"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_scope.reset(token)
@@ -0,0 +1,75 @@
+"""Engine profile for running on a SQLite file (``SQLITE_PROFILE``).
+
+Every new connection gets these pragmas:
+
+* ``journal_mode=WAL``: readers no longer block on a writer, or a writer
+  on readers. It is stored in the file, so the first connection turns it on.
+* ``synchronous=NORMAL``: under WAL this is still safe against corruption.
+  A power loss can only drop the last few commits; fsync runs at
+  checkpoints instead of on every commit.
+* ``busy_timeout``: a writer waits this long for the write lock instead of
+  failing at once with "database is locked".
+* ``cache_size`` (per connection) and ``mmap_size``, so reads are served from
+  memory instead of through read() calls.
+* ``foreign_keys=ON``, matching the behaviour of the other backends.
+
+The pool is also sized for SQLite. Overflow connections would be opened and
+closed under load, re-running the pragmas and throwing away their page cache,
+so the profile uses a fixed set of connections and no overflow. A connection
+is a local file handle that can't go stale, so pre-ping is skipped too.
+In-memory databases keep the dialect's defaults.
+"""
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+from .config import settings
+
+
+def applies_to(url: str) -> bool:
+    """Whether the profile is on and ``url`` is a SQLite file database"""
+    parsed = make_url(url)
+    return (
+        settings.sqlite_profile
+        and parsed.get_backend_name() == "sqlite"
+        and parsed.database not in (None, "", ":memory:")
+        and "mode=memory" not in str(parsed.query)
+    )
+
+
+def pragmas() -> Dict[str, Any]:
+    return {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        # negative sizes are in KiB rather than pages
+        "cache_size": -settings.sqlite_cache_size_kib,
+        "mmap_size": settings.sqlite_mmap_size_mib * 1024 * 1024,
+        "foreign_keys": "ON",
+    }
+
+
+def pool_options() -> Dict[str, Any]:
+    return {
+        "pool_size": settings.sqlite_pool_size,
+        "max_overflow": 0,
+        "pool_timeout": settings.sqlite_busy_timeout_ms / 1000 + 30,
+        "pool_pre_ping": False,
+    }
+
+
+def _apply_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas().items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def install(engine) -> None:
+    """Run the pragmas on each connection ``engine`` (sync or async) opens"""
+    target = getattr(engine, "sync_engine", engine)
+    if not event.contains(target, "connect", _apply_pragmas):
+        event.listen(target, "connect", _apply_pragmas)
@@ -0,0 +1,43 @@
+"""One timer for every SQL statement, shared by the metrics and the slow-query log.
+
+The cursor events are engine-wide, so they also cover the async stack's
+engine. Each statement is timed once, and every observer registered with
+:func:`observe` is called afterwards with ``(conn, statement, parameters,
+executemany, elapsed)``.
+
+The start time lives on the execution context, which is dropped with the
+statement. A statement that raises never reaches ``after_cursor_execute``, and
+anything kept on the pooled connection would stay there for good.
+"""
+import time
+from typing import Any, Callable, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+Observer = Callable[[Any, str, Any, bool, float], None]
+
+_observers: List[Observer] = []
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._statement_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_statement_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    for observer in _observers:
+        observer(conn, statement, parameters, executemany, elapsed)
+
+
+def observe(observer: Observer) -> None:
+    """Call ``observer`` after every statement on every engine"""
+    if observer not in _observers:
+        _observers.append(observer)
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,30 @@
+"""Per-project issue change counter.
+
+Every write to a project's issues bumps ``projects.issues_version`` in the
+same transaction, so the counter changes exactly when what the issue
+endpoints would return might have changed. Readers use it to tag and
+revalidate responses without re-reading the issues themselves.
+
+Writers call :func:`bump_issues_version` explicitly rather than relying on ORM
+events because the bulk endpoint writes through Core statements, which don't
+fire them.
+"""
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from .models.project import Project
+
+
+def bump_issues_version(db: Session, project_id: int) -> None:
+    db.execute(
+        update(Project)
+        .where(Project.id == project_id)
+        .values(issues_version=Project.issues_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def get_issues_version(db: Session, project_id: int) -> Optional[int]:
+    return db.query(Project.issues_version).filter(Project.id == project_id).scalar()
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 import os
 import pytest
@@ -26,6 +26,7 @@ def prepare_database():
     import app.models.project_member  # noqa: F401
     import app.models.issue  # noqa: F401
     import app.models.comment  # noqa: F401
+    import app.models.project_issue_stats  # noqa: F401
 
     # Create tables
     # Point the application's database engine/session to the test engine
@@ -34,7 +35,13 @@ def prepare_database():
     _app_db.SessionLocal = TestingSessionLocal
 
     Base.metadata.create_all(bind=engine)
+    # Full-text search objects live outside the ORM metadata (migration 002)
+    from app.search import install_search_index, drop_search_index
+    with engine.begin() as connection:
+        install_search_index(connection)
     yield
+    with engine.begin() as connection:
+        drop_search_index(connection)
     Base.metadata.drop_all(bind=engine)
 
 
@@ -47,6 +54,21 @@ def db_session():
         session.close()
 
 
+@pytest.fixture()
+def sql_statements():
+    """Record every SQL statement executed on the test engine."""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
 # Dependency override
 def override_get_db():
     db = TestingSessionLocal()
@@ -0,0 +1,60 @@
+import inspect
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest.fixture()
+def async_client(db_session):
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from app.database import async_database_url, get_async_db
+    from app.routes import auth, projects, issues, comments
+    from app.routes.aio import async_router
+
+    url = db_session.get_bind().url.render_as_string(hide_password=False)
+    engine = create_async_engine(async_database_url(url))
+    sessions = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with sessions() as db:
+            yield db
+
+    app = FastAPI()
+    for router in [auth.router, projects.router, issues.router, comments.router]:
+        app.include_router(async_router(router))
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as client:
+        yield client
+    engine.sync_engine.dispose()
+
+
+def test_async_stack_serves_the_api(async_client):
+    client = async_client
+    for route in client.app.routes:
+        if getattr(route, "name", None) in {"list_issues", "create_issue", "get_issue", "list_comments", "login"}:
+            assert inspect.iscoroutinefunction(route.endpoint), route.name
+
+    email = f"async_{uuid.uuid4().hex[:8]}@example.com"
+    assert client.post("/api/auth/signup", json={"name": "Async", "email": email, "password": "secret123"}).status_code == 201
+    token = client.post("/api/auth/login", json={"email": email, "password": "secret123"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/auth/me", headers=headers).json()["email"] == email
+
+    r = client.post("/api/projects", json={"name": "Async", "key": f"AS{uuid.uuid4().hex[:6]}"}, headers=headers)
+    assert r.status_code == 201, r.text
+    project_id = r.json()["id"]
+    r = client.post(f"/api/projects/{project_id}/issues", json={"title": "Async bug"}, headers=headers)
+    assert r.status_code == 201, r.text
+    issue_id = r.json()["id"]
+    assert r.json()["reporter_name"] == "Async"
+
+    assert client.get(f"/api/projects/{project_id}/issues", headers=headers).json()["items"][0]["id"] == issue_id
+    assert client.patch(f"/api/issues/{issue_id}", json={"status": "resolved"}, headers=headers).json()["status"] == "resolved"
+    assert client.post(f"/api/issues/{issue_id}/comments", json={"body": "async"}, headers=headers).status_code == 201
+    assert client.get(f"/api/issues/{issue_id}/comments", headers=headers).json()["items"][0]["author_name"] == "Async"
+    assert client.delete(f"/api/issues/{issue_id}", headers=headers).status_code == 204
+    assert client.get(f"/api/issues/{issue_id}", headers=headers).status_code == 404
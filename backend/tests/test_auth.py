@@ -10,3 +10,59 @@ def test_signup_creates_user(client):
     data = resp.json()
     assert data.get("email") == email
     assert "id" in data
+
+
+def test_token_claims_skip_user_lookup(client, monkeypatch, sql_statements):
+    from app.config import settings
+    from app.auth.security import user_cache
+
+    monkeypatch.setattr(settings, "auth_token_claims", True)
+    email = f"claims_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/api/auth/signup", json={"name": "Claims User", "email": email, "password": "secret123"})
+    token = client.post("/api/auth/login", json={"email": email, "password": "secret123"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    sql_statements.clear()
+    assert client.get("/api/projects", headers=headers).status_code == 200
+    assert not any("FROM users" in s for s in sql_statements)
+
+    # /me still loads the full row
+    me = client.get("/api/auth/me", headers=headers).json()
+    assert me["email"] == email and me["name"] == "Claims User"
+
+    # a token without display claims is resolved once, then served from the cache
+    from app.auth.security import create_access_token
+    bare = {"Authorization": f"Bearer {create_access_token({'sub': str(me['id'])})}"}
+    client.get("/api/projects", headers=bare)
+    assert user_cache.get(me["id"]).name == "Claims User"
+    sql_statements.clear()
+    client.get("/api/projects", headers=bare)
+    assert not any("FROM users" in s for s in sql_statements)
+
+
+def test_login_returns_503_when_hashing_pool_is_full(client, monkeypatch):
+    from app.auth.hashing import hashing_pool
+
+    email = f"busy_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/api/auth/signup", json={"name": "Busy", "email": email, "password": "secret123"})
+    monkeypatch.setattr(hashing_pool, "max_pending", 0)
+    r = client.post("/api/auth/login", json={"email": email, "password": "secret123"})
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "1"
+
+
+def test_login_rehashes_in_background(client, db_session, monkeypatch):
+    import app.routes.auth as auth_routes
+    from app.models.user import User
+
+    email = f"rehash_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/api/auth/signup", json={"name": "Rehash", "email": email, "password": "secret123"})
+    old_hash = db_session.query(User.password_hash).filter(User.email == email).scalar()
+
+    monkeypatch.setattr(auth_routes, "needs_rehash", lambda hashed: True)
+    r = client.post("/api/auth/login", json={"email": email, "password": "secret123"})
+    assert r.status_code == 200
+    new_hash = db_session.query(User.password_hash).filter(User.email == email).scalar()
+    assert new_hash != old_hash
+    monkeypatch.undo()
+    assert client.post("/api/auth/login", json={"email": email, "password": "secret123"}).status_code == 200
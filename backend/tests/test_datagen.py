@@ -0,0 +1,43 @@
+from dataclasses import replace
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.datagen import DatasetSpec, generate
+from app.issue_stats import reconcile
+from app.models.issue import Issue
+from app.models.project import Project
+from app.models.user import User
+from app.search import apply_search, install_search_index, search_backend_for
+
+
+def test_generating_twice_appends_consistent_data(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'generated.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        install_search_index(connection)
+
+    spec = DatasetSpec(users=20, projects=4, issues=300, members_per_project=5,
+                       hot_issue_comments=20, chunk_size=64)
+    first = generate(engine, spec, quiet=True)
+    second = generate(engine, replace(spec, seed=1), quiet=True)
+    assert first["issues"] == second["issues"] == 300 and second["comments"] > 0
+
+    with Session(engine) as db:
+        # the second run's ids and unique keys follow the first run's
+        assert db.scalar(select(func.count()).select_from(User)) == 40
+        assert db.scalar(select(func.count(func.distinct(User.email)))) == 40
+        assert db.scalar(select(func.count(func.distinct(Project.key)))) == 8
+        assert db.scalar(select(func.count()).select_from(Issue)) == 600
+
+        # the search index was rebuilt around the bulk insert and covers both runs
+        assert search_backend_for(db.connection()) is not None
+        last = db.query(Issue).order_by(Issue.id.desc()).first()
+        query, score = apply_search(db.query(Issue.id).filter(Issue.project_id == last.project_id), db, last.title)
+        assert score is not None and last.id in {row.id for row in query}
+
+    # every generated project has a counters row that matches its issues
+    report = reconcile(engine, fix=False)
+    assert report["projects"] == 8 and report["drifted"] == 0
+    engine.dispose()
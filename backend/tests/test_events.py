@@ -0,0 +1,173 @@
+import asyncio
+import json
+import threading
+import time
+import uuid
+
+import pytest
+
+
+def signup_and_login(client, name="Watcher"):
+    email = f"events_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/api/auth/signup", json={"name": name, "email": email, "password": "secret123"})
+    token = client.post("/api/auth/login", json={"email": email, "password": "secret123"}).json()["access_token"]
+    return email, {"Authorization": f"Bearer {token}"}
+
+
+def parse_events(body):
+    events = []
+    for frame in body.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.splitlines() if ": " in line and not line.startswith(":"))
+        if "event" in fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_project_stream_carries_writes_after_commit(client):
+    from app.events import hub
+
+    _, headers = signup_and_login(client)
+    project_id = client.post(
+        "/api/projects", json={"name": "Live", "key": f"LV{uuid.uuid4().hex[:6]}"}, headers=headers
+    ).json()["id"]
+    other_project = client.post(
+        "/api/projects", json={"name": "Quiet", "key": f"QT{uuid.uuid4().hex[:6]}"}, headers=headers
+    ).json()["id"]
+    subscribers = hub.stats()["subscribers"]
+
+    def write():
+        wait_for(lambda: hub.stats()["subscribers"] == subscribers + 1)
+        issue_id = client.post(f"/api/projects/{project_id}/issues", json={"title": "Live one"}, headers=headers).json()["id"]
+        client.post(f"/api/projects/{other_project}/issues", json={"title": "Elsewhere"}, headers=headers)
+        client.patch(f"/api/issues/{issue_id}", json={"status": "closed"}, headers=headers)
+        client.post(f"/api/issues/{issue_id}/comments", json={"body": "Done"}, headers=headers)
+        client.post(f"/api/projects/{project_id}/issues/bulk", json={"create": [{"title": "Bulk"}]}, headers=headers)
+        client.delete(f"/api/issues/{issue_id}", headers=headers)
+        hub.close_all()
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    r = client.get(f"/api/projects/{project_id}/events", headers=headers)
+    writer.join()
+
+    assert r.status_code == 200 and r.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(r.text)
+    assert [event for event, _ in events] == [
+        "issue.created", "issue.updated", "comment.added", "issue.created", "issue.deleted"
+    ]
+    assert events[0][1]["title"] == "Live one" and events[1][1]["status"] == "closed"
+    assert events[2][1]["body"] == "Done" and events[2][1]["author_name"] == "Watcher"
+    assert events[4][1] == {"id": events[0][1]["id"]}
+    assert hub.stats()["subscribers"] == subscribers
+
+    _, outsider = signup_and_login(client, "Outsider")
+    assert client.get(f"/api/projects/{project_id}/events", headers=outsider).status_code == 403
+
+
+def test_slow_subscribers_are_evicted_and_the_hub_is_bounded():
+    from app.events import EventHub, HubFull
+
+    async def scenario():
+        hub = EventHub(queue_size=3, max_subscribers=2)
+        slow = hub.subscribe(1)
+        hub.subscribe(2)
+        with pytest.raises(HubFull):
+            hub.subscribe(3)
+
+        # published from another thread, as sync handlers do
+        publisher = threading.Thread(target=lambda: [hub.publish(1, "issue.updated", {"n": n}) for n in range(5)])
+        publisher.start()
+        publisher.join()
+        await asyncio.sleep(0.01)
+
+        frames = [frame async for frame in slow.stream(heartbeat=1)]
+        assert frames[0].startswith("retry:") and frames[-1].startswith("event: evicted")
+        assert len(frames) == 2
+        assert hub.publish(1, "issue.updated", {}) == 0
+        return hub.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["evictions"] == 1 and stats["subscribers"] == 1 and stats["published"] == 6
+
+
+def test_thousands_of_idle_subscribers_get_one_wakeup_per_event():
+    from app.events import EventHub, _deliver_all
+
+    async def scenario():
+        hub = EventHub(queue_size=8, max_subscribers=10000)
+        subscriptions = [hub.subscribe(7) for _ in range(5000)]
+        loop = asyncio.get_running_loop()
+        scheduled = []
+        original = loop.call_soon_threadsafe
+        loop.call_soon_threadsafe = lambda *args: scheduled.append(args) or original(*args)
+        delivered = await loop.run_in_executor(None, hub.publish, 7, "comment.added", {"body": "hi"})
+        await asyncio.sleep(0.01)
+        assert delivered == 5000 and [args[0] for args in scheduled].count(_deliver_all) == 1
+        assert all(s.queue.qsize() == 1 for s in subscriptions)
+
+    asyncio.run(scenario())
+
+
+def test_a_response_dropped_before_streaming_holds_no_subscription():
+    from app.events import EventHub, HubFull
+
+    async def scenario():
+        hub = EventHub(queue_size=3, max_subscribers=1)
+        dropped = hub.stream(1, heartbeat=1)
+        await dropped.aclose()
+        assert hub.stats()["subscribers"] == 0 and hub.publish(1, "issue.updated", {}) == 0
+
+        stream = hub.stream(1, heartbeat=1)
+        assert (await stream.__anext__()).startswith("retry:")
+        with pytest.raises(HubFull):
+            hub.check_capacity()
+        # a stream started over capacity ends at once
+        assert [frame async for frame in hub.stream(2, heartbeat=1)][0].startswith("event: evicted")
+        await stream.aclose()
+        return hub.stats()
+
+    assert asyncio.run(scenario())["subscribers"] == 0
+
+
+def test_browsers_open_the_stream_with_a_short_lived_query_token(client):
+    from app.events import hub
+
+    _, headers = signup_and_login(client)
+    project_id = client.post(
+        "/api/projects", json={"name": "Board", "key": f"BD{uuid.uuid4().hex[:6]}"}, headers=headers
+    ).json()["id"]
+    other_project = client.post(
+        "/api/projects", json={"name": "Other", "key": f"OT{uuid.uuid4().hex[:6]}"}, headers=headers
+    ).json()["id"]
+    issued = client.post(f"/api/projects/{project_id}/events/token", headers=headers).json()
+    assert issued["expires_in"] == 60
+    token = issued["token"]
+    subscribers = hub.stats()["subscribers"]
+
+    def write():
+        wait_for(lambda: hub.stats()["subscribers"] == subscribers + 1)
+        client.post(f"/api/projects/{project_id}/issues", json={"title": "Seen by the board"}, headers=headers)
+        hub.close_all()
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    # no Authorization header, as from EventSource
+    r = client.get(f"/api/projects/{project_id}/events?token={token}")
+    writer.join()
+    assert r.status_code == 200
+    assert [event for event, _ in parse_events(r.text)] == ["issue.created"]
+
+    # the token opens this project's stream and nothing else
+    assert client.get(f"/api/projects/{other_project}/events?token={token}").status_code == 401
+    assert client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"}).status_code == 401
+    assert client.get(f"/api/projects/{project_id}/events").status_code == 401
+
+    _, outsider = signup_and_login(client, "Outsider")
+    assert client.post(f"/api/projects/{project_id}/events/token", headers=outsider).status_code == 403
@@ -0,0 +1,70 @@
+import csv
+import io
+import json
+import uuid
+
+
+def signup_and_login(client):
+    email = f"export_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/api/auth/signup", json={"name": "Exporter", "email": email, "password": "secret123"})
+    token = client.post("/api/auth/login", json={"email": email, "password": "secret123"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def make_project(client, headers, titles):
+    project_id = client.post(
+        "/api/projects", json={"name": "Export", "key": f"EX{uuid.uuid4().hex[:6]}"}, headers=headers
+    ).json()["id"]
+    client.post(f"/api/projects/{project_id}/issues/bulk", json={
+        "create": [{"title": title, "priority": priority} for title, priority in titles]
+    }, headers=headers)
+    return project_id
+
+
+def test_ndjson_export_streams_every_matching_issue(client, sql_statements, monkeypatch):
+    from app.export import stream_export
+
+    headers = signup_and_login(client)
+    titles = [(f"Issue {n}", "high" if n % 3 == 0 else "low") for n in range(25)]
+    project_id = make_project(client, headers, titles)
+    first_id = client.get(f"/api/projects/{project_id}/issues?sort=created_at&limit=200", headers=headers).json()["items"][-1]["id"]
+    client.post(f"/api/issues/{first_id}/comments", json={"body": "First!"}, headers=headers)
+
+    # small batches, so the comments lookup runs once per batch
+    monkeypatch.setattr(
+        "app.routes.issues.stream_export",
+        lambda build, fmt, comments, **options: stream_export(build, fmt, comments, batch_size=10, **options),
+    )
+    sql_statements.clear()
+    r = client.get(f"/api/projects/{project_id}/issues/export?include_comments=true", headers=headers)
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/x-ndjson"
+    assert "attachment" in r.headers["content-disposition"]
+    records = [json.loads(line) for line in r.text.splitlines()]
+    assert [record["title"] for record in records] == [title for title, _ in titles]
+    assert records[0]["comments"][0]["body"] == "First!" and records[1]["comments"] == []
+    assert records[0]["reporter_name"] == "Exporter" and records[0]["status"] == "open"
+    assert sum("FROM comments" in statement for statement in sql_statements) == 3
+
+    # same filters as list_issues
+    high = client.get(f"/api/projects/{project_id}/issues/export?priority=high", headers=headers).text.splitlines()
+    assert len(high) == 9 and all(json.loads(line)["priority"] == "high" for line in high)
+    assert "comments" not in json.loads(high[0])
+
+
+def test_csv_export_and_access(client):
+    headers = signup_and_login(client)
+    project_id = make_project(client, headers, [("Comma, quoted \"title\"", "medium"), ("Plain", "low")])
+    r = client.get(f"/api/projects/{project_id}/issues/export?format=csv&q=plain", headers=headers)
+    assert r.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert [row["title"] for row in rows] == ["Plain"] and rows[0]["assignee_id"] == ""
+
+    rows = list(csv.DictReader(io.StringIO(
+        client.get(f"/api/projects/{project_id}/issues/export?format=csv", headers=headers).text
+    )))
+    assert rows[0]["title"] == "Comma, quoted \"title\""
+
+    assert client.get(f"/api/projects/{project_id}/issues/export?format=xml", headers=headers).status_code == 422
+    outsider = signup_and_login(client)
+    assert client.get(f"/api/projects/{project_id}/issues/export", headers=outsider).status_code == 403
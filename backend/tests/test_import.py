@@ -0,0 +1,117 @@
+import json
+import uuid
+
+
+def signup_and_login(client, name="Importer"):
+    email = f"import_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/api/auth/signup", json={"name": name, "email": email, "password": "secret123"})
+    token = client.post("/api/auth/login", json={"email": email, "password": "secret123"}).json()["access_token"]
+    return email, {"Authorization": f"Bearer {token}"}
+
+
+def make_project(client, headers):
+    return client.post(
+        "/api/projects", json={"name": "Import", "key": f"IM{uuid.uuid4().hex[:6]}"}, headers=headers
+    ).json()["id"]
+
+
+def test_ndjson_import_in_batches_with_line_errors(client, sql_statements):
+    email, headers = signup_and_login(client)
+    other_email, _ = signup_and_login(client, "Other")
+    outsider_email, _ = signup_and_login(client, "Outsider")
+    project_id = make_project(client, headers)
+    client.post(f"/api/projects/{project_id}/members", json={"email": other_email}, headers=headers)
+    records = [{"title": f"Imported {n}", "priority": "high" if n % 2 else "low"} for n in range(7)]
+    records[1].update(status="closed", assignee_email=other_email.upper(), created_at="2024-03-01T09:30:00",
+                      comments=[{"body": "Old news", "author_email": other_email}, {"body": "Agreed"}])
+    lines = [json.dumps(record) for record in records]
+    lines[3] = "{not json"
+    lines[4] = json.dumps({"title": "Bad", "priority": "urgent"})
+    lines[5] = json.dumps({"title": "Outsider", "assignee_email": outsider_email})
+    lines.insert(2, "")
+    etag = client.get(f"/api/projects/{project_id}/issues", headers=headers).headers["etag"]
+
+    sql_statements.clear()
+    r = client.post(f"/api/projects/{project_id}/issues/import?batch_size=3",
+                    content="\n".join(lines) + "\n", headers=headers)
+    assert r.status_code == 200
+    report = r.json()
+    assert (report["lines"], report["issues"], report["comments"], report["failed"]) == (7, 4, 2, 3)
+    assert [error["line"] for error in report["errors"]] == [5, 6, 7]
+    assert "priority" in report["errors"][1]["error"]
+    # registered but not a member: the error doesn't tell the two apart
+    assert report["errors"][2]["error"] == "assignee is not a member of this project"
+    # one issue insert per batch that has valid rows, not one per row
+    issue_inserts = [s for s in sql_statements if s.startswith("INSERT INTO issues")]
+    assert len(issue_inserts) <= 4
+
+    items = client.get(f"/api/projects/{project_id}/issues?limit=200", headers=headers).json()["items"]
+    by_title = {item["title"]: item for item in items}
+    assert set(by_title) == {"Imported 0", "Imported 1", "Imported 2", "Imported 6"}
+    old = by_title["Imported 1"]
+    assert old["status"] == "closed" and old["assignee_name"] == "Other" and old["reporter_name"] == "Importer"
+    assert old["created_at"].startswith("2024-03-01T09:30")
+    comments = client.get(f"/api/issues/{old['id']}/comments", headers=headers).json()["items"]
+    assert [(c["body"], c["author_name"]) for c in comments] == [("Old news", "Other"), ("Agreed", "Importer")]
+
+    # counters and the list version follow the import
+    stats = client.get(f"/api/projects/{project_id}/stats", headers=headers).json()
+    assert stats["total"] == 4 and stats["by_status"]["closed"] == 1 and stats["by_priority"]["high"] == 1
+    assert client.get(f"/api/projects/{project_id}/issues", headers={**headers, "If-None-Match": etag}).status_code == 200
+
+
+def test_csv_export_round_trips_through_import(client):
+    _, headers = signup_and_login(client)
+    source = make_project(client, headers)
+    client.post(f"/api/projects/{source}/issues/bulk", json={"create": [
+        {"title": "Comma, \"quoted\"", "description": "two\nlines", "priority": "high"},
+        {"title": "Plain", "priority": "low"},
+    ]}, headers=headers)
+    issue_id = client.get(f"/api/projects/{source}/issues?q=plain", headers=headers).json()["items"][0]["id"]
+    client.post(f"/api/issues/{issue_id}/comments", json={"body": "Carried over"}, headers=headers)
+    exported = client.get(f"/api/projects/{source}/issues/export?format=csv&include_comments=true", headers=headers).text
+
+    target = make_project(client, headers)
+    report = client.post(f"/api/projects/{target}/issues/import?format=csv", content=exported, headers=headers).json()
+    assert (report["issues"], report["comments"], report["failed"]) == (2, 1, 0)
+    again = client.get(f"/api/projects/{target}/issues/export?include_comments=true", headers=headers).text
+    records = {record["title"]: record for record in map(json.loads, again.splitlines())}
+    assert records["Comma, \"quoted\""]["description"] == "two\nlines"
+    assert [c["body"] for c in records["Plain"]["comments"]] == ["Carried over"]
+
+
+def test_ndjson_export_round_trips_people_through_import(client):
+    _, headers = signup_and_login(client)
+    member_email, member = signup_and_login(client, "Member")
+    source = make_project(client, headers)
+    client.post(f"/api/projects/{source}/members", json={"email": member_email}, headers=headers)
+    me = client.get("/api/auth/me", headers=member).json()
+    issue_id = client.post(f"/api/projects/{source}/issues", json={"title": "Filed by member"}, headers=member).json()["id"]
+    client.patch(f"/api/issues/{issue_id}", json={"assignee_id": me["id"]}, headers=headers)
+    client.post(f"/api/issues/{issue_id}/comments", json={"body": "Mine"}, headers=member)
+    exported = client.get(f"/api/projects/{source}/issues/export?include_comments=true", headers=headers).text
+    record = json.loads(exported)
+    assert record["reporter_email"] == record["assignee_email"] == record["comments"][0]["author_email"] == member_email
+
+    # the member isn't in the target yet, so none of the record's people resolve
+    target = make_project(client, headers)
+    url = f"/api/projects/{target}/issues/import"
+    report = client.post(url, content=exported, headers=headers).json()
+    assert report["failed"] == 1 and report["errors"][0]["error"].endswith("is not a member of this project")
+
+    client.post(f"/api/projects/{target}/members", json={"email": member_email}, headers=headers)
+    assert client.post(url, content=exported, headers=headers).json()["issues"] == 1
+    issue = client.get(f"/api/projects/{target}/issues", headers=headers).json()["items"][0]
+    assert issue["reporter_name"] == issue["assignee_name"] == "Member"
+    comments = client.get(f"/api/issues/{issue['id']}/comments", headers=headers).json()["items"]
+    assert [(c["body"], c["author_name"]) for c in comments] == [("Mine", "Member")]
+
+
+def test_import_requires_maintainer(client):
+    _, owner = signup_and_login(client)
+    member_email, member = signup_and_login(client)
+    project_id = make_project(client, owner)
+    client.post(f"/api/projects/{project_id}/members", json={"email": member_email}, headers=owner)
+    body = json.dumps({"title": "Sneaky"})
+    assert client.post(f"/api/projects/{project_id}/issues/import", content=body, headers=member).status_code == 403
+    assert client.post(f"/api/projects/{project_id}/issues/import?format=xml", content=body, headers=owner).status_code == 422
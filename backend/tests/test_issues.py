@@ -0,0 +1,365 @@
+import json
+import uuid
+
+
+def auth_headers(client, name="Issue Tester"):
+    email = f"issues_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/api/auth/signup", json={"name": name, "email": email, "password": "secret123"})
+    token = client.post("/api/auth/login", json={"email": email, "password": "secret123"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def create_project(client, headers):
+    payload = {"name": "Issues Project", "key": f"IP{uuid.uuid4().hex[:6]}"}
+    return client.post("/api/projects", json=payload, headers=headers).json()["id"]
+
+
+def test_keyset_pagination_covers_every_sort_mode(client):
+    headers = auth_headers(client)
+    project_id = create_project(client, headers)
+    priorities = ["low", "medium", "high", "critical", "medium", "high", "low"]
+    for i, priority in enumerate(priorities):
+        r = client.post(
+            f"/api/projects/{project_id}/issues",
+            json={"title": f"Issue {i}", "priority": priority},
+            headers=headers,
+        )
+        assert r.status_code == 201
+    # give a couple of issues a different status so the status sort has ties to break
+    first_id = client.get(f"/api/projects/{project_id}/issues", headers=headers).json()["items"][0]["id"]
+    client.patch(f"/api/issues/{first_id}", json={"status": "closed"}, headers=headers)
+
+    for sort in ["created_at", "updated_at", "priority", "status"]:
+        url = f"/api/projects/{project_id}/issues?sort={sort}"
+        full = client.get(url, headers=headers).json()
+        assert full["next_cursor"] is None
+        expected = [issue["id"] for issue in full["items"]]
+        assert len(expected) == len(priorities)
+
+        seen, cursor = [], None
+        while True:
+            page_url = f"{url}&limit=3" + (f"&cursor={cursor}" if cursor else "")
+            page = client.get(page_url, headers=headers).json()
+            assert len(page["items"]) <= 3
+            seen.extend(issue["id"] for issue in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == expected, sort
+
+
+def test_invalid_cursor_is_rejected(client):
+    headers = auth_headers(client)
+    project_id = create_project(client, headers)
+    r = client.get(f"/api/projects/{project_id}/issues?cursor=not-a-cursor", headers=headers)
+    assert r.status_code == 400
+
+
+def test_issue_endpoints_run_constant_number_of_statements(client, sql_statements):
+    headers = auth_headers(client)
+    project_id = create_project(client, headers)
+    me = client.get("/api/auth/me", headers=headers).json()
+
+    def statements_for(method, url, **kwargs):
+        sql_statements.clear()
+        r = client.request(method, url, headers=headers, **kwargs)
+        assert r.status_code < 300, r.text
+        return len(sql_statements)
+
+    issues_url = f"/api/projects/{project_id}/issues"
+    payload = {"title": "Assigned", "assignee_id": me["id"]}
+    statements_for("POST", issues_url, json=payload)  # warm the membership cache
+    first = statements_for("POST", issues_url, json=payload)
+    small_page = statements_for("GET", issues_url)
+    for _ in range(5):
+        assert statements_for("POST", issues_url, json=payload) == first
+    assert statements_for("GET", issues_url) == small_page
+
+    issue_id = client.get(issues_url, headers=headers).json()["items"][0]["id"]
+    assert statements_for("GET", f"/api/issues/{issue_id}") <= 3
+    assert statements_for("PATCH", f"/api/issues/{issue_id}", json={"status": "in_progress"}) <= 6
+
+
+def test_search_uses_index_ranks_results_and_tracks_changes(client):
+    headers = auth_headers(client)
+    project_id = create_project(client, headers)
+    url = f"/api/projects/{project_id}/issues"
+    for title, description in [
+        ("Login page crashes", "Crash on login when the password is empty"),
+        ("Dark mode", "Add a dark theme; login screen included"),
+        ("Slow export", "CSV export takes minutes"),
+    ]:
+        client.post(url, json={"title": title, "description": description}, headers=headers)
+
+    found = client.get(f"{url}?q=login", headers=headers).json()["items"]
+    assert [issue["title"] for issue in found] == ["Login page crashes", "Dark mode"]
+    page = client.get(f"{url}?q=login&limit=1", headers=headers).json()
+    rest = client.get(f"{url}?q=login&limit=1&cursor={page['next_cursor']}", headers=headers).json()
+    assert [i["title"] for i in page["items"] + rest["items"]] == ["Login page crashes", "Dark mode"]
+    assert rest["next_cursor"] is None
+    # prefix matching, and every term has to match
+    assert [i["title"] for i in client.get(f"{url}?q=exp minutes", headers=headers).json()["items"]] == ["Slow export"]
+
+    # the index follows updates and deletes
+    export_id = client.get(f"{url}?q=export", headers=headers).json()["items"][0]["id"]
+    client.patch(f"/api/issues/{export_id}", json={"title": "Slow download", "description": "takes minutes"}, headers=headers)
+    assert client.get(f"{url}?q=export", headers=headers).json()["items"] == []
+    client.delete(f"/api/issues/{export_id}", headers=headers)
+    assert client.get(f"{url}?q=download", headers=headers).json()["items"] == []
+
+
+def test_search_falls_back_to_like_without_index():
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from app.database import Base
+    from app.models.issue import Issue
+    from app.search import apply_search, search_backend
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        assert search_backend(db) is None
+        query, score = apply_search(db.query(Issue), db, "login")
+        assert score is None
+        assert "LIKE" in str(query.statement.compile(engine)).upper()
+
+
+def test_bulk_operations_report_per_item_results(client, sql_statements):
+    headers = auth_headers(client)
+    project_id = create_project(client, headers)
+    me = client.get("/api/auth/me", headers=headers).json()
+    bulk_url = f"/api/projects/{project_id}/issues/bulk"
+
+    r = client.post(bulk_url, json={"create": [
+        {"title": f"Bulk {i}", "assignee_id": me["id"]} for i in range(3)
+    ] + [{"title": "Bad", "priority": "urgent"}]}, headers=headers)
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert [result["status"] for result in results] == [201, 201, 201, 400]
+    ids = [result["id"] for result in results[:3]]
+    assert results[0]["issue"]["assignee_name"] == me["name"]
+
+    # another project's issue is not found through this one
+    other_id = client.post(
+        f"/api/projects/{create_project(client, headers)}/issues", json={"title": "Elsewhere"}, headers=headers
+    ).json()["id"]
+    r = client.post(bulk_url, json={
+        "update": [
+            {"id": ids[0], "status": "closed", "priority": "high"},
+            {"id": ids[1], "title": "Renamed"},
+            {"id": ids[0], "status": "bogus"},
+            {"id": ids[2], "title": "Doomed"},
+            {"id": other_id, "title": "Hijacked"},
+        ],
+        "delete": [ids[2]],
+    }, headers=headers).json()["results"]
+    assert [(result["op"], result["status"]) for result in r] == [
+        ("update", 200), ("update", 200), ("update", 409), ("update", 409), ("update", 404), ("delete", 204),
+    ]
+    assert r[0]["issue"]["status"] == "closed" and r[0]["issue"]["priority"] == "high"
+    assert r[1]["issue"]["title"] == "Renamed"
+    r = client.post(bulk_url, json={"update": [{"id": ids[1], "status": "bogus"}]}, headers=headers).json()
+    assert r["results"][0]["status"] == 400 and r["results"][0]["detail"] == "Invalid status value"
+    listed = client.get(f"/api/projects/{project_id}/issues", headers=headers).json()["items"]
+    assert sorted(issue["id"] for issue in listed) == ids[:2]
+    assert client.get(f"/api/issues/{other_id}", headers=headers).json()["title"] == "Elsewhere"
+
+    # updates and deletes cost the same number of statements at any batch size
+    load_ids = [result["id"] for result in client.post(bulk_url, json={
+        "create": [{"title": f"Load {i}"} for i in range(60)]
+    }, headers=headers).json()["results"]]
+
+    def statements_for(update_ids, delete_ids):
+        sql_statements.clear()
+        r = client.post(bulk_url, json={
+            "update": [{"id": issue_id, "priority": "low", "title": "Bulk"} for issue_id in update_ids],
+            "delete": delete_ids,
+        }, headers=headers)
+        assert r.status_code == 200
+        return len(sql_statements)
+
+    assert statements_for(load_ids[:40], load_ids[40:50]) == statements_for(load_ids[:2], load_ids[50:51])
+
+
+def test_bulk_status_changes_and_deletes_need_maintainer(client):
+    owner = auth_headers(client, "Owner")
+    project_id = create_project(client, owner)
+    issue_id = client.post(f"/api/projects/{project_id}/issues", json={"title": "Triage me"}, headers=owner).json()["id"]
+    member = auth_headers(client, "Member")
+    member_email = client.get("/api/auth/me", headers=member).json()["email"]
+    client.post(f"/api/projects/{project_id}/members", json={"email": member_email, "role": "member"}, headers=owner)
+
+    r = client.post(f"/api/projects/{project_id}/issues/bulk", json={
+        "create": [{"title": "From member"}],
+        "update": [{"id": issue_id, "status": "closed"}, {"id": issue_id, "priority": "critical"}],
+        "delete": [issue_id],
+    }, headers=member).json()["results"]
+    assert [result["status"] for result in r] == [201, 403, 200, 403]
+    assert r[2]["issue"]["priority"] == "critical"
+
+    outsider = auth_headers(client, "Outsider")
+    assert client.post(f"/api/projects/{project_id}/issues/bulk", json={}, headers=outsider).status_code == 403
+
+
+def test_conditional_get_answers_304_until_something_changes(client, sql_statements):
+    headers = auth_headers(client)
+    project_id = create_project(client, headers)
+    issues_url = f"/api/projects/{project_id}/issues?status=open"
+    issue_id = client.post(f"/api/projects/{project_id}/issues", json={"title": "Cached"}, headers=headers).json()["id"]
+
+    for url in [issues_url, f"/api/issues/{issue_id}", f"/api/issues/{issue_id}/comments"]:
+        first = client.get(url, headers=headers)
+        etag = first.headers["etag"]
+        assert etag.startswith('"') and first.headers["cache-control"] == "private, no-cache"
+        sql_statements.clear()
+        again = client.get(url, headers={**headers, "If-None-Match": etag})
+        assert again.status_code == 304 and again.content == b"" and again.headers["etag"] == etag
+        # revalidating reads version data only, never the payload columns
+        assert not any(
+            "issues.title" in statement or "comments.body" in statement for statement in sql_statements
+        )
+
+    list_etag = client.get(issues_url, headers=headers).headers["etag"]
+    issue_etag = client.get(f"/api/issues/{issue_id}", headers=headers).headers["etag"]
+    comments_etag = client.get(f"/api/issues/{issue_id}/comments", headers=headers).headers["etag"]
+    # a different query string is a different representation
+    assert client.get(issues_url + "&limit=5", headers=headers).headers["etag"] != list_etag
+
+    client.patch(f"/api/issues/{issue_id}", json={"title": "Changed"}, headers=headers)
+    changed = client.get(f"/api/issues/{issue_id}", headers={**headers, "If-None-Match": issue_etag})
+    assert changed.status_code == 200 and changed.json()["title"] == "Changed"
+    assert client.get(issues_url, headers={**headers, "If-None-Match": list_etag}).status_code == 200
+
+    client.post(f"/api/issues/{issue_id}/comments", json={"body": "New"}, headers=headers)
+    assert client.get(
+        f"/api/issues/{issue_id}/comments", headers={**headers, "If-None-Match": comments_etag}
+    ).status_code == 200
+
+    # bulk writes move the version too
+    list_etag = client.get(issues_url, headers=headers).headers["etag"]
+    client.post(f"/api/projects/{project_id}/issues/bulk", json={"create": [{"title": "More"}]}, headers=headers)
+    assert client.get(issues_url, headers={**headers, "If-None-Match": list_etag}).status_code == 200
+
+
+def test_comments_page_by_cursor_and_since_with_joined_authors(client, sql_statements):
+    headers = auth_headers(client, "Commenter")
+    project_id = create_project(client, headers)
+    stamps = [f"2024-05-01T10:00:{second:02d}" for second in (1, 1, 2, 3, 3, 3, 4)]
+    client.post(f"/api/projects/{project_id}/issues/import", content=json.dumps({
+        "title": "Incident", "comments": [{"body": f"c{n}", "created_at": stamp} for n, stamp in enumerate(stamps)]
+    }), headers=headers)
+    issue_id = client.get(f"/api/projects/{project_id}/issues", headers=headers).json()["items"][0]["id"]
+    url = f"/api/issues/{issue_id}/comments"
+
+    full = client.get(url, headers=headers).json()
+    assert [c["body"] for c in full["items"]] == [f"c{n}" for n in range(7)] and full["next_cursor"] is None
+
+    seen, cursor, statements = [], None, []
+    while True:
+        sql_statements.clear()
+        page = client.get(f"{url}?limit=2" + (f"&cursor={cursor}" if cursor else ""), headers=headers).json()
+        statements.append(len(sql_statements))
+        assert all(c["author_name"] == "Commenter" for c in page["items"])
+        seen += [c["body"] for c in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert seen == [c["body"] for c in full["items"]]
+    # authors are joined, not loaded per comment
+    assert len(set(statements)) == 1
+
+    since = client.get(f"{url}?since=2024-05-01T10:00:02Z", headers=headers).json()["items"]
+    assert [c["body"] for c in since] == ["c3", "c4", "c5", "c6"]
+    assert client.get(f"{url}?since=2024-05-01T12:00:02%2B02:00&limit=1", headers=headers).json()["next_cursor"]
+    assert client.get(f"{url}?cursor=bogus", headers=headers).status_code == 400
+
+    # a page's ETag changes only when that page would
+    first_page = client.get(f"{url}?limit=2", headers=headers)
+    client.post(url, json={"body": "latest"}, headers=headers)
+    assert client.get(
+        f"{url}?limit=2", headers={**headers, "If-None-Match": first_page.headers["etag"]}
+    ).status_code == 304
+    assert client.get(
+        f"{url}?since=2024-05-01T10:00:04Z", headers={**headers, "If-None-Match": first_page.headers["etag"]}
+    ).json()["items"][-1]["body"] == "latest"
+
+
+def test_list_issues_pages_are_cached_per_project_version(client, sql_statements):
+    from app.response_cache import issue_list_cache
+
+    headers = auth_headers(client)
+    project_id = create_project(client, headers)
+    url = f"/api/projects/{project_id}/issues?status=open&priority=high"
+    client.post(f"/api/projects/{project_id}/issues", json={"title": "Hot", "priority": "high"}, headers=headers)
+
+    first = client.get(url, headers=headers)
+    hits = issue_list_cache.stats()["hits"]
+    sql_statements.clear()
+    second = client.get(url, headers=headers)
+    assert second.content == first.content and second.headers["etag"] == first.headers["etag"]
+    assert issue_list_cache.stats()["hits"] == hits + 1
+    assert not any("FROM issues" in statement for statement in sql_statements)
+
+    # a write bumps the project's version, so the next read misses and sees it
+    client.post(f"/api/projects/{project_id}/issues", json={"title": "Hotter", "priority": "high"}, headers=headers)
+    titles = [issue["title"] for issue in client.get(url, headers=headers).json()["items"]]
+    assert titles == ["Hotter", "Hot"]
+    assert issue_list_cache.stats()["hits"] == hits + 1
+
+
+def test_sparse_fieldsets_select_only_the_requested_columns(client, sql_statements):
+    headers = auth_headers(client, name="Sparse")
+    project_id = create_project(client, headers)
+    me = client.get("/api/auth/me", headers=headers).json()
+    issues_url = f"/api/projects/{project_id}/issues"
+    for title in ("First", "Second", "Third"):
+        client.post(issues_url, json={"title": title, "description": "long " * 100, "assignee_id": me["id"]}, headers=headers)
+
+    sql_statements.clear()
+    r = client.get(f"{issues_url}?fields=assignee_name,title,id,status&sort=priority&limit=2", headers=headers)
+    assert r.status_code == 200 and b"long" not in r.content
+    page = r.json()
+    assert [list(item) for item in page["items"]] == [["id", "title", "status", "assignee_name"]] * 2
+    assert page["items"][0]["assignee_name"] == "Sparse"
+    # one statement for the page: no description, no reporter join, no lazy loads
+    listing = [s for s in sql_statements if "FROM issues" in s and "issues.title" in s]
+    assert len(listing) == 1
+    assert "issues.description" not in listing[0] and "AS reporter ON" not in listing[0]
+
+    # cursors work the same, and the full page is still the default
+    rest = client.get(f"{issues_url}?fields=id,title,status,assignee_name&sort=priority&limit=2&cursor={page['next_cursor']}", headers=headers).json()
+    assert len(rest["items"]) == 1 and rest["next_cursor"] is None
+    full = client.get(issues_url, headers=headers).json()["items"][0]
+    assert full["description"].startswith("long") and full["reporter_name"] == "Sparse"
+
+    issue_id = page["items"][0]["id"]
+    sparse = client.get(f"/api/issues/{issue_id}?fields=title", headers=headers)
+    assert sparse.json() == {"title": page["items"][0]["title"]}
+    whole = client.get(f"/api/issues/{issue_id}", headers=headers)
+    assert whole.headers["etag"] != sparse.headers["etag"]
+
+    r = client.get(f"{issues_url}?fields=id,secret", headers=headers)
+    assert r.status_code == 400 and "secret" in r.json()["detail"]
+
+    # the schema says which keys a sparse response may leave out
+    paths = client.get("/openapi.json").json()["paths"]
+    for operation in (paths["/api/projects/{project_id}/issues"]["get"], paths["/api/issues/{issue_id}"]["get"]):
+        fields_param = next(p for p in operation["parameters"] if p["name"] == "fields")
+        assert "only the requested keys" in fields_param["description"]
+        assert "only the requested keys" in operation["responses"]["200"]["description"]
+
+
+def test_memory_backend_is_bounded_lru():
+    from app.response_cache import MemoryBackend
+
+    cache = MemoryBackend(max_bytes=30, max_entry_bytes=20)
+    cache.set("a", b"x" * 10)
+    cache.set("b", b"x" * 10)
+    assert cache.get("a") == b"x" * 10  # now b is least recently used
+    cache.set("c", b"x" * 15)
+    assert cache.get("b") is None and cache.get("a") is not None and cache.get("c") is not None
+    cache.set("huge", b"x" * 25)  # larger than one entry may be
+    assert cache.get("huge") is None
+    stats = cache.stats()
+    assert stats["bytes"] == 25 and stats["entries"] == 2 and stats["evictions"] == 1
+    assert stats["hits"] == 3 and stats["misses"] == 2 and stats["hit_rate"] == 0.6
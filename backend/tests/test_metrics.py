@@ -0,0 +1,123 @@
+import re
+import uuid
+
+
+def auth_headers(client):
+    email = f"metrics_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/api/auth/signup", json={"name": "Metered", "email": email, "password": "secret123"})
+    token = client.post("/api/auth/login", json={"email": email, "password": "secret123"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def sample(text, name, **labels):
+    """Value of the series ``name`` whose labels include ``labels``, or None"""
+    for line in text.splitlines():
+        match = re.match(r"^(\w+)(?:\{(.*)\})? (\S+)$", line)
+        if not match or match.group(1) != name:
+            continue
+        found = dict(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', match.group(2) or ""))
+        if all(found.get(key) == value for key, value in labels.items()):
+            return float(match.group(3))
+    return None
+
+
+def test_metrics_cover_routes_sql_and_caches(client):
+    headers = auth_headers(client)
+    project_id = client.post("/api/projects", json={"name": "M", "key": f"MT{uuid.uuid4().hex[:6]}"}, headers=headers).json()["id"]
+    issue_id = client.post(f"/api/projects/{project_id}/issues", json={"title": "Measured"}, headers=headers).json()["id"]
+    for _ in range(3):
+        client.get(f"/api/issues/{issue_id}", headers=headers)
+    client.get(f"/api/projects/{project_id}/issues", headers=headers)
+    client.get(f"/api/projects/{project_id}/issues", headers=headers)
+    client.get("/api/issues/999999999", headers=headers)
+    client.get(f"/no/such/path/{uuid.uuid4().hex}")
+
+    r = client.get("/metrics")
+    assert r.status_code == 200 and r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = r.text
+
+    route = {"method": "GET", "route": "/api/issues/{issue_id}"}
+    assert sample(text, "issuehub_http_request_duration_seconds_count", status="200", **route) >= 3
+    assert sample(text, "issuehub_http_request_duration_seconds_count", status="404", **route) >= 1
+    assert sample(text, "issuehub_http_request_duration_seconds_bucket", status="200", le="+Inf", **route) >= 3
+    # route templates, not raw paths, so ids don't multiply the series
+    assert f"/api/issues/{issue_id}\"" not in text and "/no/such/path" not in text
+    assert sample(text, "issuehub_http_request_duration_seconds_count", route="<unmatched>") >= 1
+
+    # the issue read runs a fixed handful of statements
+    statements = sample(text, "issuehub_http_request_sql_statements_sum", **route)
+    reads = sample(text, "issuehub_http_request_sql_statements_count", **route)
+    assert 0 < statements / reads <= 6
+    assert sample(text, "issuehub_http_request_sql_seconds_count", **route) == reads
+    assert sample(text, "issuehub_sql_statement_duration_seconds_count") >= statements
+
+    # this scrape is itself in flight
+    assert sample(text, "issuehub_http_requests_in_flight") == 1
+    assert sample(text, "issuehub_cache_hits_total", cache="issue_list") >= 1
+    assert 0 < sample(text, "issuehub_cache_hit_ratio", cache="issue_list") <= 1
+    assert sample(text, "issuehub_db_pool_connections", state="size") is not None
+    assert sample(text, "issuehub_event_subscribers") == 0
+
+
+def test_timed_pool_records_checkout_wait(tmp_path):
+    from sqlalchemy import create_engine, text
+    from app.metrics import POOL_CHECKOUT_WAIT, TimedQueuePool, registry
+
+    def checkouts():
+        return sample(registry.render(), "issuehub_db_pool_checkout_wait_seconds_count") or 0
+
+    before = checkouts()
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=TimedQueuePool, pool_size=1, max_overflow=0)
+    for _ in range(3):
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    engine.dispose()
+    assert checkouts() == before + 3
+    assert POOL_CHECKOUT_WAIT.buckets[0] > 0
+
+
+def test_histogram_renders_cumulative_buckets():
+    from app.metrics import Histogram
+
+    histogram = Histogram("demo_seconds", "Demo.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, 'a"b')
+    lines = histogram.render()
+    assert lines[:2] == ["# HELP demo_seconds Demo.", "# TYPE demo_seconds histogram"]
+    assert lines[2:] == [
+        'demo_seconds_bucket{route="a\\"b",le="0.1"} 2',
+        'demo_seconds_bucket{route="a\\"b",le="1.0"} 3',
+        'demo_seconds_bucket{route="a\\"b",le="+Inf"} 4',
+        'demo_seconds_sum{route="a\\"b"} 3.65',
+        'demo_seconds_count{route="a\\"b"} 4',
+    ]
+
+
+def test_failed_statements_leave_nothing_on_the_connection():
+    import pytest
+    from sqlalchemy import create_engine, exc, text
+
+    from app.metrics import SQL_STATEMENT_SECONDS, install_sql_events
+
+    install_sql_events()
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        for _ in range(5):
+            with pytest.raises(exc.OperationalError):
+                conn.execute(text("SELECT * FROM no_such_table"))
+        before = SQL_STATEMENT_SECONDS.render()
+        conn.execute(text("SELECT 1"))
+        assert SQL_STATEMENT_SECONDS.render() != before
+        assert not [key for key in conn.connection.info if "started" in key]
+    engine.dispose()
+
+
+def test_collected_metrics_render_their_samples():
+    import pytest
+    from app.metrics import Collected, Metric
+
+    with pytest.raises(TypeError):
+        Metric("issuehub_untyped", "No render.")
+    gauge = Collected("gauge", "issuehub_things", "Things.", ("kind",))
+    assert gauge.render() == ["# HELP issuehub_things Things.", "# TYPE issuehub_things gauge"]
+    assert gauge.render([(("a",), 2)])[-1] == 'issuehub_things{kind="a"} 2'
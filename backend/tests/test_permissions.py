@@ -0,0 +1,81 @@
+import uuid
+
+from app.auth.permissions import membership_cache
+
+
+def signup_and_login(client):
+    email = f"perm_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/api/auth/signup", json={"name": "Perm", "email": email, "password": "secret123"})
+    token = client.post("/api/auth/login", json={"email": email, "password": "secret123"}).json()["access_token"]
+    return email, {"Authorization": f"Bearer {token}"}
+
+
+def test_membership_cache_hits_and_invalidation(client, sql_statements):
+    _, owner = signup_and_login(client)
+    other_email, other = signup_and_login(client)
+    project_id = client.post(
+        "/api/projects", json={"name": "Perm", "key": f"PM{uuid.uuid4().hex[:6]}"}, headers=owner
+    ).json()["id"]
+    issues_url = f"/api/projects/{project_id}/issues"
+
+    # not a member yet; denials are not cached
+    assert client.get(issues_url, headers=other).status_code == 403
+
+    client.get(issues_url, headers=owner)
+    before = membership_cache.stats()
+    sql_statements.clear()
+    assert client.get(issues_url, headers=owner).status_code == 200
+    assert membership_cache.stats()["hits"] == before["hits"] + 1
+    assert not any("project_members" in s for s in sql_statements)
+
+    r = client.post(f"/api/projects/{project_id}/members", json={"email": other_email}, headers=owner)
+    assert r.status_code == 201
+    assert client.get(issues_url, headers=other).status_code == 200
+
+
+def test_role_change_invalidates_cached_membership(client, db_session):
+    from app.models.project_member import ProjectMember, MemberRole
+
+    _, owner = signup_and_login(client)
+    me = client.get("/api/auth/me", headers=owner).json()
+    project_id = client.post(
+        "/api/projects", json={"name": "Perm", "key": f"PR{uuid.uuid4().hex[:6]}"}, headers=owner
+    ).json()["id"]
+    issue_id = client.post(
+        f"/api/projects/{project_id}/issues", json={"title": "Demoted"}, headers=owner
+    ).json()["id"]
+    assert membership_cache.get((me["id"], project_id)) == MemberRole.MAINTAINER
+
+    membership = db_session.query(ProjectMember).filter_by(project_id=project_id, user_id=me["id"]).one()
+    membership.role = MemberRole.MEMBER
+    db_session.commit()
+    assert membership_cache.get((me["id"], project_id)) is None
+    assert client.delete(f"/api/issues/{issue_id}", headers=owner).status_code == 403
+
+
+def test_membership_changes_are_invalidated_again_at_commit(client, db_session):
+    from app.models.project_member import ProjectMember, MemberRole
+
+    _, owner = signup_and_login(client)
+    me = client.get("/api/auth/me", headers=owner).json()
+    project_id = client.post(
+        "/api/projects", json={"name": "Perm", "key": f"PW{uuid.uuid4().hex[:6]}"}, headers=owner
+    ).json()["id"]
+    issues_url = f"/api/projects/{project_id}/issues"
+    issue_id = client.post(issues_url, json={"title": "Raced"}, headers=owner).json()["id"]
+
+    membership = db_session.query(ProjectMember).filter_by(project_id=project_id, user_id=me["id"]).one()
+    membership.role = MemberRole.MEMBER
+    db_session.flush()
+    # a request between the flush and the commit still reads, and caches, the old role
+    assert client.get(issues_url, headers=owner).status_code == 200
+    assert membership_cache.get((me["id"], project_id)) == MemberRole.MAINTAINER
+    db_session.commit()
+    assert membership_cache.get((me["id"], project_id)) is None
+    assert client.delete(f"/api/issues/{issue_id}", headers=owner).status_code == 403
+
+    db_session.delete(membership)
+    db_session.flush()
+    assert client.get(issues_url, headers=owner).status_code == 200
+    db_session.commit()
+    assert client.get(issues_url, headers=owner).status_code == 403
@@ -0,0 +1,67 @@
+import re
+import uuid
+
+import pytest
+
+
+TABLES = ("issues", "comments", "project_members", "projects", "users")
+FULL_SCAN = re.compile(r"\bSCAN (%s)\b(?!_)" % "|".join(TABLES))
+
+
+def test_hot_queries_use_indexes(client, db_session):
+    engine = db_session.get_bind()
+    if engine.dialect.name != "sqlite":
+        pytest.skip("EXPLAIN QUERY PLAN check is SQLite-specific")
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            captured.append((statement, parameters))
+
+    from sqlalchemy import event
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        email = f"plans_{uuid.uuid4().hex[:8]}@example.com"
+        client.post("/api/auth/signup", json={"name": "Plans", "email": email, "password": "secret123"})
+        token = client.post("/api/auth/login", json={"email": email, "password": "secret123"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        me = client.get("/api/auth/me", headers=headers).json()
+
+        project_id = client.post(
+            "/api/projects", json={"name": "Plans", "key": f"PL{uuid.uuid4().hex[:6]}"}, headers=headers
+        ).json()["id"]
+        client.get("/api/projects", headers=headers)
+        issues_url = f"/api/projects/{project_id}/issues"
+        for i in range(3):
+            client.post(issues_url, json={"title": f"Plan {i}", "assignee_id": me["id"]}, headers=headers)
+
+        for params in [
+            "", "?sort=updated_at", "?sort=priority", "?sort=status",
+            "?status=open", "?priority=medium", f"?assignee={me['id']}", "?q=plan",
+        ]:
+            page = client.get(issues_url + params + ("&" if params else "?") + "limit=2", headers=headers).json()
+            client.get(issues_url + params + ("&" if params else "?") + f"limit=2&cursor={page['next_cursor']}", headers=headers)
+
+        issue_id = page["items"][0]["id"]
+        client.get(f"/api/issues/{issue_id}", headers=headers)
+        client.patch(f"/api/issues/{issue_id}", json={"status": "closed"}, headers=headers)
+        for body in ("hi", "again"):
+            client.post(f"/api/issues/{issue_id}/comments", json={"body": body}, headers=headers)
+        comments = client.get(f"/api/issues/{issue_id}/comments?limit=1", headers=headers).json()
+        assert client.get(
+            f"/api/issues/{issue_id}/comments?since=2024-01-01T00:00:00&cursor={comments['next_cursor']}", headers=headers
+        ).json()["items"][0]["body"] == "again"
+        client.delete(f"/api/issues/{issue_id}", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert captured
+    offenders = []
+    with engine.connect() as connection:
+        for statement, parameters in captured:
+            plan = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+            details = [row[-1] for row in plan]
+            if any(FULL_SCAN.search(detail) for detail in details):
+                offenders.append((statement, details))
+    assert not offenders, offenders
@@ -0,0 +1,138 @@
+import json
+import shutil
+import time
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+
+def signup(client, name):
+    email = f"{name}_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/api/auth/signup", json={"name": name, "email": email, "password": "secret123"})
+    token = client.post("/api/auth/login", json={"email": email, "password": "secret123"}).json()["access_token"]
+    return email, {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture()
+def replica(client, db_session, tmp_path, monkeypatch):
+    """Route reads to a snapshot of the test database, which never catches up"""
+    from app import database
+    from app.main import app
+    from app.replicas import Replica, ReplicaSet
+
+    def snapshot():
+        path = tmp_path / "replica.db"
+        shutil.copyfile(db_session.get_bind().url.database, path)
+        engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+        replicas = ReplicaSet([Replica(str(engine.url), sessionmaker(bind=engine, autoflush=False))],
+                              sticky_seconds=60)
+        monkeypatch.setattr(database, "read_replicas", replicas)
+        monkeypatch.delitem(app.dependency_overrides, database.get_db)
+        engines.append(engine)
+        return replicas
+
+    engines = []
+    yield snapshot
+    for engine in engines:
+        engine.dispose()
+
+
+def test_reads_go_to_the_replica_except_right_after_a_write(client, replica):
+    _, writer = signup(client, "writer")
+    reader_email, reader = signup(client, "reader")
+    project_id = client.post("/api/projects", json={"name": "R", "key": f"RR{uuid.uuid4().hex[:6]}"}, headers=writer).json()["id"]
+    client.post(f"/api/projects/{project_id}/members", json={"email": reader_email}, headers=writer)
+    replicated = client.post(f"/api/projects/{project_id}/issues", json={"title": "replicated"}, headers=writer).json()["id"]
+
+    replicas = replica()
+    fresh = client.post(f"/api/projects/{project_id}/issues", json={"title": "fresh"}, headers=writer).json()["id"]
+
+    # the writer reads its own write from the primary
+    assert client.get(f"/api/issues/{fresh}", headers=writer).status_code == 200
+    # anyone else reads from the replica, which hasn't caught up
+    assert client.get(f"/api/issues/{replicated}", headers=reader).status_code == 200
+    assert client.get(f"/api/issues/{fresh}", headers=reader).status_code == 404
+    titles = [i["title"] for i in client.get(f"/api/projects/{project_id}/issues", headers=reader).json()["items"]]
+    assert titles == ["replicated"]
+    assert replicas.stats()["in_use"] == {replicas.replicas[0].url: 0}
+
+    # once the sticky window is over, the writer reads from the replica too
+    replicas.sticky.clear()
+    assert client.get(f"/api/issues/{fresh}", headers=writer).status_code == 404
+
+
+def test_exports_stream_from_the_replica(client, replica):
+    _, writer = signup(client, "exporter")
+    project_id = client.post("/api/projects", json={"name": "X", "key": f"RX{uuid.uuid4().hex[:6]}"}, headers=writer).json()["id"]
+    client.post(f"/api/projects/{project_id}/issues", json={"title": "replicated"}, headers=writer)
+
+    replicas = replica()
+    client.post(f"/api/projects/{project_id}/issues", json={"title": "fresh"}, headers=writer)
+
+    def exported():
+        r = client.get(f"/api/projects/{project_id}/issues/export", headers=writer)
+        return [json.loads(line)["title"] for line in r.text.splitlines()]
+
+    assert exported() == ["replicated", "fresh"]
+    replicas.sticky.clear()
+    assert exported() == ["replicated"]
+    assert replicas.stats()["in_use"] == {replicas.replicas[0].url: 0}
+
+
+def test_replica_strategies():
+    from app.replicas import Replica, ReplicaSet
+
+    replicas = [Replica(f"sqlite:///r{n}.db", None) for n in range(3)]
+    round_robin = ReplicaSet(replicas)
+    picked = [round_robin.choose("GET", None) for _ in range(4)]
+    assert [replicas.index(r) for r in picked] == [0, 1, 2, 0]
+    for r in picked:
+        round_robin.release(r)
+
+    least_busy = ReplicaSet(replicas, "least_busy")
+    first, second = least_busy.choose("GET", "a"), least_busy.choose("HEAD", "b")
+    assert first is not second
+    least_busy.release(first)
+    assert least_busy.choose("GET", "c") is first
+
+    assert least_busy.choose("POST", "a") is None
+    assert least_busy.choose("GET", "a") is None  # sticky after its write
+
+
+def test_the_sticky_window_restarts_when_a_write_finishes():
+    from app.replicas import Replica, ReplicaSet
+
+    replicas = ReplicaSet([Replica("sqlite:///r.db", None)], sticky_seconds=0.05)
+    assert replicas.choose("PATCH", "slow") is None
+    time.sleep(0.06)  # the write took the whole window
+    replicas.finished("PATCH", "slow")
+    replicas.finished("GET", "reader")
+    assert replicas.choose("GET", "slow") is None
+    assert replicas.choose("GET", "reader") is not None
+    with pytest.raises(ValueError):
+        ReplicaSet(replicas, "random")
+
+
+def test_release_db_frees_the_replica_slot(monkeypatch):
+    import asyncio
+
+    from starlette.requests import Request
+
+    from app import database
+    from app.replicas import Replica, ReplicaSet
+
+    engine = create_engine("sqlite://")
+    replicas = ReplicaSet([Replica("sqlite://", sessionmaker(bind=engine))])
+    monkeypatch.setattr(database, "read_replicas", replicas)
+
+    dependency = database.get_db(Request({"type": "http", "method": "GET", "headers": []}))
+    db = next(dependency)
+    assert replicas.stats()["in_use"] == {"sqlite://": 1}
+    # an event stream lets go of its session before it starts streaming
+    asyncio.run(database.release_db(db))
+    assert replicas.stats()["in_use"] == {"sqlite://": 0}
+    dependency.close()
+    assert replicas.stats()["in_use"] == {"sqlite://": 0}
+    engine.dispose()
@@ -0,0 +1,49 @@
+import json
+import uuid
+from datetime import datetime, timezone
+
+
+def auth_headers(client):
+    email = f"resp_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/api/auth/signup", json={"name": "Encoded", "email": email, "password": "secret123"})
+    token = client.post("/api/auth/login", json={"email": email, "password": "secret123"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_fast_path_encodes_like_the_response_model():
+    from app.bench.encoding import encoders, make_rows
+    from app.models.issue import IssueStatus
+    from app.responses import dumps
+
+    paths = encoders(make_rows(50))
+    expected = json.loads(paths["response_model"]())
+    assert json.loads(paths["fast"]()) == json.loads(paths["model_dump_json"]()) == expected
+    assert dumps({"at": datetime(2024, 1, 1, tzinfo=timezone.utc), "status": IssueStatus.OPEN}) == (
+        b'{"at":"2024-01-01T00:00:00Z","status":"open"}'
+    )
+
+
+def test_issue_routes_return_the_documented_shapes(client):
+    from app.schemas.comment import CommentResponse
+    from app.schemas.issue import IssueBulkResponse, IssueResponse
+
+    headers = auth_headers(client)
+    project_id = client.post("/api/projects", json={"name": "E", "key": f"EN{uuid.uuid4().hex[:6]}"}, headers=headers).json()["id"]
+
+    r = client.post(f"/api/projects/{project_id}/issues", json={"title": "Encoded"}, headers=headers)
+    assert r.status_code == 201 and r.headers["content-type"] == "application/json"
+    issue = IssueResponse.model_validate(r.json())
+    assert client.get(f"/api/issues/{issue.id}", headers=headers).json() == r.json()
+
+    r = client.post(f"/api/projects/{project_id}/issues/bulk", json={"delete": [issue.id]}, headers=headers)
+    assert r.json()["results"][0]["issue"] is None
+    assert IssueBulkResponse.model_validate(r.json()).model_dump(mode="json") == r.json()
+
+    issue_id = client.post(f"/api/projects/{project_id}/issues", json={"title": "Again"}, headers=headers).json()["id"]
+    r = client.post(f"/api/issues/{issue_id}/comments", json={"body": "hi"}, headers=headers)
+    assert r.status_code == 201 and CommentResponse.model_validate(r.json()).author_name == "Encoded"
+
+    # the routes still document their models
+    paths = client.get("/openapi.json").json()["paths"]
+    schema = paths["/api/issues/{issue_id}"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert schema == {"$ref": "#/components/schemas/IssueResponse"}
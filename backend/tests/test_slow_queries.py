@@ -0,0 +1,106 @@
+import json
+import logging
+import uuid
+
+import pytest
+
+
+def auth_headers(client):
+    email = f"slow_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/api/auth/signup", json={"name": "Slow", "email": email, "password": "secret123"})
+    token = client.post("/api/auth/login", json={"email": email, "password": "secret123"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture()
+def slow_log(monkeypatch, caplog):
+    """Treat every statement as slow and collect the JSON log entries"""
+    from app.slow_queries import slow_query_log
+
+    monkeypatch.setattr(slow_query_log, "threshold", 0.0)
+    monkeypatch.setattr(slow_query_log, "_seen", type(slow_query_log._seen)())
+    caplog.set_level(logging.WARNING, logger="app.slow_queries")
+
+    def entries():
+        return [json.loads(r.getMessage()) for r in caplog.records if r.name == "app.slow_queries"]
+    return slow_query_log, entries
+
+
+def test_slow_statements_are_logged_with_route_plan_and_redacted_parameters(client, slow_log):
+    log, entries = slow_log
+    headers = auth_headers(client)
+    project_id = client.post("/api/projects", json={"name": "S", "key": f"SQ{uuid.uuid4().hex[:6]}"}, headers=headers).json()["id"]
+    client.post(f"/api/projects/{project_id}/issues", json={"title": "secret title"}, headers=headers)
+
+    client.get(f"/api/projects/{project_id}/issues?status=open", headers=headers)
+    listing = [
+        e for e in entries()
+        if (e["method"], e["route"]) == ("GET", "/api/projects/{project_id}/issues")
+        and e["statement"].startswith("SELECT issues.")
+    ]
+    assert listing, entries()
+    entry = listing[0]
+    assert entry["event"] == "slow_query" and entry["duration_ms"] >= 0 and entry["executemany"] is False
+    assert "WHERE issues.project_id = ? AND issues.status = ?" in entry["statement"]
+    assert set(entry["parameters"]) == {"<int>", "<str>"}
+    assert entry["plan"] and any("issues" in line for line in entry["plan"])
+    # insert values stay redacted too
+    inserts = [e for e in entries() if e["statement"].startswith("INSERT INTO issues")]
+    assert inserts and "secret title" not in json.dumps(inserts)
+
+    # the same statement again inside the interval is counted, not logged
+    before = len(entries())
+    client.get(f"/api/projects/{project_id}/issues?status=closed", headers=headers)
+    repeated = [e for e in entries()[before:] if e["statement"] == entry["statement"]]
+    assert repeated == []
+    log._seen[entry["statement"]][0] -= log.interval
+    client.get(f"/api/projects/{project_id}/issues?status=resolved", headers=headers)
+    again = [e for e in entries()[before:] if e["statement"] == entry["statement"]]
+    assert len(again) == 1 and again[0]["suppressed"] == 1
+
+
+def test_parameters_can_be_logged_and_explain_failures_are_contained(client, slow_log, monkeypatch):
+    log, entries = slow_log
+    monkeypatch.setattr(log, "redact", False)
+    headers = auth_headers(client)
+    project_id = client.post("/api/projects", json={"name": "S", "key": f"SQ{uuid.uuid4().hex[:6]}"}, headers=headers).json()["id"]
+    client.post(f"/api/projects/{project_id}/issues", json={"title": "visible title"}, headers=headers)
+    assert any("visible title" in json.dumps(e["parameters"]) for e in entries())
+
+    monkeypatch.setattr("app.slow_queries.EXPLAINABLE", __import__("re").compile(r"^"))
+    monkeypatch.setattr(log, "_seen", type(log._seen)())
+    r = client.get(f"/api/projects/{project_id}/issues", headers=headers)
+    assert r.status_code == 200 and len(r.json()["items"]) == 1
+    # explaining the insert didn't run it a second time
+    assert client.get(f"/api/projects/{project_id}/stats", headers=headers).json()["total"] == 1
+
+
+def test_normalize_collapses_literals_placeholders_and_in_lists():
+    from app.slow_queries import normalize
+
+    assert normalize(
+        "SELECT t.id\n  FROM t WHERE t.name = 'o''brien' AND t.id IN (?, ?, ?) AND t.n > 10 AND t.k = %(k_1)s"
+    ) == "SELECT t.id FROM t WHERE t.name = ? AND t.id IN (?, ...) AND t.n > ? AND t.k = ?"
+
+
+def test_failed_statements_leave_nothing_behind_and_share_the_metrics_timer(slow_log):
+    from sqlalchemy import create_engine, event, exc, text
+    from sqlalchemy.engine import Engine
+
+    from app import metrics, slow_queries, statement_timer
+
+    log, entries = slow_log
+    slow_queries.install()
+    metrics.install_sql_events()
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        for _ in range(5):
+            with pytest.raises(exc.OperationalError):
+                conn.execute(text("SELECT * FROM no_such_table"))
+        conn.execute(text("SELECT 42"))
+        assert dict(conn.connection.info) == {}
+    engine.dispose()
+    assert [entry["statement"] for entry in entries()] == ["SELECT ?"]
+    # one pair of cursor events, however many observers
+    assert len(statement_timer._observers) == 2
+    assert event.contains(Engine, "before_cursor_execute", statement_timer._before_cursor_execute)
@@ -0,0 +1,39 @@
+import argparse
+
+from sqlalchemy import text
+
+
+def test_profile_applies_only_to_sqlite_files_when_enabled(monkeypatch):
+    from app import sqlite_profile
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "sqlite_profile", False)
+    assert not sqlite_profile.applies_to("sqlite:///./issuehub.db")
+    monkeypatch.setattr(settings, "sqlite_profile", True)
+    assert sqlite_profile.applies_to("sqlite:///./issuehub.db")
+    assert sqlite_profile.applies_to("sqlite+aiosqlite:///./issuehub.db")
+    assert not sqlite_profile.applies_to("sqlite://")
+    assert not sqlite_profile.applies_to("sqlite:///:memory:")
+    assert not sqlite_profile.applies_to("postgresql://u:p@localhost/issuehub")
+
+
+def test_profiled_engine_sets_pragmas_and_survives_concurrent_writes(tmp_path):
+    from app.bench.dataset import build_dataset
+    from app.bench.sqlite import _targets, make_engine, run_workload
+
+    engine = make_engine(str(tmp_path / "profiled.db"), profiled=True)
+    assert engine.pool.size() > 0 and engine.pool._max_overflow == 0
+    with engine.connect() as connection:
+        pragma = lambda name: connection.execute(text(f"PRAGMA {name}")).scalar()
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("busy_timeout") >= 1000
+        assert pragma("cache_size") < 0 and pragma("mmap_size") > 0
+        assert pragma("foreign_keys") == 1
+
+    build_dataset(engine, users=3, projects=1, issues=50, comments_per_issue=1)
+    args = argparse.Namespace(threads=8, seconds=0.5, write_ratio=0.5, seed=0)
+    report = run_workload(engine, _targets(engine), args)
+    engine.dispose()
+    assert report["errors"] == {"locked": 0, "other": 0}
+    assert report["read"]["count"] > 0 and report["write"]["count"] > 0
@@ -0,0 +1,23 @@
+from app.bench.startup import APP_IMPORT_BUDGET_MS, COLD_START_BUDGET_MS, measure, parse_importtime
+
+
+def test_parse_importtime():
+    modules = parse_importtime(
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       241 |        241 |       app.serializers\n"
+        "import time:     41504 |    1643559 | app.main\n"
+    )
+    assert modules == [
+        {"module": "app.serializers", "self_ms": 0.24, "cumulative_ms": 0.24, "depth": 3},
+        {"module": "app.main", "self_ms": 41.5, "cumulative_ms": 1643.56, "depth": 0},
+    ]
+
+
+def test_cold_start_is_within_budget():
+    report = measure(top=10)
+    assert report["cold_start_ms"] <= COLD_START_BUDGET_MS, report["slowest_modules"]
+    assert report["app_import_ms"] <= APP_IMPORT_BUDGET_MS, report["app_modules"]
+    assert report["within_budget"]
+    # the password hash backend is probed on first use, not at import
+    assert report["deferred"]["password_context_built_at_startup"] is False
+    assert any(m["module"] == "app.routes.issues" for m in report["app_modules"])
@@ -0,0 +1,100 @@
+import uuid
+
+from sqlalchemy import update
+
+from app.issue_stats import reconcile
+from app.models.project_issue_stats import ProjectIssueStats
+
+
+def signup_and_login(client):
+    email = f"stats_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/api/auth/signup", json={"name": "Stats", "email": email, "password": "secret123"})
+    token = client.post("/api/auth/login", json={"email": email, "password": "secret123"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_counters_follow_every_kind_of_issue_write(client, sql_statements):
+    headers = signup_and_login(client)
+    project_id = client.post(
+        "/api/projects", json={"name": "Stats", "key": f"ST{uuid.uuid4().hex[:6]}"}, headers=headers
+    ).json()["id"]
+    stats_url = f"/api/projects/{project_id}/stats"
+    assert client.get(stats_url, headers=headers).json()["total"] == 0
+
+    issues_url = f"/api/projects/{project_id}/issues"
+    first = client.post(issues_url, json={"title": "A", "priority": "high"}, headers=headers).json()["id"]
+    second = client.post(issues_url, json={"title": "B"}, headers=headers).json()["id"]
+    client.patch(f"/api/issues/{first}", json={"status": "closed", "priority": "low"}, headers=headers)
+    client.delete(f"/api/issues/{second}", headers=headers)
+    client.post(f"{issues_url}/bulk", json={
+        "create": [{"title": "C", "priority": "critical"}, {"title": "D"}],
+        "update": [{"id": first, "status": "resolved"}],
+    }, headers=headers)
+
+    sql_statements.clear()
+    stats = client.get(stats_url, headers=headers).json()
+    assert stats == {
+        "project_id": project_id,
+        "total": 3,
+        "by_status": {"open": 2, "in_progress": 0, "resolved": 1, "closed": 0},
+        "by_priority": {"low": 1, "medium": 1, "high": 0, "critical": 1},
+    }
+    assert sum("project_issue_stats" in statement for statement in sql_statements) == 1
+
+    # the issue list agrees with the counters
+    items = client.get(issues_url, headers=headers).json()["items"]
+    assert len(items) == stats["total"]
+    assert sum(issue["status"] == "open" for issue in items) == stats["by_status"]["open"]
+
+
+def test_reconcile_reports_and_repairs_drift(client, db_session):
+    import app.database as app_db
+
+    headers = signup_and_login(client)
+    project_id = client.post(
+        "/api/projects", json={"name": "Drift", "key": f"DR{uuid.uuid4().hex[:6]}"}, headers=headers
+    ).json()["id"]
+    client.post(f"/api/projects/{project_id}/issues", json={"title": "Counted"}, headers=headers)
+    assert project_id not in reconcile(app_db.engine, fix=False)["drift"]
+
+    db_session.execute(
+        update(ProjectIssueStats).where(ProjectIssueStats.project_id == project_id).values(status_open=5)
+    )
+    db_session.commit()
+    report = reconcile(app_db.engine, fix=False)
+    assert report["drift"][project_id] == {"status_open": {"stored": 5, "actual": 1}}
+
+    reconcile(app_db.engine)
+    assert project_id not in reconcile(app_db.engine, fix=False)["drift"]
+    assert client.get(f"/api/projects/{project_id}/stats", headers=headers).json()["by_status"]["open"] == 1
+
+
+def test_projects_created_outside_create_project_get_counters_on_first_write(client, db_session):
+    import app.database as app_db
+    from app.models.issue import Issue, IssuePriority, IssueStatus
+    from app.models.project import Project
+    from app.models.project_member import MemberRole, ProjectMember
+    from app.models.user import User
+
+    headers = signup_and_login(client)
+    user_id = client.get("/api/auth/me", headers=headers).json()["id"]
+    # as app/seed.py does it: plain ORM objects, no counters row
+    project = Project(name="Seeded", key=f"SD{uuid.uuid4().hex[:6]}")
+    db_session.add(project)
+    db_session.flush()
+    db_session.add(ProjectMember(project_id=project.id, user_id=user_id, role=MemberRole.MAINTAINER))
+    db_session.add_all([
+        Issue(project_id=project.id, title=f"Seeded {n}", status=IssueStatus.OPEN,
+              priority=IssuePriority.HIGH, reporter_id=user_id)
+        for n in range(3)
+    ])
+    db_session.commit()
+    stats_url = f"/api/projects/{project.id}/stats"
+
+    issue_id = client.post(f"/api/projects/{project.id}/issues", json={"title": "New"}, headers=headers).json()["id"]
+    stats = client.get(stats_url, headers=headers).json()
+    assert stats["total"] == 4 and stats["by_priority"]["high"] == 3 and stats["by_priority"]["medium"] == 1
+
+    client.delete(f"/api/issues/{issue_id}", headers=headers)
+    assert client.get(stats_url, headers=headers).json()["total"] == 3
+    assert project.id not in reconcile(app_db.engine, fix=False)["drift"]
@@ -12,6 +12,8 @@ export default function IssueDetail() {
     const navigate = useNavigate();
     const [issue, setIssue] = useState(null);
     const [comments, setComments] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [loading, setLoading] = useState(true);
     const [commentBody, setCommentBody] = useState('');
     const [submitting, setSubmitting] = useState(false);
@@ -34,7 +36,8 @@ export default function IssueDetail() {
         const fetchComments = async () => {
             try {
                 const response = await api.get(`/issues/${issueId}/comments`);
-                setComments(response.data);
+                setComments(response.data.items);
+                setNextCursor(response.data.next_cursor);
             } catch (error) {
                 console.error('Failed to load comments');
             }
@@ -50,11 +53,13 @@ export default function IssueDetail() {
 
         setSubmitting(true);
         try {
-            await api.post(`/issues/${issueId}/comments`, { body: commentBody });
+            const response = await api.post(`/issues/${issueId}/comments`, { body: commentBody });
             setCommentBody('');
             toast.success('Comment added');
-            const response = await api.get(`/issues/${issueId}/comments`);
-            setComments(response.data);
+            // With older pages still to load, the new comment turns up at the end of them
+            if (!nextCursor) {
+                setComments((current) => [...current, response.data]);
+            }
         } catch (error) {
             toast.error('Failed to add comment');
         } finally {
@@ -62,6 +67,19 @@ export default function IssueDetail() {
         }
     };
 
+    const loadMoreComments = async () => {
+        setLoadingMore(true);
+        try {
+            const response = await api.get(`/issues/${issueId}/comments?cursor=${nextCursor}`);
+            setComments((current) => [...current, ...response.data.items]);
+            setNextCursor(response.data.next_cursor);
+        } catch (error) {
+            toast.error('Failed to load comments');
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const handleUpdateStatus = async (newStatus) => {
         try {
             await api.patch(`/issues/${issueId}`, { status: newStatus });
@@ -131,7 +149,7 @@ export default function IssueDetail() {
 
                         {/* Comments */}
                         <div className="card">
-                            <h2 className="text-xl font-semibold mb-4">Comments ({comments.length})</h2>
+                            <h2 className="text-xl font-semibold mb-4">Comments ({comments.length}{nextCursor ? '+' : ''})</h2>
 
                             <div className="space-y-4 mb-6">
                                 {comments.map((comment) => (
@@ -147,6 +165,14 @@ export default function IssueDetail() {
                                 ))}
                             </div>
 
+                            {nextCursor && (
+                                <div className="text-center mb-6">
+                                    <Button onClick={loadMoreComments} loading={loadingMore}>
+                                        Load more
+                                    </Button>
+                                </div>
+                            )}
+
                             <form onSubmit={handleAddComment}>
                                 <textarea
                                     className="input mb-3"
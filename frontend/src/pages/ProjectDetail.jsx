@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import Navbar from '../components/Navbar';
 import Button from '../components/Button';
@@ -8,11 +8,14 @@ import Modal from '../components/Modal';
 import Spinner from '../components/Spinner';
 import { toast } from '../components/Toast';
 import api from '../utils/api';
+import { ISSUE_EVENTS, subscribeToProject } from '../utils/events';
 
 export default function ProjectDetail() {
     const { projectId } = useParams();
     const navigate = useNavigate();
     const [issues, setIssues] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [loading, setLoading] = useState(true);
     const [showModal, setShowModal] = useState(false);
     const [search, setSearch] = useState('');
@@ -27,20 +30,57 @@ export default function ProjectDetail() {
         // eslint-disable-next-line react-hooks/exhaustive-deps
     }, [projectId, search, statusFilter, priorityFilter, sortBy]);
 
+    // Refresh the list when anyone changes the project's issues; a burst of
+    // events (a bulk edit, an import) costs one refetch. The stream lives as
+    // long as the page, and the ref always holds the current filters.
+    const fetchIssuesRef = useRef(null);
+    useEffect(() => {
+        let refreshTimer = null;
+        const unsubscribe = subscribeToProject(projectId, ISSUE_EVENTS, () => {
+            clearTimeout(refreshTimer);
+            refreshTimer = setTimeout(() => fetchIssuesRef.current(), 250);
+        });
+        return () => {
+            clearTimeout(refreshTimer);
+            unsubscribe();
+        };
+    }, [projectId]);
+
+    const buildParams = () => {
+        const params = new URLSearchParams();
+        if (search) params.append('q', search);
+        if (statusFilter) params.append('status', statusFilter);
+        if (priorityFilter) params.append('priority', priorityFilter);
+        params.append('sort', sortBy);
+        return params;
+    };
+
     const fetchIssues = async () => {
         try {
-            const params = new URLSearchParams();
-            if (search) params.append('q', search);
-            if (statusFilter) params.append('status', statusFilter);
-            if (priorityFilter) params.append('priority', priorityFilter);
-            params.append('sort', sortBy);
+            const response = await api.get(`/projects/${projectId}/issues?${buildParams()}`);
+            setIssues(response.data.items);
+            setNextCursor(response.data.next_cursor);
+        } catch (error) {
+            toast.error('Failed to load issues');
+        } finally {
+            setLoading(false);
+        }
+    };
+
+    fetchIssuesRef.current = fetchIssues;
 
+    const loadMore = async () => {
+        setLoadingMore(true);
+        try {
+            const params = buildParams();
+            params.append('cursor', nextCursor);
             const response = await api.get(`/projects/${projectId}/issues?${params}`);
-            setIssues(response.data);
+            setIssues((current) => [...current, ...response.data.items]);
+            setNextCursor(response.data.next_cursor);
         } catch (error) {
             toast.error('Failed to load issues');
         } finally {
-            setLoading(false);
+            setLoadingMore(false);
         }
     };
 
@@ -143,6 +183,7 @@ export default function ProjectDetail() {
                                 { value: 'updated_at', label: 'Recently Updated' },
                                 { value: 'priority', label: 'Priority' },
                                 { value: 'status', label: 'Status' },
+                                { value: 'relevance', label: 'Best Match (search)' },
                             ]}
                             value={sortBy}
                             onChange={(e) => setSortBy(e.target.value)}
@@ -186,6 +227,13 @@ export default function ProjectDetail() {
                                 </div>
                             </div>
                         ))}
+                        {nextCursor && (
+                            <div className="text-center">
+                                <Button onClick={loadMore} loading={loadingMore}>
+                                    Load more
+                                </Button>
+                            </div>
+                        )}
                     </div>
                 )}
             </div>
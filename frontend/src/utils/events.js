@@ -0,0 +1,52 @@
+import api from './api';
+
+// Events that change what a project's issue list shows
+export const ISSUE_EVENTS = ['issue.created', 'issue.updated', 'issue.deleted', 'issues.imported'];
+
+const RECONNECT_DELAY_MS = 3000;
+
+// Subscribe to a project's live event stream; returns a function that closes it.
+// EventSource can't send the Authorization header, so each connection first asks
+// for a short-lived stream token. When the stream drops or the server evicts it,
+// the old token may have expired, so reconnecting fetches a new one.
+export function subscribeToProject(projectId, types, onEvent) {
+    let source = null;
+    let retryTimer = null;
+    let closed = false;
+
+    const reconnect = () => {
+        if (source) {
+            source.close();
+            source = null;
+        }
+        if (!closed && !retryTimer) {
+            retryTimer = setTimeout(() => {
+                retryTimer = null;
+                connect();
+            }, RECONNECT_DELAY_MS);
+        }
+    };
+
+    const connect = async () => {
+        try {
+            const response = await api.post(`/projects/${projectId}/events/token`);
+            if (closed) return;
+            const token = encodeURIComponent(response.data.token);
+            source = new EventSource(`/api/projects/${projectId}/events?token=${token}`);
+            types.forEach((type) => {
+                source.addEventListener(type, (event) => onEvent(type, JSON.parse(event.data)));
+            });
+            source.addEventListener('evicted', reconnect);
+            source.onerror = reconnect;
+        } catch (error) {
+            reconnect();
+        }
+    };
+
+    connect();
+    return () => {
+        closed = true;
+        clearTimeout(retryTimer);
+        if (source) source.close();
+    };
+}